@@ -4,50 +4,149 @@ Each agent has: wallet, skills, reputation, transaction history
 Can post jobs, bid on jobs, perform work
 """
 
-import random
+from functools import lru_cache
+from types import MappingProxyType
+
+from ids import new_job_id
+
+
+BASE_PRICES = {
+    'data_analysis': 10,
+    'image_generation': 8,
+    'text_generation': 6,
+    'code_review': 12,
+    'validation': 2
+}
+
+# Weight of a new rating in the reputation moving average
+REPUTATION_WEIGHT = 0.2
+
+# Agents with the same skill set share one tuple instead of a list each
+_SKILL_SETS = {}
+
+
+@lru_cache(maxsize=4096)
+def _pricing_table(skills, reputation_score):
+    """
+    Price list for a skill set at a reputation level
+    Cached and shared between agents, so it is returned as a read-only view;
+    callers pass the reputation rounded to 2 decimals so the cache can hit
+    """
+    pricing = {}
+    for skill in skills:
+        base = BASE_PRICES.get(skill, 5)
+        # Higher reputation = higher prices
+        reputation_multiplier = reputation_score / 5.0
+        pricing[skill] = round(base * reputation_multiplier, 2)
+    return MappingProxyType(pricing)
+
+
+def simulate_work(skill, job_description):
+    """
+    Canned work output for a skill (module-level so executors can pickle it)
+    Args:
+        skill: Skill the work is done with
+        job_description: What work needs to be done
+    Returns: Work output (string)
+    """
+    outputs = {
+        'data_analysis': f"Analysis complete: Dataset processed, key insights extracted. Correlation: 0.85",
+        'image_generation': f"Image generated: High-quality visual based on prompt '{job_description}'",
+        'text_generation': f"Content created: Professional text matching requirements",
+        'code_review': f"Code review complete: 3 issues found, 5 improvements suggested",
+        'validation': f"Validation complete: Quality metrics calculated"
+    }
+    return outputs.get(skill, "Work completed successfully")
 
 
 class Agent:
     """
     Autonomous AI Agent for the marketplace
     Features:
-    - Digital wallet with token balance
-    - Skill set and pricing
+    - Digital wallet with token balance (optionally a double-entry WalletEngine account)
+    - Skill set and pricing (optionally market-driven via a PricingEngine)
     - Reputation system
     - Transaction history
+    - Concurrency limit and load tracking
+    - Compact __slots__ layout (no per-instance __dict__)
     """
     
-    def __init__(self, agent_id, agent_type, skills, initial_balance=100):
+    __slots__ = (
+        'agent_id', 'agent_type', 'skills', '_balance', 'wallet', 'reputation_score',
+        'jobs_completed', 'jobs_requested', 'total_earned', 'total_spent',
+        'active_jobs', 'max_concurrent_jobs', 'latency_ewma', 'verbose', '_pricing',
+        'pricing_engine', '_pricing_generation'
+    )
+    
+    def __init__(self, agent_id, agent_type, skills, initial_balance=100,
+                 max_concurrent_jobs=3, expected_latency=1.0, verbose=True):
         self.agent_id = agent_id
         self.agent_type = agent_type  # 'buyer', 'seller', or 'validator'
-        self.skills = skills  # List of services this agent can provide
+        skills = tuple(skills)
+        self.skills = _SKILL_SETS.setdefault(skills, skills)  # Services this agent can provide
+        self.wallet = None
         self.balance = initial_balance
         self.reputation_score = 5.0  # Out of 5 stars
         self.jobs_completed = 0
         self.jobs_requested = 0
         self.total_earned = 0
         self.total_spent = 0
-        self.active_jobs = []
-        self.pricing = self._generate_pricing()
+        self.active_jobs = ()  # Becomes a list when the first job is accepted
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.latency_ewma = expected_latency  # Seconds per job, smoothed
+        self.verbose = verbose
+        self._pricing = None  # Built on first use and after reputation changes
+        self.pricing_engine = None  # Set by a marketplace with dynamic pricing
+        self._pricing_generation = 0  # Engine generation the price table was read at
     
     def _generate_pricing(self):
-        """Generate pricing for each skill based on reputation"""
-        pricing = {}
-        base_prices = {
-            'data_analysis': 10,
-            'image_generation': 8,
-            'text_generation': 6,
-            'code_review': 12,
-            'validation': 2
-        }
-        
-        for skill in self.skills:
-            base = base_prices.get(skill, 5)
-            # Higher reputation = higher prices
-            reputation_multiplier = self.reputation_score / 5.0
-            pricing[skill] = round(base * reputation_multiplier, 2)
-        
-        return pricing
+        """Generate pricing for each skill based on reputation (shared, read-only)"""
+        # Moving-average reputations are almost never equal; prices follow them at 0.01-star steps
+        return _pricing_table(self.skills, round(self.reputation_score, 2))
+    
+    @property
+    def balance(self):
+        """Token balance (read from the wallet account when one is attached)"""
+        if self.wallet is not None:
+            return self.wallet.balance(self.agent_id)
+        return self._balance
+    
+    @balance.setter
+    def balance(self, value):
+        if self.wallet is not None:
+            raise AttributeError(f"{self.agent_id} balance is held by its wallet; post a transfer instead")
+        self._balance = value
+    
+    def attach_wallet(self, wallet):
+        """
+        Move this agent's balance into a wallet account
+        Args:
+            wallet: WalletEngine that will hold the balance
+        """
+        wallet.open_account(self.agent_id, self._balance)
+        self.wallet = wallet
+    
+    @property
+    def pricing(self):
+        """Price per skill (read-only), regenerated lazily when reputation or the market has changed"""
+        engine = self.pricing_engine
+        if engine is not None:
+            if self._pricing is None or self._pricing_generation != engine.generation:
+                self._pricing = engine.price_table(self.skills, self.reputation_score)
+                self._pricing_generation = engine.generation
+            return self._pricing
+        if self._pricing is None:
+            self._pricing = self._generate_pricing()
+        return self._pricing
+    
+    @pricing.setter
+    def pricing(self, value):
+        # Copy, so neither the caller nor other agents see later changes to either side
+        self._pricing = MappingProxyType(dict(value))
+    
+    def invalidate_pricing(self):
+        """Mark the price table stale so the next read rebuilds it"""
+        self._pricing = None
     
     def post_job(self, job_description, job_type, budget):
         """
@@ -59,11 +158,12 @@ class Agent:
         Returns: Job posting dict
         """
         if self.balance < budget:
-            print(f"❌ {self.agent_id}: Insufficient balance for job posting")
+            if self.verbose:
+                print(f"❌ {self.agent_id}: Insufficient balance for job posting")
             return None
         
         job = {
-            'job_id': f"job_{random.randint(1000, 9999)}",
+            'job_id': new_job_id(),
             'poster': self.agent_id,
             'description': job_description,
             'type': job_type,
@@ -72,10 +172,11 @@ class Agent:
             'bids': []
         }
         
-        print(f"\n📢 {self.agent_id} posted job: {job['job_id']}")
-        print(f"   Type: {job_type}")
-        print(f"   Budget: {budget} tokens")
-        print(f"   Description: {job_description}")
+        if self.verbose:
+            print(f"\n📢 {self.agent_id} posted job: {job['job_id']}")
+            print(f"   Type: {job_type}")
+            print(f"   Budget: {budget} tokens")
+            print(f"   Description: {job_description}")
         
         return job
     
@@ -92,6 +193,10 @@ class Agent:
         if job_type not in self.skills:
             return None
         
+        # Don't bid when already working at the concurrency limit
+        if not self.has_capacity():
+            return None
+        
         # Calculate bid price (slightly below budget to be competitive)
         max_price = job['budget']
         my_price = self.pricing.get(job_type, 5)
@@ -106,45 +211,68 @@ class Agent:
             'bidder': self.agent_id,
             'amount': bid_price,
             'reputation': self.reputation_score,
-            'completion_rate': self._calculate_completion_rate()
+            'completion_rate': self._calculate_completion_rate(),
+            'queue_depth': len(self.active_jobs),
+            'eta': self.estimated_completion_time()
         }
         
-        print(f"   💰 {self.agent_id} bid {bid_price} tokens (reputation: {self.reputation_score:.1f}⭐)")
+        if self.verbose:
+            print(f"   💰 {self.agent_id} bid {bid_price} tokens (reputation: {self.reputation_score:.1f}⭐)")
         
         return bid
     
+    @property
+    def primary_skill(self):
+        """Skill whose output this agent produces"""
+        return self.skills[0] if self.skills else 'generic'
+    
     def perform_work(self, job_description):
         """
         Simulate performing work
         Returns: Work output (string)
         """
-        outputs = {
-            'data_analysis': f"Analysis complete: Dataset processed, key insights extracted. Correlation: 0.85",
-            'image_generation': f"Image generated: High-quality visual based on prompt '{job_description}'",
-            'text_generation': f"Content created: Professional text matching requirements",
-            'code_review': f"Code review complete: 3 issues found, 5 improvements suggested",
-            'validation': f"Validation complete: Quality metrics calculated"
-        }
-        
         # Return generic output based on agent's primary skill
-        skill = self.skills[0] if self.skills else 'generic'
-        return outputs.get(skill, "Work completed successfully")
+        return simulate_work(self.primary_skill, job_description)
     
-    def receive_payment(self, amount):
-        """Receive payment for completed work"""
-        self.balance += amount
+    def receive_payment(self, amount, hold=None):
+        """
+        Receive payment for completed work
+        Args:
+            amount: Tokens earned
+            hold: Escrow hold the payment was made under (the job ID); required with a wallet
+        Returns: True if paid, False if the wallet couldn't release that hold
+        """
+        if self.wallet is not None:
+            if not self.wallet.release(hold, self.agent_id, amount):
+                if self.verbose:
+                    print(f"   ❌ {self.agent_id}: escrow release of {amount} tokens for {hold} failed")
+                return False
+        else:
+            self.balance += amount
         self.total_earned += amount
         self.jobs_completed += 1
-        print(f"   💵 {self.agent_id} received {amount} tokens (balance: {self.balance})")
+        if self.verbose:
+            print(f"   💵 {self.agent_id} received {amount} tokens (balance: {self.balance})")
+        return True
     
-    def make_payment(self, amount):
-        """Make payment for received work"""
-        if self.balance >= amount:
+    def make_payment(self, amount, hold=None):
+        """
+        Make payment for received work (into escrow when using a wallet)
+        Args:
+            amount: Tokens to pay
+            hold: Escrow hold to pay under (the job ID); required with a wallet
+        Returns: True if paid, False on insufficient balance
+        """
+        if self.wallet is not None:
+            if not self.wallet.hold(self.agent_id, hold, amount):
+                return False
+        elif self.balance >= amount:
             self.balance -= amount
-            self.total_spent += amount
-            self.jobs_requested += 1
-            return True
-        return False
+        else:
+            return False
+        self.total_spent += amount
+        self.jobs_requested += 1
+        return True
     
     def update_reputation(self, quality_score):
         """
@@ -156,10 +284,45 @@ class Agent:
         new_rating = (quality_score / 100) * 5
         
         # Weighted average with existing reputation
-        weight = 0.2  # New rating has 20% weight
+        weight = REPUTATION_WEIGHT  # New rating has 20% weight
         self.reputation_score = (self.reputation_score * (1 - weight)) + (new_rating * weight)
+        self.invalidate_pricing()
         
-        print(f"   ⭐ {self.agent_id} reputation updated: {self.reputation_score:.2f}/5.00")
+        if self.verbose:
+            print(f"   ⭐ {self.agent_id} reputation updated: {self.reputation_score:.2f}/5.00")
+    
+    def has_capacity(self):
+        """Check whether the agent can take on another job"""
+        return len(self.active_jobs) < self.max_concurrent_jobs
+    
+    def available_capacity(self):
+        """Number of additional jobs the agent can accept"""
+        return max(0, self.max_concurrent_jobs - len(self.active_jobs))
+    
+    def accept_job(self, job_id):
+        """Add an assigned job to the agent's work queue"""
+        if self.active_jobs:
+            self.active_jobs.append(job_id)
+        else:
+            self.active_jobs = [job_id]
+    
+    def finish_job(self, job_id):
+        """Remove a job from the agent's work queue"""
+        if job_id in self.active_jobs:
+            self.active_jobs.remove(job_id)
+    
+    def record_latency(self, seconds, weight=0.2):
+        """
+        Update the smoothed per-job latency estimate
+        Args:
+            seconds: Observed time to perform one job
+            weight: Weight of the new observation
+        """
+        self.latency_ewma = (self.latency_ewma * (1 - weight)) + (seconds * weight)
+    
+    def estimated_completion_time(self):
+        """Estimated seconds until a newly assigned job would finish"""
+        return (len(self.active_jobs) + 1) * self.latency_ewma
     
     def _calculate_completion_rate(self):
         """Calculate job completion rate"""
@@ -179,7 +342,10 @@ class Agent:
             'jobs_requested': self.jobs_requested,
             'total_earned': self.total_earned,
             'total_spent': self.total_spent,
-            'completion_rate': round(self._calculate_completion_rate() * 100, 1)
+            'completion_rate': round(self._calculate_completion_rate() * 100, 1),
+            'queue_depth': len(self.active_jobs),
+            'max_concurrent_jobs': self.max_concurrent_jobs,
+            'latency_ewma': round(self.latency_ewma, 4)
         }
     
     def display_profile(self):
@@ -0,0 +1,189 @@
+"""
+Agent Search Index for AgentHub
+Sorted per-skill indexes for filtered, ranked, paginated agent discovery
+
+Each skill keeps a bisect-maintained list of (-reputation, agent_id) keys,
+so agents come out highest reputation first. A minimum reputation is a
+binary search for the end of the scan, and because both pricing paths price
+a skill monotonically in reputation, a price range is two more binary
+searches. Pages use keyset cursors (the last key returned), so a page is
+never broken by reputations changing between requests; an agent re-rated
+across the cursor can show up on two pages or be skipped, as with any
+keyset pagination over a live ordering.
+"""
+
+import base64
+import bisect
+import json
+import math
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor can't be decoded"""
+
+
+def encode_cursor(key):
+    """Opaque cursor string for a sort key"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Sort key from a cursor string"""
+    try:
+        neg_reputation, agent_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (float(neg_reputation), str(agent_id))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+class AgentSearchIndex:
+    """
+    Reputation-ordered agent indexes per skill
+    Features:
+    - One sorted key list per skill, plus one for all agents
+    - O(log n) bounds for minimum reputation and price range
+    - Lazy re-keying: changed agents are marked stale and re-sorted before the next search
+    - Keyset (cursor) pagination
+    """
+
+    ALL = None  # Index key for the list holding every agent
+
+    def __init__(self):
+        self.agents = {}  # agent_id -> agent
+        self.keys = {}  # agent_id -> key the agent is indexed under
+        self.lists = {self.ALL: []}  # skill -> sorted list of (-reputation, agent_id)
+        self._stale = set()
+
+    @staticmethod
+    def _key(agent):
+        return (-agent.reputation_score, agent.agent_id)
+
+    def _lists_for(self, agent):
+        return (self.ALL, *agent.skills)
+
+    def add(self, agent):
+        """
+        Index an agent, replacing any previous entry for it
+        Args:
+            agent: Agent instance
+        """
+        if agent.agent_id in self.keys:
+            self.remove(agent.agent_id)
+        key = self._key(agent)
+        self.agents[agent.agent_id] = agent
+        self.keys[agent.agent_id] = key
+        for skill in self._lists_for(agent):
+            bisect.insort(self.lists.setdefault(skill, []), key)
+
+    def add_many(self, agents):
+        """
+        Index many agents at once (one sort per list instead of one insert per agent)
+        Args:
+            agents: Iterable of agents not yet indexed
+        """
+        for agent in agents:
+            key = self._key(agent)
+            self.agents[agent.agent_id] = agent
+            self.keys[agent.agent_id] = key
+            for skill in self._lists_for(agent):
+                self.lists.setdefault(skill, []).append(key)
+        for keys in self.lists.values():
+            keys.sort()
+
+    def remove(self, agent_id):
+        """Drop an agent from every list"""
+        key = self.keys.pop(agent_id, None)
+        if key is None:
+            return
+        agent = self.agents.pop(agent_id)
+        for skill in self._lists_for(agent):
+            keys = self.lists[skill]
+            position = bisect.bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+        self._stale.discard(agent_id)
+
+    def mark_stale(self, agent_id):
+        """Note that an agent's reputation may have changed"""
+        if agent_id in self.keys:
+            self._stale.add(agent_id)
+
+    def refresh(self):
+        """Re-key stale agents whose reputation actually changed"""
+        stale, self._stale = self._stale, set()
+        for agent_id in stale:
+            agent = self.agents[agent_id]
+            if self._key(agent) != self.keys[agent_id]:
+                self.add(agent)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _price(self, keys, position, skill):
+        return self.agents[keys[position][1]].pricing.get(skill, 0)
+
+    def _price_bound(self, keys, lo, hi, skill, price, strict):
+        """
+        First position in [lo, hi) whose price is below price (strict) or at most price
+        Prices fall (weakly) along a reputation-descending list
+        """
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = self._price(keys, mid, skill)
+            if value < price or (not strict and value == price):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def search(self, skill=None, min_reputation=None, min_price=None, max_price=None,
+               available=None, agent_type=None, limit=20, cursor=None):
+        """
+        Find agents, highest reputation first
+        Args:
+            skill: Only agents offering this skill (None for any)
+            min_reputation: Minimum reputation score
+            min_price: Minimum price for the skill (any skill if none given)
+            max_price: Maximum price for the skill (any skill if none given)
+            available: True for agents with free capacity, False for full ones
+            agent_type: Only agents of this type
+            limit: Page size
+            cursor: next_cursor from the previous page
+        Returns: Dict with 'agents' (list of agents), 'next_cursor' and 'scanned'
+        """
+        self.refresh()
+        keys = self.lists.get(skill, [])
+        start = bisect.bisect_right(keys, decode_cursor(cursor)) if cursor else 0
+        end = len(keys)
+        if min_reputation is not None:
+            # First key with reputation below the minimum
+            end = bisect.bisect_left(keys, (math.nextafter(-min_reputation, math.inf),))
+
+        price_filter = None
+        if skill is not None:
+            if max_price is not None:
+                start = max(start, self._price_bound(keys, 0, end, skill, max_price, strict=False))
+            if min_price is not None:
+                end = self._price_bound(keys, start, end, skill, min_price, strict=True)
+        elif min_price is not None or max_price is not None:
+            low = -math.inf if min_price is None else min_price
+            high = math.inf if max_price is None else max_price
+            price_filter = lambda agent: any(low <= p <= high for p in agent.pricing.values())
+
+        found = []
+        position = start
+        while position < end and len(found) < limit:
+            agent = self.agents[keys[position][1]]
+            position += 1
+            if agent_type is not None and agent.agent_type != agent_type:
+                continue
+            if available is not None and agent.has_capacity() != available:
+                continue
+            if price_filter is not None and not price_filter(agent):
+                continue
+            found.append(agent)
+
+        next_cursor = None
+        if position < end and found:
+            next_cursor = encode_cursor(keys[position - 1])
+        return {'agents': found, 'next_cursor': next_cursor, 'scanned': position - start}
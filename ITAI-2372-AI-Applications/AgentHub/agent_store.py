@@ -0,0 +1,207 @@
+"""
+Struct-of-Arrays Agent Registry for AgentHub
+Keeps agent balances, reputations and counters in NumPy arrays indexed by
+agent number, so large simulated populations stay compact and marketplace-wide
+operations (top sellers, total supply, batch payouts) run vectorised
+"""
+
+import numpy as np
+
+from agent import Agent
+
+
+# Numeric agent state held in the store, with its array dtype
+STORE_FIELDS = {
+    'balance': np.float64,
+    'reputation_score': np.float64,
+    'jobs_completed': np.int64,
+    'jobs_requested': np.int64,
+    'total_earned': np.float64,
+    'total_spent': np.float64,
+    'max_concurrent_jobs': np.int32,
+    'latency_ewma': np.float64
+}
+
+
+class AgentStore:
+    """
+    Columnar registry of agent numeric state
+    Features:
+    - One NumPy array per field, one row per agent
+    - Amortised O(1) growth by capacity doubling
+    - Vectorised bulk updates and queries for the marketplace
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Args:
+            capacity: Initial number of rows to allocate
+        """
+        self.capacity = max(1, capacity)
+        self.size = 0
+        self.columns = {
+            field: np.zeros(self.capacity, dtype=dtype)
+            for field, dtype in STORE_FIELDS.items()
+        }
+        self.is_seller = np.zeros(self.capacity, dtype=bool)
+        self.agent_ids = []
+        self.row_of = {}
+
+    def create_agent(self, agent_id, agent_type, skills, **kwargs):
+        """
+        Create an agent whose numeric state lives in this store
+        Args:
+            agent_id: Unique agent identifier
+            agent_type: 'buyer', 'seller', or 'validator'
+            skills: Services the agent provides
+            **kwargs: Remaining Agent constructor arguments
+        Returns: StoredAgent instance
+        """
+        return StoredAgent(self, agent_id, agent_type, skills, **kwargs)
+
+    def add_row(self, agent_id, agent_type):
+        """
+        Allocate a row for a new agent
+        Args:
+            agent_id: Unique agent identifier
+            agent_type: Agent type
+        Returns: Row number
+        """
+        if agent_id in self.row_of:
+            raise ValueError(f"Agent {agent_id} already in store")
+        if self.size == self.capacity:
+            self._grow()
+
+        row = self.size
+        self.size += 1
+        self.is_seller[row] = agent_type == 'seller'
+        self.agent_ids.append(agent_id)
+        self.row_of[agent_id] = row
+        return row
+
+    def _grow(self):
+        """Double the allocated rows"""
+        self.capacity *= 2
+        for field, column in self.columns.items():
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[field] = grown
+        grown = np.zeros(self.capacity, dtype=bool)
+        grown[:self.size] = self.is_seller[:self.size]
+        self.is_seller = grown
+
+    def column(self, field):
+        """Live view of one field for all stored agents"""
+        return self.columns[field][:self.size]
+
+    def rows(self, agent_ids):
+        """Row numbers for a list of agent IDs"""
+        return np.fromiter((self.row_of[a] for a in agent_ids), dtype=np.int64, count=len(agent_ids))
+
+    def add(self, field, agent_ids, amounts):
+        """
+        Add amounts to a field for many agents (repeated IDs accumulate)
+        Args:
+            field: Field name, e.g. 'balance'
+            agent_ids: List of agent IDs
+            amounts: Scalar or sequence of amounts
+        """
+        np.add.at(self.columns[field], self.rows(agent_ids), amounts)
+
+    def credit(self, agent_ids, amounts):
+        """
+        Pay many agents at once, updating balance and earnings
+        Args:
+            agent_ids: List of agent IDs (repeats allowed)
+            amounts: Scalar or sequence of token amounts
+        """
+        rows = self.rows(agent_ids)
+        np.add.at(self.columns['balance'], rows, amounts)
+        np.add.at(self.columns['total_earned'], rows, amounts)
+        np.add.at(self.columns['jobs_completed'], rows, 1)
+
+    def top(self, field, n=10, sellers_only=False):
+        """
+        Agent IDs with the highest values of a field
+        Args:
+            field: Field name, e.g. 'reputation_score'
+            n: Number of agents to return
+            sellers_only: Only consider sellers
+        Returns: List of (agent_id, value) tuples, highest first
+        """
+        values = self.column(field)
+        rows = np.flatnonzero(self.is_seller[:self.size]) if sellers_only else np.arange(self.size)
+        if not len(rows):
+            return []
+        n = min(n, len(rows))
+        picked = rows[np.argpartition(-values[rows], n - 1)[:n]]
+        picked = picked[np.argsort(-values[picked], kind='stable')]
+        return [(self.agent_ids[row], values[row].item()) for row in picked]
+
+    def summary(self):
+        """Totals and means across all stored agents"""
+        balance = self.column('balance')
+        sellers = self.is_seller[:self.size]
+        reputation = self.column('reputation_score')[sellers]
+        return {
+            'agents': self.size,
+            'sellers': int(sellers.sum()),
+            'total_balance': round(float(balance.sum()), 2),
+            'total_earned': round(float(self.column('total_earned').sum()), 2),
+            'jobs_completed': int(self.column('jobs_completed').sum()),
+            'avg_seller_reputation': round(float(reputation.mean()), 2) if len(reputation) else 0.0
+        }
+
+    def memory_bytes(self):
+        """Bytes allocated for the arrays"""
+        return sum(c.nbytes for c in self.columns.values()) + self.is_seller.nbytes
+
+
+def _stored_field(field, cast):
+    """Property that reads and writes one store column for this agent's row"""
+
+    def getter(self):
+        return cast(self._store.columns[field][self._row])
+
+    def setter(self, value):
+        self._store.columns[field][self._row] = value
+
+    return property(getter, setter, doc=f"{field} (stored in AgentStore)")
+
+
+class StoredAgent(Agent):
+    """
+    Agent whose numeric state lives in an AgentStore row
+    Behaves exactly like Agent; balances, reputation and counters are
+    read from and written to the store's arrays
+    """
+
+    __slots__ = ('_store', '_row')
+
+    balance = _stored_field('balance', float)
+    reputation_score = _stored_field('reputation_score', float)
+    jobs_completed = _stored_field('jobs_completed', int)
+    jobs_requested = _stored_field('jobs_requested', int)
+    total_earned = _stored_field('total_earned', float)
+    total_spent = _stored_field('total_spent', float)
+    max_concurrent_jobs = _stored_field('max_concurrent_jobs', int)
+    latency_ewma = _stored_field('latency_ewma', float)
+
+    def __init__(self, store, agent_id, agent_type, skills, **kwargs):
+        """
+        Args:
+            store: AgentStore holding this agent's numeric state
+            agent_id: Unique agent identifier
+            agent_type: 'buyer', 'seller', or 'validator'
+            skills: Services the agent provides
+            **kwargs: Remaining Agent constructor arguments
+        """
+        self._store = store
+        self._row = store.add_row(agent_id, agent_type)
+        super().__init__(agent_id, agent_type, skills, **kwargs)
+
+    @property
+    def store_row(self):
+        """Row number in the backing store"""
+        return self._row
+
@@ -12,7 +12,6 @@ warnings.filterwarnings('ignore')
 
 try:
     from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
-    from sentence_transformers import SentenceTransformer
     import torch
     AI_AVAILABLE = True
 except ImportError:
@@ -30,6 +29,8 @@ except ImportError:
 import os
 from pathlib import Path
 
+from embeddings import ChromaEmbeddingFunction, get_embedding_service
+
 
 class AIAssistant:
     """
@@ -42,8 +43,14 @@ class AIAssistant:
     4. Answer marketplace questions
     """
     
-    def __init__(self, use_gpu=False):
-        """Initialize AI assistant with local models"""
+    def __init__(self, use_gpu=False, embedding_backend='torch'):
+        """
+        Initialize AI assistant with local models
+        
+        Args:
+            use_gpu: Whether to use GPU acceleration (if available)
+            embedding_backend: Backend of the shared embedding service ('torch', 'onnx' or 'onnx-int8')
+        """
         self.device = 'cuda' if use_gpu and torch.cuda.is_available() else 'cpu'
         self.rag_enabled = False  # Initialize early for all modes
         
@@ -68,21 +75,19 @@ class AIAssistant:
             print(f"   ⚠️  Could not load chat model: {e}")
             self.chat_model = None
         
-        # Model 2: Semantic search for help topics (23MB)
+        # Model 2: Semantic search for help topics (23MB), shared with the ML validator
         print("   Loading semantic search...")
         try:
-            self.semantic_model = SentenceTransformer(
-                'sentence-transformers/all-MiniLM-L6-v2',
-                device=self.device
-            )
+            self.embeddings = get_embedding_service(device=self.device, backend=embedding_backend)
+            self.embeddings.load()
         except Exception as e:
             print(f"   ⚠️  Could not load semantic model: {e}")
-            self.semantic_model = None
+            self.embeddings = None
         
         # RAG: Document knowledge base
         print("   Initializing RAG document store...")
         self.rag_enabled = False
-        if RAG_AVAILABLE and self.semantic_model:
+        if RAG_AVAILABLE and self.embeddings:
             try:
                 self._initialize_rag()
                 print("   ✅ RAG enabled with documentation index")
@@ -242,16 +247,23 @@ Benefits:
             anonymized_telemetry=False
         ))
         
+        # Documents and queries are embedded by the shared, cached embedding service
+        embedding_function = ChromaEmbeddingFunction(self.embeddings)
+        
         # Get or create collection
         try:
-            self.doc_collection = self.chroma_client.get_collection("agenthub_docs")
+            self.doc_collection = self.chroma_client.get_collection(
+                "agenthub_docs",
+                embedding_function=embedding_function
+            )
             print("   📚 Loaded existing document index")
             self.rag_enabled = True
         except:
             # Collection doesn't exist, create and index documents
             self.doc_collection = self.chroma_client.create_collection(
                 name="agenthub_docs",
-                metadata={"description": "AgentHub documentation for RAG"}
+                metadata={"description": "AgentHub documentation for RAG"},
+                embedding_function=embedding_function
             )
             self._index_documentation()
             self.rag_enabled = True
@@ -631,11 +643,11 @@ What would you like to know more about?"""
 # Singleton instance
 _assistant_instance = None
 
-def get_assistant(use_gpu=False):
+def get_assistant(use_gpu=False, embedding_backend='torch'):
     """Get or create AI assistant instance"""
     global _assistant_instance
     if _assistant_instance is None:
-        _assistant_instance = AIAssistant(use_gpu=use_gpu)
+        _assistant_instance = AIAssistant(use_gpu=use_gpu, embedding_backend=embedding_backend)
     return _assistant_instance
 
 
@@ -6,6 +6,9 @@ Uses rule-based system for assignment (can be upgraded to LLM later)
 
 import random
 
+from validation_cache import ValidationCache
+from validation_stats import ValidationStats
+
 
 class AIValidator:
     """
@@ -20,9 +23,54 @@ class AIValidator:
     For this demo: Rule-based scoring with some randomness
     """
     
-    def __init__(self, validator_id="ValidatorAgent"):
+    # Bump when the scoring rules change, so cached results from the old rules are dropped
+    RULES_VERSION = 'rules-1'
+    
+    # Criteria per job type, built once; keywords are stored lowercase
+    SCORING_RULES = {
+        'data_analysis': {
+            'min_length': 50,
+            'keywords': ('analysis', 'dataset', 'correlation', 'insights'),
+            'base_score': 75
+        },
+        'image_generation': {
+            'min_length': 40,
+            'keywords': ('image', 'generated', 'visual', 'quality'),
+            'base_score': 80
+        },
+        'text_generation': {
+            'min_length': 60,
+            'keywords': ('content', 'professional', 'created'),
+            'base_score': 70
+        },
+        'code_review': {
+            'min_length': 50,
+            'keywords': ('review', 'code', 'issues', 'improvements'),
+            'base_score': 85
+        },
+        'validation': {
+            'min_length': 30,
+            'keywords': ('validation', 'quality', 'metrics'),
+            'base_score': 90
+        }
+    }
+    DEFAULT_RULES = {'min_length': 40, 'keywords': (), 'base_score': 70}
+    
+    def __init__(self, validator_id="ValidatorAgent", verbose=True, cache_size=0, cache_path=None, history_size=100):
+        """
+        Args:
+            validator_id: Name recorded on validations
+            verbose: Whether to print per-validation details
+            cache_size: Most results memoised in memory (0, the default, disables it).
+                Scores include random variance, so a cache pins each distinct
+                output to the first score it got
+            cache_path: SQLite file to persist memoised results in
+            history_size: Most recent results kept alongside the running stats
+        """
         self.validator_id = validator_id
-        self.validation_history = []
+        self.validation_stats = ValidationStats(recent_size=history_size)
+        self.verbose = verbose
+        self.cache = ValidationCache(cache_size, cache_path, version=self.RULES_VERSION)
     
     def validate_work(self, job_type, work_output, job_description):
         """
@@ -33,9 +81,19 @@ class AIValidator:
             job_description: Original job requirements
         Returns: Quality score (0-100)
         """
-        print(f"\n🔍 {self.validator_id} validating work...")
-        print(f"   Job Type: {job_type}")
-        print(f"   Output: {work_output[:100]}...")
+        key = self.cache.key(job_description, work_output, job_type)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.validation_stats.record(cached, job_type)
+            if self.verbose:
+                print(f"\n🔍 {self.validator_id}: cached score {cached['score']}/100 "
+                      f"({'✅ PASSED' if cached['passed'] else '❌ FAILED'})")
+            return cached['score']
+        
+        if self.verbose:
+            print(f"\n🔍 {self.validator_id} validating work...")
+            print(f"   Job Type: {job_type}")
+            print(f"   Output: {work_output[:100]}...")
         
         # Simulate validation logic based on job type
         base_score = self._calculate_base_score(job_type, work_output)
@@ -51,14 +109,17 @@ class AIValidator:
             'passed': final_score >= 70
         }
         
-        self.validation_history.append(validation)
+        self.cache.put(key, validation)
+        self.validation_stats.record(validation, job_type)
         
-        print(f"   Score: {final_score}/100")
-        print(f"   Status: {'✅ PASSED' if validation['passed'] else '❌ FAILED'}")
+        if self.verbose:
+            print(f"   Score: {final_score}/100")
+            print(f"   Status: {'✅ PASSED' if validation['passed'] else '❌ FAILED'}")
         
         return final_score
     
-    def _calculate_base_score(self, job_type, work_output):
+    @staticmethod
+    def _calculate_base_score(job_type, work_output):
         """
         Calculate base quality score based on job type
         Args:
@@ -66,70 +127,32 @@ class AIValidator:
             work_output: Work result
         Returns: Base score (0-100)
         """
-        # Basic quality checks
-        output_length = len(work_output)
-        
-        # Different criteria for different job types
-        scoring_rules = {
-            'data_analysis': {
-                'min_length': 50,
-                'keywords': ['analysis', 'dataset', 'correlation', 'insights'],
-                'base_score': 75
-            },
-            'image_generation': {
-                'min_length': 40,
-                'keywords': ['image', 'generated', 'visual', 'quality'],
-                'base_score': 80
-            },
-            'text_generation': {
-                'min_length': 60,
-                'keywords': ['content', 'professional', 'created'],
-                'base_score': 70
-            },
-            'code_review': {
-                'min_length': 50,
-                'keywords': ['review', 'code', 'issues', 'improvements'],
-                'base_score': 85
-            },
-            'validation': {
-                'min_length': 30,
-                'keywords': ['validation', 'quality', 'metrics'],
-                'base_score': 90
-            }
-        }
-        
-        rules = scoring_rules.get(job_type, {'min_length': 40, 'keywords': [], 'base_score': 70})
+        rules = AIValidator.SCORING_RULES.get(job_type, AIValidator.DEFAULT_RULES)
         
         score = rules['base_score']
         
         # Length check
-        if output_length < rules['min_length']:
+        if len(work_output) < rules['min_length']:
             score -= 20
         
-        # Keyword check
-        keywords_found = sum(1 for kw in rules['keywords'] if kw.lower() in work_output.lower())
-        keyword_bonus = (keywords_found / len(rules['keywords'])) * 15 if rules['keywords'] else 0
-        score += keyword_bonus
+        # Keyword check: lowercase the output once, then one substring search per keyword
+        keywords = rules['keywords']
+        if keywords:
+            text = work_output.lower()
+            keywords_found = sum(1 for kw in keywords if kw in text)
+            score += (keywords_found / len(keywords)) * 15
         
         return int(score)
     
     def get_validation_stats(self):
-        """Get validation statistics"""
-        if not self.validation_history:
-            return {
-                'total_validations': 0,
-                'pass_rate': 0,
-                'average_score': 0
-            }
-        
-        total = len(self.validation_history)
-        passed = sum(1 for v in self.validation_history if v['passed'])
-        avg_score = sum(v['score'] for v in self.validation_history) / total
-        
+        """Get validation statistics (running totals, no history scan)"""
+        summary = self.validation_stats.summary()
         return {
-            'total_validations': total,
-            'pass_rate': round((passed / total) * 100, 1),
-            'average_score': round(avg_score, 1)
+            'total_validations': summary['total_validations'],
+            'pass_rate': summary['pass_rate'],
+            'average_score': summary['average_score'],
+            'score_quantiles': summary['score_quantiles'],
+            'by_job_type': self.validation_stats.by_job_type()
         }
     
     def display_stats(self):
@@ -0,0 +1,336 @@
+"""
+Batch Auction Engine for AgentHub
+Sealed-bid auction mode with periodic batch clearing
+Jobs and bids accumulate over a clearing interval, then all open jobs are
+matched to sellers at once with an assignment solver that respects seller capacity
+"""
+
+import random
+import time
+
+try:
+    import numpy as np
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+    SOLVER_AVAILABLE = True
+except ImportError:
+    SOLVER_AVAILABLE = False
+
+
+# Cost of leaving a job unmatched; bid costs are (2 - score), always in (1, 2]
+UNMATCHED_COST = 10.0
+
+# Above this many bids in a round the solver's run time outgrows its welfare
+# gain, so jobs are cleared one at a time in arrival order instead
+MAX_SOLVER_BIDS = 250_000
+
+
+class BatchAuction:
+    """
+    Periodic sealed-bid batch auction
+    Features:
+    - Sealed bids collected when a job enters the round
+    - Batch clearing on a fixed interval
+    - Sparse min-cost assignment (Jonker-Volgenant) across all job types
+    - Seller capacity limits shared across job types
+    - Capacity-aware greedy pass for anything the solver leaves open
+    - Per-job greedy clearing for rounds with more than max_solver_bids bids
+    - Jobs settled elsewhere are dropped; carried-over bids are re-scored
+    """
+
+    def __init__(self, marketplace, clearing_interval=5.0, seller_capacity=1,
+                 candidates_per_job=4, explore_per_job=4, max_solver_bids=MAX_SOLVER_BIDS,
+                 seed=None, clock=time.monotonic):
+        """
+        Args:
+            marketplace: Marketplace the auction clears jobs for
+            clearing_interval: Seconds between clearing rounds
+            seller_capacity: Maximum jobs a seller can win per round
+            candidates_per_job: Best bids per job passed to the solver
+            explore_per_job: Extra randomly sampled bids per job passed to the solver
+            max_solver_bids: Bids per round above which jobs are cleared greedily (None = always solve)
+            seed: Seed for candidate sampling
+            clock: Time source (monotonic seconds)
+        """
+        self.marketplace = marketplace
+        self.clearing_interval = clearing_interval
+        self.seller_capacity = seller_capacity
+        self.candidates_per_job = candidates_per_job
+        self.explore_per_job = explore_per_job
+        self.max_solver_bids = max_solver_bids
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.pending = []  # (job, [(bid, score), ...])
+        self._carried = set()  # IDs of unmatched jobs carried into the current round
+        self.rounds = 0
+        self.last_cleared = clock()
+        self._sellers_by_skill = {}
+        self._indexed_agents = -1
+
+    def _sellers(self, skill):
+        """Sellers offering a skill (a persistent registry's own skill index, else the in-memory one)"""
+        if hasattr(self.marketplace.agents, 'sellers_with_skill'):
+            return self.marketplace.sellers_for(skill)
+        return self._seller_index().get(skill, ())
+
+    def _seller_index(self):
+        """Index sellers by skill, rebuilt when agents register"""
+        agents = self.marketplace.agents
+        if len(agents) != self._indexed_agents:
+            index = {}
+            for agent in agents.values():
+                if agent.agent_type != 'seller':
+                    continue
+                for skill in agent.skills:
+                    index.setdefault(skill, []).append(agent)
+            self._sellers_by_skill = index
+            self._indexed_agents = len(agents)
+        return self._sellers_by_skill
+
+    def submit_job(self, job):
+        """
+        Add an open job to the current round and collect its sealed bids
+        Args:
+            job: Job posting dict
+        Returns: Number of bids received
+        """
+        bids = []
+        scored = []
+        for agent in self._sellers(job['type']):
+            if agent.agent_id == job['poster']:
+                continue
+            bid = agent.bid_on_job(job)
+            if bid:
+                bids.append(bid)
+                scored.append((bid, self.marketplace.score_bid(bid, job['budget'])))
+
+        job['bids'] = bids
+        self.marketplace.observe_bids(job)
+        self.pending.append((job, scored))
+        return len(bids)
+
+    def is_due(self):
+        """Check whether the clearing interval has elapsed"""
+        return self.clock() - self.last_cleared >= self.clearing_interval
+
+    def maybe_clear(self):
+        """Clear the round if the clearing interval has elapsed"""
+        if self.is_due():
+            return self.clear()
+        return None
+
+    def clear(self, capacity=None):
+        """
+        Match all pending jobs to sellers in one batch
+        Args:
+            capacity: Optional dict of seller ID -> remaining capacity
+        Returns: Dict with assignments, unmatched count, welfare and timing
+        """
+        start = time.perf_counter()
+        pending, self.pending = self.pending, []
+        # Jobs assigned, cancelled or disputed by another path since they entered the round
+        pending = [entry for entry in pending if entry[0].get('status') == 'open']
+        # Bids from an earlier round were scored against sellers that have changed since
+        pending = [(job, self._rescore(job, scored)) if job['job_id'] in self._carried else (job, scored)
+                   for job, scored in pending]
+        remaining = dict(capacity) if capacity is not None else {}
+        num_bids = 0
+        for _, scored in pending:
+            num_bids += len(scored)
+            for bid, _ in scored:
+                remaining.setdefault(bid['bidder'], self.seller_capacity)
+
+        solve = SOLVER_AVAILABLE and (self.max_solver_bids is None or num_bids <= self.max_solver_bids)
+        pairs = self._solve_sparse(pending, remaining) if solve else self._solve_per_job(pending, remaining)
+        matched_rows = {row for row, _, _ in pairs}
+        for _, bid, _ in pairs:
+            remaining[bid['bidder']] -= 1
+
+        # Greedy pass over full bid lists for jobs the solver left open
+        leftovers = self._solve_greedy(pending, matched_rows, remaining)
+        matched_rows.update(row for row, _, _ in leftovers)
+
+        assignments = []
+        welfare = 0.0
+        for row, bid, score in pairs + leftovers:
+            job = pending[row][0]
+            job['winner'] = bid['bidder']
+            job['final_price'] = bid['amount']
+            job['status'] = 'assigned'
+            self.marketplace.observe_clearing(job)
+            assignments.append((job['job_id'], bid['bidder']))
+            welfare += score
+
+        # Unmatched jobs with bids stay open for the next round
+        for row, entry in enumerate(pending):
+            if row not in matched_rows and entry[1]:
+                self.pending.append(entry)
+        self._carried = {job['job_id'] for job, _ in self.pending}
+
+        self.rounds += 1
+        self.last_cleared = self.clock()
+
+        return {
+            'round': self.rounds,
+            'assignments': assignments,
+            'unmatched': len(pending) - len(assignments),
+            'welfare': round(welfare, 4),
+            'solver': 'assignment' if solve else 'per-job',
+            'clearing_time': time.perf_counter() - start
+        }
+
+    def _rescore(self, job, scored):
+        """
+        Refresh carried-over bids with each seller's current reputation and load
+        Sealed bid amounts stand; sellers that left or are at capacity are dropped
+        Args:
+            job: Job posting dict
+            scored: List of (bid, score) tuples from an earlier round
+        Returns: List of (bid, score) tuples
+        """
+        rescored = []
+        for bid, _ in scored:
+            agent = self.marketplace.agents.get(bid['bidder'])
+            if agent is None or not agent.has_capacity():
+                continue
+            bid['reputation'] = agent.reputation_score
+            bid['queue_depth'] = len(agent.active_jobs)
+            bid['eta'] = agent.estimated_completion_time()
+            rescored.append((bid, self.marketplace.score_bid(bid, job['budget'])))
+        return rescored
+
+    def _solve_sparse(self, pending, remaining):
+        """
+        Min-cost assignment with one column per unit of seller capacity
+        Each job offers its best bids plus a random sample of the rest, so
+        sellers everyone ranks alike do not starve the other columns. A seller
+        bidding more than once on a job keeps only its best bid, so every edge
+        is one bid and each (job, slot) cell maps back to it. Each job also
+        owns a private "unmatched" column, so a full matching always exists.
+        Args:
+            pending: List of (job, scored_bids) tuples
+            remaining: Dict of seller ID -> remaining capacity
+        Returns: List of (row, bid, score) tuples
+        """
+        sellers = {}
+        slot_start = []
+        slot_count = []
+        total_slots = 0
+        rows, owners, scores, candidates = [], [], [], []
+
+        for row, (_, scored) in enumerate(pending):
+            best_by_seller = {}
+            for bid, score in scored:
+                bidder = bid['bidder']
+                if remaining[bidder] > 0 and score > best_by_seller.get(bidder, (None, -1.0))[1]:
+                    best_by_seller[bidder] = (bid, score)
+            open_bids = list(best_by_seller.values())
+            limit = self.candidates_per_job + self.explore_per_job
+            if len(open_bids) > limit:
+                open_bids.sort(key=lambda s: s[1], reverse=True)
+                best = open_bids[:self.candidates_per_job]
+                open_bids = best + self.rng.sample(open_bids[self.candidates_per_job:], self.explore_per_job)
+            for bid, score in open_bids:
+                bidder = bid['bidder']
+                col = sellers.get(bidder)
+                if col is None:
+                    col = sellers[bidder] = len(slot_count)
+                    slots = min(remaining[bidder], len(pending))
+                    slot_start.append(total_slots)
+                    slot_count.append(slots)
+                    total_slots += slots
+                rows.append(row)
+                owners.append(col)
+                scores.append(score)
+                candidates.append(bid)
+
+        if not rows:
+            return []
+
+        # Expand each bid's edge into one edge per capacity slot of its seller
+        rows = np.asarray(rows)
+        owners = np.asarray(owners)
+        scores = np.asarray(scores)
+        slot_start = np.asarray(slot_start)
+        slot_count = np.asarray(slot_count)
+        per_edge = slot_count[owners]
+        edge = np.repeat(np.arange(len(rows)), per_edge)
+        offset = np.arange(len(edge)) - np.repeat(np.cumsum(per_edge) - per_edge, per_edge)
+
+        num_jobs = len(pending)
+        unmatched = np.arange(num_jobs)
+        graph = coo_matrix(
+            (
+                np.concatenate([2.0 - scores[edge], np.full(num_jobs, UNMATCHED_COST)]),
+                (
+                    np.concatenate([rows[edge], unmatched]),
+                    np.concatenate([slot_start[owners[edge]] + offset, total_slots + unmatched])
+                )
+            ),
+            shape=(num_jobs, total_slots + num_jobs)
+        ).tocsr()
+        job_rows, cols = min_weight_full_bipartite_matching(graph)
+
+        # Map each chosen (job, slot) cell back to the bid whose slot range covers it
+        edges_of_row = [[] for _ in range(num_jobs)]
+        for e, row in enumerate(rows.tolist()):
+            edges_of_row[row].append(e)
+        first_slot = slot_start[owners].tolist()
+        last_slot = (slot_start[owners] + slot_count[owners]).tolist()
+        pairs = []
+        for row, col in zip(job_rows.tolist(), cols.tolist()):
+            if col >= total_slots:
+                continue
+            e = next(e for e in edges_of_row[row] if first_slot[e] <= col < last_slot[e])
+            pairs.append((row, candidates[e], float(scores[e])))
+        return pairs
+
+    def _solve_per_job(self, pending, remaining):
+        """
+        Give each job, in arrival order, its best bid from a seller with capacity left
+        Args:
+            pending: List of (job, scored_bids) tuples
+            remaining: Dict of seller ID -> remaining capacity (not updated)
+        Returns: List of (row, bid, score) tuples
+        """
+        load = {}
+        pairs = []
+        for row, (_, scored) in enumerate(pending):
+            best = None
+            for bid, score in scored:
+                if (best is None or score > best[1]) and load.get(bid['bidder'], 0) < remaining[bid['bidder']]:
+                    best = (bid, score)
+            if best is not None:
+                load[best[0]['bidder']] = load.get(best[0]['bidder'], 0) + 1
+                pairs.append((row, best[0], best[1]))
+        return pairs
+
+    def _solve_greedy(self, pending, matched_rows, remaining):
+        """
+        Capacity-aware greedy over (job, seller) pairs by descending score
+        Args:
+            pending: List of (job, scored_bids) tuples
+            matched_rows: Rows that already have a seller
+            remaining: Dict of seller ID -> remaining capacity (updated in place)
+        Returns: List of (row, bid, score) tuples
+        """
+        candidates = [
+            (score, row, bid)
+            for row, (_, scored) in enumerate(pending)
+            if row not in matched_rows
+            for bid, score in scored
+            if remaining[bid['bidder']] > 0
+        ]
+        candidates.sort(key=lambda c: c[0], reverse=True)
+
+        taken = set()
+        pairs = []
+        for score, row, bid in candidates:
+            seller_id = bid['bidder']
+            if row in taken or remaining[seller_id] <= 0:
+                continue
+            taken.add(row)
+            remaining[seller_id] -= 1
+            pairs.append((row, bid, score))
+
+        return pairs
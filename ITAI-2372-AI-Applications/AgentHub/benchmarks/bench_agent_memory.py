@@ -0,0 +1,146 @@
+"""
+Agent Memory Benchmark
+Compares per-agent memory of a dict-backed agent layout, the __slots__ Agent
+and AgentStore-backed agents, plus the cost of marketplace-wide queries
+
+Usage:
+    python benchmarks/bench_agent_memory.py --agents 200000
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent import BASE_PRICES, Agent
+from agent_store import AgentStore
+
+SKILLS = ['data_analysis', 'image_generation', 'text_generation', 'code_review', 'validation']
+
+
+class DictAgent:
+    """Previous Agent layout: per-instance __dict__ and a skills list"""
+
+    def __init__(self, agent_id, agent_type, skills, initial_balance=100):
+        self.agent_id = agent_id
+        self.agent_type = agent_type
+        self.skills = list(skills)
+        self.balance = initial_balance
+        self.reputation_score = 5.0
+        self.jobs_completed = 0
+        self.jobs_requested = 0
+        self.total_earned = 0
+        self.total_spent = 0
+        self.active_jobs = []
+        self.max_concurrent_jobs = 3
+        self.latency_ewma = 1.0
+        self.verbose = False
+        # Per-instance price list, as generated before pricing tables were shared
+        self.pricing = {skill: round(BASE_PRICES.get(skill, 5) * self.reputation_score / 5.0, 2)
+                        for skill in self.skills}
+
+
+def build(factory, specs):
+    """
+    Create one agent per spec, give each some activity, and report traced bytes
+    Activity matters: a balance or reputation that has changed is its own
+    float object in the object layouts, but just an array slot in the store
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    agents = [factory(agent_id, agent_type, skills) for agent_id, agent_type, skills in specs]
+    elapsed = time.perf_counter() - start
+    for i, agent in enumerate(agents):
+        agent.balance += 1.5 + i % 7
+        agent.total_earned += 1.5 + i % 7
+        agent.reputation_score *= 0.9 + (i % 11) / 100
+        agent.latency_ewma *= 0.8 + (i % 13) / 100
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return agents, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub agent memory benchmark")
+    parser.add_argument('--agents', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    specs = []
+    for i in range(args.agents):
+        if i % 5 == 0:
+            specs.append((f"buyer_{i}", 'buyer', []))
+        else:
+            specs.append((f"seller_{i}", 'seller', rng.sample(SKILLS, rng.randint(1, 2))))
+
+    print("=" * 70)
+    print("AGENT MEMORY BENCHMARK")
+    print("=" * 70)
+    print(f"Agents: {args.agents} (ID strings are shared by every layout and not counted)")
+    print(f"\n{'Layout':<28}{'total MB':>10}{'bytes/agent':>14}{'build s':>10}")
+
+    layouts = [
+        ('dict-backed (previous)', lambda i, t, s: DictAgent(i, t, s)),
+        ('__slots__ Agent', lambda i, t, s: Agent(i, t, s, verbose=False)),
+    ]
+    results = {}
+    for name, factory in layouts:
+        agents, used, elapsed = build(factory, specs)
+        results[name] = agents
+        print(f"{name:<28}{used / 2**20:>10.1f}{used / args.agents:>14.0f}{elapsed:>10.2f}")
+
+    store = AgentStore()
+    agents, used, elapsed = build(lambda i, t, s: store.create_agent(i, t, s, verbose=False), specs)
+    print(f"{'AgentStore-backed':<28}{used / 2**20:>10.1f}{used / args.agents:>14.0f}{elapsed:>10.2f}")
+    print(f"   (includes {store.memory_bytes() / 2**20:.1f} MB of arrays and the ID -> row index)")
+
+    # Marketplace-wide queries over the same population
+    for agent in agents:
+        agent.reputation_score = rng.uniform(1.0, 5.0)
+    slotted = results['__slots__ Agent']
+    for agent, stored in zip(slotted, agents):
+        agent.reputation_score = stored.reputation_score
+
+    print(f"\n{'Bulk operation':<36}{'objects ms':>12}{'store ms':>12}")
+
+    start = time.perf_counter()
+    sum(agent.balance for agent in slotted)
+    loop = time.perf_counter() - start
+    start = time.perf_counter()
+    store.column('balance').sum()
+    vector = time.perf_counter() - start
+    print(f"{'total balance':<36}{loop * 1000:>12.2f}{vector * 1000:>12.2f}")
+
+    start = time.perf_counter()
+    sorted((a for a in slotted if a.agent_type == 'seller'),
+           key=lambda a: a.reputation_score, reverse=True)[:10]
+    loop = time.perf_counter() - start
+    start = time.perf_counter()
+    store.top('reputation_score', 10, sellers_only=True)
+    vector = time.perf_counter() - start
+    print(f"{'top 10 sellers by reputation':<36}{loop * 1000:>12.2f}{vector * 1000:>12.2f}")
+
+    payees = [specs[rng.randrange(args.agents)][0] for _ in range(10_000)]
+    by_id = {agent.agent_id: agent for agent in slotted}
+    start = time.perf_counter()
+    for agent_id in payees:
+        by_id[agent_id].balance += 5
+        by_id[agent_id].total_earned += 5
+        by_id[agent_id].jobs_completed += 1
+    loop = time.perf_counter() - start
+    start = time.perf_counter()
+    store.credit(payees, 5)
+    vector = time.perf_counter() - start
+    print(f"{'credit 10k payouts':<36}{loop * 1000:>12.2f}{vector * 1000:>12.2f}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
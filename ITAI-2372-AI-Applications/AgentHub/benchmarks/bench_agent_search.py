@@ -0,0 +1,120 @@
+"""
+Agent Search Benchmark
+Compares indexed agent search against filtering and sorting the whole
+registry per request, and checks both return the same agents
+
+Usage:
+    python benchmarks/bench_agent_search.py --agents 200000 --queries 200
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent import Agent
+from ai_validator import AIValidator
+from blockchain import Blockchain
+from marketplace import Marketplace
+from smart_contract import SmartContract
+
+SKILLS = ['data_analysis', 'image_generation', 'text_generation', 'code_review', 'validation']
+
+
+def brute_force(agents, skill, min_reputation, max_price, available, limit):
+    """Filter and rank the full registry, as the client-side filter did"""
+    matches = [
+        agent for agent in agents
+        if skill in agent.skills
+        and agent.reputation_score >= min_reputation
+        and agent.pricing[skill] <= max_price
+        and agent.has_capacity() == available
+    ]
+    matches.sort(key=lambda agent: (-agent.reputation_score, agent.agent_id))
+    return matches[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub agent search benchmark")
+    parser.add_argument('--agents', type=int, default=200_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    blockchain = Blockchain()
+    market = Marketplace(blockchain, SmartContract(blockchain, verbose=False), AIValidator(verbose=False),
+                         verbose=False)
+    for i in range(args.agents):
+        agent = Agent(f"seller_{i}", 'seller', rng.sample(SKILLS, 2), verbose=False)
+        agent.reputation_score = round(rng.uniform(1.0, 5.0), 3)
+        if rng.random() < 0.3:
+            agent.active_jobs = [None] * agent.max_concurrent_jobs  # fully booked
+        market.register_agent(agent)
+    agents = list(market.agents.values())
+
+    queries = [
+        (rng.choice(SKILLS), rng.uniform(2.0, 4.5), rng.uniform(4, 12), rng.random() < 0.8)
+        for _ in range(args.queries)
+    ]
+
+    print("=" * 70)
+    print("AGENT SEARCH BENCHMARK")
+    print("=" * 70)
+    print(f"Agents: {args.agents}  Queries: {args.queries}  Page size: {args.limit}")
+
+    start = time.perf_counter()
+    market.search_agents(limit=1)
+    print(f"\nIndex build (first search): {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    expected = [brute_force(agents, *query, args.limit) for query in queries[:20]]
+    brute = (time.perf_counter() - start) / 20
+
+    start = time.perf_counter()
+    results = [
+        market.search_agents(skill=skill, min_reputation=rep, max_price=price, available=free, limit=args.limit)
+        for skill, rep, price, free in queries
+    ]
+    indexed = (time.perf_counter() - start) / len(queries)
+
+    mismatches = sum(
+        [a.agent_id for a in result['agents']] != [a.agent_id for a in want]
+        for result, want in zip(results, expected)
+    )
+    print(f"\n{'Strategy':<32}{'ms/query':>12}")
+    print(f"{'filter + sort whole registry':<32}{brute * 1000:>12.2f}")
+    print(f"{'sorted index + cursor':<32}{indexed * 1000:>12.4f}")
+    print(f"Speedup: {brute / indexed:.0f}x  Result mismatches: {mismatches}/20")
+
+    # Walk every page of one query, re-rating agents between pages
+    skill, rep, price, free = queries[0]
+    cursor, pages, seen, paging = None, 0, [], 0.0
+    while True:
+        start = time.perf_counter()
+        page = market.search_agents(skill=skill, min_reputation=rep, max_price=price, available=free,
+                                    limit=100, cursor=cursor)
+        paging += time.perf_counter() - start
+        seen.extend(agent.agent_id for agent in page['agents'])
+        pages += 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            for agent in rng.sample(agents, 50):
+                agent.update_reputation(rng.uniform(0, 100))
+                market._agent_changed(agent.agent_id)
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    print(f"\nPaged through {len(seen)} agents in {pages} pages of 100, re-rating 50 random agents "
+          f"between pages: {paging / pages * 1000:.3f} ms/page (incl. re-indexing)")
+    print(f"Agents re-rated across the cursor and seen twice: {len(seen) - len(set(seen))}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
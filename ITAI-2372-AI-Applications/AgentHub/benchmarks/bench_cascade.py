@@ -0,0 +1,97 @@
+"""
+Cascade Validator Benchmark
+Validates a mixed stream of outputs (agents' canned outputs, one-word
+non-answers and detailed on-topic reports) with the full models and with
+CascadeValidator at several pass/fail thresholds. Reports throughput, how
+many outputs each tier answered, and how often the cascade's pass/fail
+verdict matches the full models'
+
+By default the models are simulated (see bench_validation_cache.py), so the
+verdict agreement only shows the harness works; pass --ml to tune the
+thresholds against the real models.
+
+Usage:
+    python benchmarks/bench_cascade.py --validations 500 --thresholds 85:40,80:45,90:30
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent import simulate_work
+from bench_onnx_backend import OUTPUTS
+from bench_validation_cache import make_validator
+from cascade_validator import CascadeValidator
+from ml_validator import ML_AVAILABLE
+from simulation import JOB_DESCRIPTIONS
+
+NON_ANSWERS = ["Done.", "ok", "See attached.", "Will do later.", "N/A"]
+
+
+def workload(validations, seed):
+    """(job description, output, job type) triples: canned, non-answer or detailed output"""
+    rng = random.Random(seed)
+    job_types = list(JOB_DESCRIPTIONS)
+    requests = []
+    for i in range(validations):
+        job_type = rng.choice(job_types)
+        kind = rng.random()
+        if kind < 0.4:
+            output = simulate_work(rng.choice(job_types), JOB_DESCRIPTIONS[job_type])
+        elif kind < 0.6:
+            output = rng.choice(NON_ANSWERS)
+        else:
+            output = rng.choice(OUTPUTS[job_type])
+        # Unique suffix so the result cache can't answer for either tier
+        requests.append((JOB_DESCRIPTIONS[job_type], f"{output} [{i}]", job_type))
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub cascade validator benchmark")
+    parser.add_argument('--validations', type=int, default=500)
+    parser.add_argument('--thresholds', default='85:40,80:45,90:30', help='comma-separated pass:fail pairs')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--ml', action='store_true', help='use the real models instead of simulated ones')
+    args = parser.parse_args()
+
+    if args.ml and not ML_AVAILABLE:
+        print("ML libraries are required for --ml: pip install sentence-transformers transformers torch")
+        return
+
+    requests = workload(args.validations, args.seed)
+    validator = make_validator(args, 0)
+
+    start = time.perf_counter()
+    reference = [validator.validate_work(*request)['passed'] for request in requests]
+    baseline = time.perf_counter() - start
+
+    print("=" * 70)
+    print("CASCADE VALIDATOR BENCHMARK")
+    print("=" * 70)
+    print(f"Validations: {args.validations}  Model: {'real' if args.ml else 'simulated'}  "
+          f"Full-model pass rate: {sum(reference) / len(reference):.0%}")
+    print(f"\n{'Pass:fail':<12}{'val/s':>9}{'speedup':>9}{'screen pass':>13}{'screen fail':>13}"
+          f"{'models':>9}{'verdicts':>10}")
+    print(f"{'models only':<12}{len(requests) / baseline:>9.0f}{1.0:>8.1f}x{'-':>13}{'-':>13}{'100%':>9}{'100%':>10}")
+
+    for pair in args.thresholds.split(','):
+        pass_threshold, fail_threshold = (int(value) for value in pair.split(':'))
+        cascade = CascadeValidator(validator, pass_threshold=pass_threshold, fail_threshold=fail_threshold)
+        start = time.perf_counter()
+        verdicts = [cascade.validate_work(*request)['passed'] for request in requests]
+        elapsed = time.perf_counter() - start
+        rates = cascade.get_cascade_stats()['hit_rates']
+        agreement = sum(a == b for a, b in zip(verdicts, reference)) / len(reference)
+        print(f"{pair:<12}{len(requests) / elapsed:>9.0f}{baseline / elapsed:>8.1f}x{rates['screen_pass']:>13.0%}"
+              f"{rates['screen_fail']:>13.0%}{rates['model']:>9.0%}{agreement:>10.0%}")
+    print("\n(verdicts: share of pass/fail decisions matching the full models)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
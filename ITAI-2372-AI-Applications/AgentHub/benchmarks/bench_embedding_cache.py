@@ -0,0 +1,122 @@
+"""
+Embedding Cache Benchmark
+Replays a validation and skill-matching workload through the shared
+EmbeddingService with and without its cache, then checks that a persisted
+float16 cache survives a restart
+
+By default the sentence transformer is simulated (fixed cost per encode
+call plus a cost per text); pass --ml to use all-MiniLM-L6-v2.
+
+Usage:
+    python benchmarks/bench_embedding_cache.py --validations 1000 --jobs 50
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from embeddings import EmbeddingService
+
+SKILLS = ['data analysis', 'image generation', 'text generation', 'code review', 'validation',
+          'translation', 'research', 'design']
+
+
+class SimulatedEncoder:
+    """Stand-in SentenceTransformer: deterministic unit vectors, overhead + per-text cost"""
+
+    def __init__(self, dim=384, overhead=0.002, per_text=0.0005):
+        self.dim = dim
+        self.overhead = overhead
+        self.per_text = per_text
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True, convert_to_numpy=True,
+               show_progress_bar=False):
+        time.sleep(self.overhead + self.per_text * len(texts))
+        vectors = np.stack([
+            np.random.default_rng(int(hashlib.md5(text.encode()).hexdigest()[:8], 16)).standard_normal(self.dim)
+            for text in texts
+        ]).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_service(args, cache_size, cache_path=None):
+    service = EmbeddingService(cache_size=cache_size, cache_path=cache_path, verbose=False)
+    if not args.ml:
+        service.model = SimulatedEncoder()
+    return service
+
+
+def replay(service, workload):
+    """Embed each (job, output, skills) the way MLValidator does; return seconds"""
+    start = time.perf_counter()
+    for job, output, skills in workload:
+        service.encode([job])
+        service.encode([output], cache=False)
+        service.encode(skills)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub embedding cache benchmark")
+    parser.add_argument('--validations', type=int, default=1000)
+    parser.add_argument('--jobs', type=int, default=50, help='distinct job descriptions')
+    parser.add_argument('--cache-size', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--ml', action='store_true', help='use the real sentence transformer')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [f"Job {i}: {rng.choice(SKILLS)} for a client project with {rng.randint(2, 40)} deliverables"
+            for i in range(args.jobs)]
+    workload = [
+        (rng.choice(jobs), f"Output {i} " + "details " * rng.randint(5, 40), rng.sample(SKILLS, 3))
+        for i in range(args.validations)
+    ]
+
+    print("=" * 70)
+    print("EMBEDDING CACHE BENCHMARK")
+    print("=" * 70)
+    print(f"Validations: {args.validations}  Distinct jobs: {args.jobs}  Skills: {len(SKILLS)}  "
+          f"Model: {'all-MiniLM-L6-v2' if args.ml else 'simulated'}")
+
+    uncached = make_service(args, cache_size=0)
+    cached = make_service(args, cache_size=args.cache_size)
+    uncached_seconds = replay(uncached, workload)
+    cached_seconds = replay(cached, workload)
+
+    print(f"\n{'Strategy':<22}{'seconds':>10}{'texts encoded':>16}{'hit rate':>10}")
+    for name, service, seconds in (('no cache', uncached, uncached_seconds),
+                                   ('LRU cache', cached, cached_seconds)):
+        stats = service.get_stats()
+        print(f"{name:<22}{seconds:>10.2f}{stats['encoded']:>16}{stats['hit_rate']:>10.1%}")
+    print(f"Speedup: {uncached_seconds / cached_seconds:.1f}x")
+
+    # Persist as float16, restart, and replay again
+    path = os.path.join(tempfile.mkdtemp(), 'embedding_cache')
+    first = make_service(args, args.cache_size, path)
+    replay(first, workload[:200])
+    first.save()
+    restarted = make_service(args, args.cache_size, path)
+    seconds = replay(restarted, workload[:200])
+    stats = restarted.get_stats()
+    probe = jobs + SKILLS
+    error = np.abs(restarted.encode(probe) - cached.encode(probe)).max()
+    print(f"\nAfter restart from {path}: {stats['cached']} vectors loaded, "
+          f"{stats['encoded']} texts encoded in {seconds:.2f} s (outputs only)")
+    print(f"float16 storage error: max {error:.1e} per component")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
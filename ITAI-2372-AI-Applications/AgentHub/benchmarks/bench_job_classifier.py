@@ -0,0 +1,123 @@
+"""
+Job Classifier Benchmark
+Compares the MiniLM label-prototype classifier with BART zero-shot
+classification: latency per output (one at a time and batched), accuracy on
+a labelled set of outputs, and how often the two agree
+
+Usage:
+    python benchmarks/bench_job_classifier.py --repeats 3
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ml_validator import ML_AVAILABLE, MLValidator
+
+# Work outputs labelled with the job type that produced them
+LABELLED_OUTPUTS = [
+    ('data analysis', "Revenue grew 12% quarter on quarter; churn in the SMB tier rose 3 points. Charts attached."),
+    ('data analysis', "Computed the mean, median and variance for each region and flagged two outliers."),
+    ('data analysis', "The regression shows price explains 64% of the variance in weekly demand."),
+    ('content writing', "Introducing our new wireless headphones: 30 hours of battery and all-day comfort."),
+    ('content writing', "Here is a 600-word blog post on remote work, with three sections and a call to action."),
+    ('content writing', "Rewrote the landing page copy in a friendlier tone and tightened the headline."),
+    ('image generation', "Generated four 1024x1024 renders of the product on a white background."),
+    ('image generation', "Created a watercolour-style illustration of a lighthouse at sunset, PNG attached."),
+    ('image generation', "Produced a set of 12 flat icons in the brand palette at 512px."),
+    ('code review', "Found an unchecked None return in parse_config and a race on the shared cache dict."),
+    ('code review', "The PR is missing tests for the retry path; also rename tmp to something descriptive."),
+    ('code review', "Approve with nits: the loop in handler.py can be a list comprehension."),
+    ('research', "Summarised eight papers on retrieval-augmented generation and compared their benchmarks."),
+    ('research', "Collected market sizing estimates from three analyst reports, with sources cited."),
+    ('research', "Literature review: most studies find a modest effect, but sample sizes are small."),
+    ('design', "Wireframes for the checkout flow, with a simplified two-step payment screen."),
+    ('design', "Proposed a design system: 8px grid, two typefaces and a five-colour palette."),
+    ('design', "Mockups of the mobile dashboard in light and dark themes."),
+    ('translation', "Translated the user manual from English into Spanish, keeping the technical terms."),
+    ('translation', "French version of the press release attached; idioms adapted for the local market."),
+    ('translation', "Localised the app strings into German and Japanese and checked string lengths."),
+]
+
+
+def time_single(classifier, outputs, labels, repeats):
+    """Seconds per output, classifying one output per call"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for output in outputs:
+            classifier(output, labels)
+    return (time.perf_counter() - start) / (repeats * len(outputs))
+
+
+def time_batched(classifier, outputs, labels, repeats):
+    """Seconds per output, classifying every output in one call"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        classifier(outputs, labels, batch_size=32)
+    return (time.perf_counter() - start) / (repeats * len(outputs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub job classifier benchmark")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    if not ML_AVAILABLE:
+        print("ML libraries are required for this benchmark: "
+              "pip install sentence-transformers transformers torch")
+        return
+
+    labels = MLValidator.CANDIDATE_LABELS
+    outputs = [output for _, output in LABELLED_OUTPUTS]
+    expected = [label for label, _ in LABELLED_OUTPUTS]
+
+    classifiers = {}
+    for mode in MLValidator.JOB_CLASSIFIERS:
+        validator = MLValidator(verbose=False, job_classifier=mode)
+        classifiers[mode] = validator.classifier
+        classifiers[mode](outputs[:2], labels)  # Warm up (and build prototypes)
+
+    print("=" * 70)
+    print("JOB CLASSIFIER BENCHMARK")
+    print("=" * 70)
+    print(f"Outputs: {len(outputs)}  Labels: {len(labels)}  Repeats: {args.repeats}")
+
+    results = {}
+    print(f"\n{'Classifier':<12}{'ms/output':>11}{'batched ms':>12}{'accuracy':>10}{'type score':>12}")
+    for mode, classifier in classifiers.items():
+        single = time_single(classifier, outputs, labels, args.repeats)
+        batched = time_batched(classifier, outputs, labels, args.repeats)
+        predictions = classifier(outputs, labels, batch_size=32)
+        results[mode] = predictions
+        accuracy = np.mean([p['labels'][0] == label for p, label in zip(predictions, expected)])
+        # The classification component MLValidator adds to the final score
+        type_score = np.mean([MLValidator._type_match_score(p, label) for p, label in zip(predictions, expected)])
+        print(f"{mode:<12}{single * 1000:>11.2f}{batched * 1000:>12.2f}{accuracy:>10.0%}{type_score:>12.3f}")
+
+    bart, prototype = results['bart'], results['prototype']
+    agree = [b['labels'][0] == p['labels'][0] for b, p in zip(bart, prototype)]
+    score_gap = [abs(MLValidator._type_match_score(b, label) - MLValidator._type_match_score(p, label))
+                 for b, p, label in zip(bart, prototype, expected)]
+    print(f"\nAgreement report (prototype vs BART)")
+    print(f"  Top label agreement: {sum(agree)}/{len(agree)} ({np.mean(agree):.0%})")
+    print(f"  Classification score gap: mean {np.mean(score_gap):.3f}, max {np.max(score_gap):.3f} "
+          f"(x10 weight = final score points)")
+    disagreements = Counter(
+        (label, b['labels'][0], p['labels'][0])
+        for b, p, label, same in zip(bart, prototype, expected, agree) if not same
+    )
+    if disagreements:
+        print(f"  {'expected':<18}{'BART':<18}{'prototype':<18}count")
+        for (label, b, p), count in disagreements.most_common():
+            print(f"  {label:<18}{b:<18}{p:<18}{count}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
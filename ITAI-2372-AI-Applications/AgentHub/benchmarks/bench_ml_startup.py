@@ -0,0 +1,104 @@
+"""
+ML Validator Startup Benchmark
+Measures cold start: how long until the validator object exists (what
+blocks web_app.py from serving), how long the first validation takes, and
+how long background warm-up needs to load every model
+
+Each mode runs in a fresh interpreter so nothing is already in memory.
+Model files should already be downloaded; the first ever run also pays for
+the download.
+
+Usage:
+    python benchmarks/bench_ml_startup.py
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+MODES = {
+    'eager': 'load every model in the constructor (old behaviour)',
+    'lazy': 'load each model on first use',
+    'lazy+warm': 'lazy, with background warm-up started at startup',
+}
+
+JOB = ('Analyze quarterly sales data and summarise the trends',
+       'Sales grew 12% quarter on quarter, led by the enterprise segment.',
+       'data analysis')
+
+
+def child(mode):
+    """Run one cold start in this process and print its timings as JSON"""
+    start = time.perf_counter()
+    from ml_validator import ML_AVAILABLE, MLValidator
+    imported = time.perf_counter() - start
+    if not ML_AVAILABLE:
+        print(json.dumps({'error': 'ML libraries not installed'}))
+        return
+
+    start = time.perf_counter()
+    validator = MLValidator(verbose=False, lazy=(mode != 'eager'))
+    thread = validator.warm_up() if mode == 'lazy+warm' else None
+    constructed = time.perf_counter() - start
+
+    warmed = None
+    if thread is not None:
+        thread.join()
+        warmed = time.perf_counter() - start
+
+    first_start = time.perf_counter()
+    validator.validate_work(*JOB)
+    first = time.perf_counter() - first_start
+
+    second_start = time.perf_counter()
+    validator.validate_work(*JOB)
+    second = time.perf_counter() - second_start
+
+    print(json.dumps({'import': imported, 'construct': constructed, 'warm_up': warmed,
+                      'first': first, 'second': second}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub ML validator startup benchmark")
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Model loading chatter is swallowed; only the JSON line reaches the parent
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            child(args.child)
+        print(buffer.getvalue().strip().splitlines()[-1])
+        return
+
+    print("=" * 70)
+    print("ML VALIDATOR STARTUP BENCHMARK")
+    print("=" * 70)
+    print(f"\n{'Mode':<12}{'import s':>10}{'ready to serve s':>18}{'1st validation s':>18}"
+          f"{'warm-up s':>11}{'2nd s':>8}")
+    for mode, description in MODES.items():
+        output = subprocess.run([sys.executable, __file__, '--child', mode],
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if 'error' in result:
+            print(f"{mode:<12}{result['error']}")
+            continue
+        warm = f"{result['warm_up']:.2f}" if result['warm_up'] is not None else '-'
+        print(f"{mode:<12}{result['import']:>10.2f}{result['construct']:>18.3f}{result['first']:>18.2f}"
+              f"{warm:>11}{result['second']:>8.3f}")
+    print("\n(ready to serve: time until MLValidator() returns, which is when web_app.py can")
+    print(" start answering requests; the 1st validation after warm-up finds every model loaded)")
+    for mode, description in MODES.items():
+        print(f"  {mode}: {description}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+ML Validator Batch Benchmark
+Measures validation throughput (items/sec) of one validate_work call per
+item against validate_batch at increasing batch sizes on CPU, and checks
+both paths give the same scores
+
+Usage:
+    python benchmarks/bench_ml_validator.py --items 256 --batch-sizes 1,8,32,64
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ml_validator import ML_AVAILABLE, MLValidator
+from simulation import JOB_DESCRIPTIONS
+
+OUTPUT_SENTENCES = [
+    "Completed the analysis and summarised the key findings.",
+    "The report covers the quarterly trends with supporting charts.",
+    "Generated the requested assets at the specified resolution.",
+    "Reviewed the changes and flagged three potential issues.",
+    "Validated every record against the schema; two rows failed.",
+    "Draft attached, following the requested tone and length.",
+    "Done.",
+]
+
+
+def make_pairs(count, seed):
+    """(job_description, work_output, job_type) triples with varied output lengths"""
+    rng = random.Random(seed)
+    job_types = list(JOB_DESCRIPTIONS)
+    pairs = []
+    for _ in range(count):
+        job_type = rng.choice(job_types)
+        output = ' '.join(rng.choices(OUTPUT_SENTENCES, k=rng.randint(1, 12)))
+        pairs.append((JOB_DESCRIPTIONS[job_type], output, job_type))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub ML validator batch benchmark")
+    parser.add_argument('--items', type=int, default=256)
+    parser.add_argument('--batch-sizes', default='1,8,32,64')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if not ML_AVAILABLE:
+        print("ML libraries are required for this benchmark: "
+              "pip install sentence-transformers transformers torch")
+        return
+
+    validator = MLValidator(use_gpu=False, verbose=False)
+    pairs = make_pairs(args.items, args.seed)
+    validator.validate_batch(pairs[:8])  # Warm up kernels and tokenizer caches
+
+    print("=" * 70)
+    print("ML VALIDATOR BATCH BENCHMARK")
+    print("=" * 70)
+    print(f"Items: {args.items}  Device: {validator.device}  "
+          f"Zero-shot classifier: {'yes' if validator.classifier else 'no'}")
+
+    start = time.perf_counter()
+    expected = [validator.validate_work(*pair) for pair in pairs]
+    baseline = time.perf_counter() - start
+
+    print(f"\n{'Strategy':<28}{'seconds':>10}{'items/s':>10}{'speedup':>10}{'max score diff':>16}")
+    print(f"{'validate_work per item':<28}{baseline:>10.2f}{args.items / baseline:>10.1f}{1.0:>9.1f}x{0:>16}")
+    for batch_size in [int(size) for size in args.batch_sizes.split(',')]:
+        start = time.perf_counter()
+        results = validator.validate_batch(pairs, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        diff = max(abs(a['score'] - b['score']) for a, b in zip(results, expected))
+        print(f"{'validate_batch (' + str(batch_size) + ')':<28}{elapsed:>10.2f}"
+              f"{args.items / elapsed:>10.1f}{baseline / elapsed:>9.1f}x{diff:>16}")
+    print("\n(score diff: largest 0-100 score difference from validate_work; "
+          "padding can move a score by 1 at a rounding boundary)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+ONNX Backend Parity and Latency Benchmark
+Runs a fixed validation set through MLValidator on each inference backend
+(PyTorch, ONNX, int8 ONNX) and compares scores, job type labels, latency
+and memory against PyTorch
+
+Each backend runs in a fresh interpreter so memory numbers are not shared.
+The prototype job classifier runs on the sentence encoder, so its labels
+follow the backend too. Pass/fail gating against tolerances lives in
+check_onnx_parity.py, which reuses this validation set.
+
+Usage:
+    python benchmarks/bench_onnx_backend.py --backends torch,onnx,onnx-int8
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from simulation import JOB_DESCRIPTIONS
+
+# Fixed outputs per job: on-topic, thin and off-topic, so scores span the pass threshold
+OUTPUTS = {
+    'data_analysis': [
+        "Analysed the quarterly sales data: revenue grew 12% with the enterprise segment leading, "
+        "while churn in the SMB tier rose 3 points. Charts and the cleaned dataset are attached.",
+        "Data looked at.",
+    ],
+    'image_generation': [
+        "Generated four 1024x1024 product images in the requested flat illustration style, "
+        "with transparent backgrounds and a matching colour palette.",
+        "Image made.",
+    ],
+    'text_generation': [
+        "Wrote a 600-word blog post with an introduction, three sections covering the key benefits, "
+        "and a call to action, in the friendly tone requested.",
+        "Text.",
+    ],
+    'code_review': [
+        "Reviewed the pull request: found an unchecked None return in the parser, a race on the cache "
+        "dictionary, and suggested tests for the retry path.",
+        "Code is fine.",
+    ],
+    'validation': [
+        "Validated all 12,400 records against the schema; 37 rows failed on date format and 5 on "
+        "missing IDs. A report with row numbers is attached.",
+        "Checked.",
+    ],
+}
+OFF_TOPIC = "Our bakery opens at 8am and the sourdough sells out by noon on weekends."
+
+
+def validation_set():
+    """Fixed (job_description, work_output, job_type) triples"""
+    pairs = []
+    for job_type, description in JOB_DESCRIPTIONS.items():
+        for output in OUTPUTS.get(job_type, []) + [OFF_TOPIC]:
+            pairs.append((description, output, job_type))
+    return pairs
+
+
+def rss_mb():
+    """Current resident memory of this process in MB"""
+    try:
+        with open('/proc/self/status', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(backend, repeats):
+    """Load one backend, score the validation set and print the results as JSON"""
+    from ml_validator import ML_AVAILABLE, MLValidator
+    if not ML_AVAILABLE:
+        return {'error': 'ML libraries not installed'}
+    validator = MLValidator(verbose=False, backend=backend, cache_size=0)
+    baseline = rss_mb()
+    start = time.perf_counter()
+    for name in validator.MODELS:
+        validator._model(name)
+    load_seconds = time.perf_counter() - start
+    memory = rss_mb() - baseline
+    if validator.readiness()['degraded']:
+        # Fallback scores are constants and would compare as perfect parity
+        return {'error': 'a model failed to load (see its warning when run alone)'}
+
+    pairs = validation_set()
+    jobs = [job for job, _, _ in pairs]
+    outputs = [output for _, output, _ in pairs]
+    quality = validator._batch_quality_scores(jobs, outputs, 32)
+    similarity = validator._batch_semantic_similarity(jobs, outputs, 32)
+    classification = validator._batch_job_type_scores(pairs, 32)
+    labels = [result['labels'][0] for result in validator.classifier(outputs, validator.CANDIDATE_LABELS)]
+    results = validator.validate_batch(pairs)
+
+    for pair in pairs[:3]:
+        validator.validate_work(*pair)  # Warm up
+    latencies = []
+    for _ in range(repeats):
+        for pair in pairs:
+            started = time.perf_counter()
+            validator.validate_work(*pair)
+            latencies.append(time.perf_counter() - started)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        validator.validate_batch(pairs, batch_size=32)
+    batch_rate = repeats * len(pairs) / (time.perf_counter() - start)
+
+    return {
+        'load_seconds': load_seconds,
+        'memory_mb': memory,
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p95_ms': float(np.percentile(latencies, 95) * 1000),
+        'batch_items_per_second': batch_rate,
+        'quality': quality,
+        'similarity': similarity,
+        'classification': classification,
+        'labels': labels,
+        'scores': [r['score'] for r in results],
+        'passed': [r['passed'] for r in results]
+    }
+
+
+def run_backends(backends, repeats):
+    """
+    Score the validation set on each backend, one fresh interpreter per backend
+    Returns: Dict of backend -> child() result (PyTorch first)
+    """
+    if 'torch' not in backends:
+        backends = ['torch'] + list(backends)
+    results = {}
+    for backend in backends:
+        output = subprocess.run([sys.executable, __file__, '--child', backend, '--repeats', str(repeats)],
+                                capture_output=True, text=True, check=True).stdout
+        results[backend] = json.loads(output.strip().splitlines()[-1])
+    return results
+
+
+def compare(result, reference):
+    """
+    Differences between one backend's results and PyTorch's
+    Returns: Dict of largest quality/similarity/classification/score deltas
+        and the fractions of matching verdicts and top labels
+    """
+    pairs = len(reference['scores'])
+    return {
+        'quality': float(np.abs(np.subtract(result['quality'], reference['quality'])).max()),
+        'similarity': float(np.abs(np.subtract(result['similarity'], reference['similarity'])).max()),
+        'classification': float(np.abs(np.subtract(result['classification'], reference['classification'])).max()),
+        'score': int(np.abs(np.subtract(result['scores'], reference['scores'])).max()),
+        'verdicts': sum(a == b for a, b in zip(result['passed'], reference['passed'])) / pairs,
+        'labels': sum(a == b for a, b in zip(result['labels'], reference['labels'])) / pairs
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub ONNX backend parity and latency benchmark")
+    parser.add_argument('--backends', default='torch,onnx,onnx-int8')
+    parser.add_argument('--repeats', type=int, default=5, help='passes over the validation set for timing')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Model loading chatter is swallowed; only the JSON line reaches the parent
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = child(args.child, args.repeats)
+        print(json.dumps(result))
+        return
+
+    results = run_backends(args.backends.split(','), args.repeats)
+
+    print("=" * 70)
+    print("ONNX BACKEND PARITY AND LATENCY BENCHMARK")
+    print("=" * 70)
+    if 'error' in results['torch']:
+        print(results['torch']['error'])
+        return
+    reference = results['torch']
+    print(f"Validation set: {len(reference['scores'])} pairs  Timing passes: {args.repeats}")
+
+    print(f"\n{'Backend':<11}{'load s':>8}{'RSS MB':>8}{'p50 ms':>8}{'p95 ms':>8}{'batch/s':>9}"
+          f"{'Δquality':>10}{'Δsim':>8}{'Δclass':>8}{'Δscore':>8}{'verdicts':>10}{'labels':>8}")
+    for backend, result in results.items():
+        if 'error' in result:
+            print(f"{backend:<11}{result['error']}")
+            continue
+        delta = compare(result, reference)
+        print(f"{backend:<11}{result['load_seconds']:>8.2f}{result['memory_mb']:>8.0f}{result['p50_ms']:>8.1f}"
+              f"{result['p95_ms']:>8.1f}{result['batch_items_per_second']:>9.0f}{delta['quality']:>10.4f}"
+              f"{delta['similarity']:>8.4f}{delta['classification']:>8.4f}{delta['score']:>8}"
+              f"{delta['verdicts']:>10.0%}{delta['labels']:>8.0%}")
+
+    print("\n(Δ columns: largest absolute difference from PyTorch; quality, similarity and")
+    print(" classification on a 0-1 scale, score on 0-100; verdicts and labels: share of")
+    print(" pass/fail decisions and top job type labels matching PyTorch)")
+    print("Gate a backend switch with check_onnx_parity.py")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
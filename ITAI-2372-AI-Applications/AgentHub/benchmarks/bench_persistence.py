@@ -0,0 +1,103 @@
+"""
+Agent Persistence Benchmark
+Measures startup with lazy loading against loading every agent, the first
+bid round after startup (sellers come from the skill index), and dirty-row
+flushes against rewriting the whole agent table
+
+Usage:
+    python benchmarks/bench_persistence.py --agents 100000 --changed 0.01
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent import Agent
+from blockchain import Blockchain
+from marketplace import Marketplace
+from persistence import AgentRepository, PersistentAgentRegistry
+
+SKILLS = ['data_analysis', 'image_generation', 'text_generation', 'code_review', 'validation']
+
+
+def timed(fn):
+    """Run fn and return (result, seconds)"""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub agent persistence benchmark")
+    parser.add_argument('--agents', type=int, default=100_000)
+    parser.add_argument('--changed', type=float, default=0.01, help='fraction of agents changed between flushes')
+    parser.add_argument('--lookups', type=int, default=100, help='agents touched right after startup')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    path = os.path.join(tempfile.mkdtemp(), 'agents.db')
+
+    print("=" * 70)
+    print("AGENT PERSISTENCE BENCHMARK")
+    print("=" * 70)
+    print(f"Agents: {args.agents}  Changed per flush: {args.changed:.1%}  Database: {path}")
+
+    # Seed the database
+    registry = PersistentAgentRegistry(AgentRepository(path))
+    for i in range(args.agents):
+        registry[f"agent_{i}"] = Agent(f"agent_{i}", 'seller', rng.sample(SKILLS, 2), verbose=False)
+    _, seconds = timed(registry.flush)
+    print(f"\nInitial write: {args.agents} rows in {seconds:.2f} s ({registry.transactions} transactions)")
+    registry.repository.close()
+
+    # Startup: load everything vs load on first access
+    ids = [f"agent_{rng.randrange(args.agents)}" for _ in range(args.lookups)]
+    eager = PersistentAgentRegistry(AgentRepository(path))
+    _, eager_seconds = timed(lambda: [eager[agent_id] for agent_id in ids] and eager.values())
+    lazy = PersistentAgentRegistry(AgentRepository(path))
+    _, lazy_seconds = timed(lambda: [lazy[agent_id] for agent_id in ids])
+    print(f"\n{'Startup + ' + str(args.lookups) + ' lookups':<34}{'seconds':>10}{'agents built':>15}")
+    print(f"{'load every agent':<34}{eager_seconds:>10.3f}{eager.loaded:>15}")
+    print(f"{'lazy (load on first access)':<34}{lazy_seconds:>10.4f}{lazy.loaded:>15}")
+
+    # First bid round after startup: only sellers of the job's skill are built
+    bidding = PersistentAgentRegistry(AgentRepository(path))
+    market = Marketplace(Blockchain(), None, None, verbose=False, agents=bidding)
+    buyer = Agent('buyer_0', 'buyer', [], initial_balance=1000, verbose=False)
+    market.register_agent(buyer)
+    job_id = market.post_job(buyer, 'Benchmark job', SKILLS[0], 30)
+    bids, bid_seconds = timed(lambda: market.collect_bids(job_id))
+    print(f"\nFirst bid round ({SKILLS[0]} job): {len(bids)} bids in {bid_seconds:.3f} s, "
+          f"{bidding.loaded} of {args.agents} agents built")
+    bidding.repository.close()
+
+    # Flush: only dirty rows vs the whole table
+    agents = list(eager.values())
+    changed = rng.sample(agents, max(1, int(len(agents) * args.changed)))
+    for agent in changed:
+        agent.receive_payment(5)
+        eager.mark_dirty(agent.agent_id)
+    _, dirty_seconds = timed(eager.flush)
+    rows = [eager._row(agent) for agent in agents]
+    _, full_seconds = timed(lambda: eager.repository.save_many(rows, eager.batch_size))
+    print(f"\n{'Flush after changes':<34}{'seconds':>10}{'rows':>15}")
+    print(f"{'rewrite every agent':<34}{full_seconds:>10.3f}{len(rows):>15}")
+    print(f"{'dirty rows only':<34}{dirty_seconds:>10.4f}{len(changed):>15}")
+
+    # Round trip check
+    check = PersistentAgentRegistry(AgentRepository(path))
+    sample = changed[0]
+    restored = check[sample.agent_id]
+    print(f"\nRound trip {sample.agent_id}: balance {restored.balance} (expected {sample.balance}), "
+          f"jobs completed {restored.jobs_completed} (expected {sample.jobs_completed})")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
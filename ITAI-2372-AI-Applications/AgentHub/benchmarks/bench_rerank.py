@@ -0,0 +1,158 @@
+"""
+Rerank Benchmark
+Reranks thousands of candidate outputs for one job three ways: the old loop
+(one cross-encoder predict per output, then a full sort), one batched
+predict call, and a bi-encoder shortlist with top-k selection. Reports
+time and how many of the true top k the shortlist kept (recall@k)
+
+By default both models are simulated: the cross-encoder costs a fixed
+overhead per predict call plus a cost per pair, and the bi-encoder's
+similarity is a noisy version of the cross-encoder's score. Pass --ml to
+use the real models.
+
+Usage:
+    python benchmarks/bench_rerank.py --candidates 2000 --top-k 10 --prefilter 100
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from embeddings import EmbeddingService
+from ml_validator import ML_AVAILABLE, MLValidator
+
+JOB = "Analyze customer satisfaction survey data and report the main drivers"
+
+SENTENCES = [
+    "Satisfaction fell 4 points, driven mainly by delivery times.",
+    "Survey responses were cleaned and segmented by region.",
+    "The main drivers are price, support wait times and delivery.",
+    "Net promoter score rose among enterprise customers.",
+    "Our bakery opens at 8am and the sourdough sells out by noon.",
+    "Attached is a chart of satisfaction by month.",
+    "Done.",
+]
+
+
+def quality_of(text):
+    """Hidden relevance the simulated models agree on (0-1), read from the candidate's tag"""
+    return float(text.rsplit('#', 1)[1]) if '#' in text else 0.5
+
+
+class SimulatedCrossEncoder:
+    """Stand-in CrossEncoder: score from the candidate's hidden relevance, overhead + per-pair cost"""
+
+    def __init__(self, overhead=0.003, per_pair=0.0004):
+        self.overhead = overhead
+        self.per_pair = per_pair
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        time.sleep(self.overhead + self.per_pair * len(pairs))
+        return np.array([10 * quality_of(output) - 5 for _, output in pairs])
+
+
+class SimulatedBiEncoder:
+    """Stand-in SentenceTransformer: cosine to the job = hidden relevance + noise; cheap per text"""
+
+    def __init__(self, dim=64, noise=0.05, per_text=0.00002):
+        self.dim = dim
+        self.noise = noise
+        self.per_text = per_text
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True, convert_to_numpy=True,
+               show_progress_bar=False):
+        time.sleep(self.per_text * len(texts))
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            if '#' not in text:
+                vectors[row, 0] = 1.0  # The job itself
+                continue
+            rng = np.random.default_rng(int(hashlib.md5(text.encode()).hexdigest()[:8], 16))
+            similarity = np.clip(quality_of(text) + rng.normal(0, self.noise), -1, 1)
+            rest = rng.standard_normal(self.dim - 1)
+            vectors[row, 0] = similarity
+            vectors[row, 1:] = rest / np.linalg.norm(rest) * np.sqrt(1 - similarity ** 2)
+        return vectors
+
+
+def make_candidates(count, seed):
+    rng = random.Random(seed)
+    candidates = []
+    for _ in range(count):
+        text = ' '.join(rng.choices(SENTENCES, k=rng.randint(1, 6)))
+        candidates.append(f"{text} #{rng.random():.4f}")
+    return candidates
+
+
+def make_validator(args):
+    validator = MLValidator(verbose=False)
+    if not args.ml:
+        validator.ml_enabled = True
+        embeddings = EmbeddingService(verbose=False)
+        embeddings.model = SimulatedBiEncoder()
+        validator._models.update({'quality': SimulatedCrossEncoder(), 'semantic': embeddings})
+    return validator
+
+
+def loop_rerank(validator, outputs):
+    """The old implementation: one predict call per output, then a full sort"""
+    scored = [(output, float(validator.quality_model.predict([[JOB, output]])[0])) for output in outputs]
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub rerank benchmark")
+    parser.add_argument('--candidates', type=int, default=2000)
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--prefilter', default='50,100,200', help='comma-separated shortlist sizes')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--ml', action='store_true', help='use the real models instead of simulated ones')
+    args = parser.parse_args()
+
+    if args.ml and not ML_AVAILABLE:
+        print("ML libraries are required for --ml: pip install sentence-transformers transformers torch")
+        return
+
+    validator = make_validator(args)
+    outputs = make_candidates(args.candidates, args.seed)
+    validator.rerank_outputs(JOB, outputs[:8])  # Warm up
+
+    print("=" * 70)
+    print("RERANK BENCHMARK")
+    print("=" * 70)
+    print(f"Candidates: {args.candidates}  Top k: {args.top_k}  Model: {'real' if args.ml else 'simulated'}")
+
+    start = time.perf_counter()
+    reference = loop_rerank(validator, outputs)
+    baseline = time.perf_counter() - start
+    truth = {output for output, _ in reference[:args.top_k]}
+
+    print(f"\n{'Strategy':<34}{'seconds':>9}{'speedup':>9}{'cross pairs':>13}{'recall@k':>10}")
+    print(f"{'loop + full sort (old)':<34}{baseline:>9.3f}{1.0:>8.1f}x{args.candidates:>13}{1.0:>10.0%}")
+
+    runs = [('batched, full ranking', None, None), (f'batched, top {args.top_k}', args.top_k, None)]
+    runs += [(f'shortlist {size} + top {args.top_k}', args.top_k, int(size)) for size in args.prefilter.split(',')]
+    for name, top_k, prefilter in runs:
+        start = time.perf_counter()
+        ranked = validator.rerank_outputs(JOB, outputs, top_k=top_k, prefilter=prefilter)
+        elapsed = time.perf_counter() - start
+        recall = len(truth & {output for output, _ in ranked[:args.top_k]}) / len(truth)
+        pairs = min(prefilter or args.candidates, args.candidates)
+        print(f"{name:<34}{elapsed:>9.3f}{baseline / elapsed:>8.1f}x{pairs:>13}{recall:>10.0%}")
+    print("\n(recall@k: share of the full cross-encoder ranking's top k that the strategy returned)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
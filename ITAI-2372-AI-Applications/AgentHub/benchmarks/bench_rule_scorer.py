@@ -0,0 +1,158 @@
+"""
+Rule Scorer Benchmark
+Times the cheap rule-based signals (AIValidator._calculate_base_score and
+MLValidator._calculate_completeness) on long outputs against their previous
+implementations, which rebuilt the rules and stop words on every call and
+lowercased the output once per keyword. Also times a single alternation
+regex per job type as the keyword matcher, and checks every strategy gives
+the old scores exactly
+
+Usage:
+    python benchmarks/bench_rule_scorer.py --sizes 1000,100000,1000000 --repeat 20
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ai_validator import AIValidator
+from ml_validator import MLValidator
+from simulation import JOB_DESCRIPTIONS
+
+FILLER = ("the survey responses were grouped by region and month before the team compared "
+          "delivery times support wait times and price against overall satisfaction").split()
+
+
+def old_base_score(job_type, work_output):
+    """The previous _calculate_base_score: rules rebuilt, output lowercased per keyword"""
+    scoring_rules = {job: {'min_length': rules['min_length'], 'keywords': list(rules['keywords']),
+                           'base_score': rules['base_score']}
+                     for job, rules in AIValidator.SCORING_RULES.items()}
+    rules = scoring_rules.get(job_type, {'min_length': 40, 'keywords': [], 'base_score': 70})
+    score = rules['base_score']
+    if len(work_output) < rules['min_length']:
+        score -= 20
+    keywords_found = sum(1 for kw in rules['keywords'] if kw.lower() in work_output.lower())
+    score += (keywords_found / len(rules['keywords'])) * 15 if rules['keywords'] else 0
+    return int(score)
+
+
+def old_completeness(job_description, work_output):
+    """The previous _calculate_completeness: stop words rebuilt, output tokens collected into a set"""
+    min_length = len(job_description) * 0.5
+    length_ratio = min(len(work_output) / max(min_length, 1), 1.0)
+    job_words = set(job_description.lower().split())
+    output_words = set(work_output.lower().split())
+    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for'}
+    job_keywords = job_words - stop_words
+    coverage = len(job_keywords & output_words) / len(job_keywords) if job_keywords else 0.5
+    return (length_ratio * 0.6) + (coverage * 0.4)
+
+
+# One alternation regex per job type; the zero-width lookahead also finds overlapping keywords
+PATTERNS = {job: re.compile('(?=(' + '|'.join(map(re.escape, sorted(rules['keywords'], key=len, reverse=True)))
+                            + '))')
+            for job, rules in AIValidator.SCORING_RULES.items()}
+
+
+def regex_base_score(job_type, work_output):
+    """Keywords matched by one regex scan, stopping once all are found"""
+    rules = AIValidator.SCORING_RULES.get(job_type, AIValidator.DEFAULT_RULES)
+    score = rules['base_score']
+    if len(work_output) < rules['min_length']:
+        score -= 20
+    keywords = rules['keywords']
+    if keywords:
+        found = set()
+        for match in PATTERNS[job_type].finditer(work_output.lower()):
+            found.add(match.group(1))
+            if len(found) == len(keywords):
+                break
+        score += (len(found) / len(keywords)) * 15
+    return int(score)
+
+
+def make_output(size, job_type, placement, rng):
+    """Filler text of about size characters with the job type's keywords at the start, end or nowhere"""
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(FILLER)
+        words.append(word.capitalize() if rng.random() < 0.05 else word)
+        length += len(word) + 1
+    keywords = [kw.upper() for kw in AIValidator.SCORING_RULES[job_type]['keywords']]
+    if placement == 'start':
+        words = keywords + words
+    elif placement == 'end':
+        words = words + keywords
+    return ' '.join(words)
+
+
+def per_call_us(fn, cases, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for case in cases:
+            fn(*case)
+    return (time.perf_counter() - start) / (repeat * len(cases)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub rule scorer benchmark")
+    parser.add_argument('--sizes', default='1000,100000,1000000', help='comma-separated output sizes (chars)')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    job_types = list(AIValidator.SCORING_RULES)
+
+    print("=" * 70)
+    print("RULE SCORER BENCHMARK")
+    print("=" * 70)
+    print(f"Job types: {len(job_types)}  Repeat: {args.repeat}  (microseconds per call)")
+    print(f"\n{'Output':<10}{'keywords':<10}{'base old':>10}{'base new':>10}{'regex':>10}"
+          f"{'compl old':>11}{'compl new':>11}")
+
+    mismatches = 0
+    for size in [int(s) for s in args.sizes.split(',')]:
+        for placement in ('start', 'end', 'none'):
+            outputs = [(job, make_output(size, job, placement, rng)) for job in job_types]
+            completeness_cases = [(JOB_DESCRIPTIONS.get(job, job), output) for job, output in outputs]
+
+            for job, output in outputs:
+                score = old_base_score(job, output)
+                mismatches += score != AIValidator._calculate_base_score(job, output)
+                mismatches += score != regex_base_score(job, output)
+            for case in completeness_cases:
+                mismatches += old_completeness(*case) != MLValidator._calculate_completeness(*case)
+
+            timings = [per_call_us(fn, outputs, args.repeat)
+                       for fn in (old_base_score, AIValidator._calculate_base_score, regex_base_score)]
+            timings += [per_call_us(fn, completeness_cases, args.repeat)
+                        for fn in (old_completeness, MLValidator._calculate_completeness)]
+            print(f"{f'{size // 1000}KB':<10}{placement:<10}{timings[0]:>10.1f}{timings[1]:>10.1f}"
+                  f"{timings[2]:>10.1f}{timings[3]:>11.1f}{timings[4]:>11.1f}")
+
+    # Short outputs, unknown job types, punctuation and mixed whitespace around job words
+    vocabulary = FILLER + ['analysis', 'Code', 'QUALITY', 'content'] + ' '.join(JOB_DESCRIPTIONS.values()).split()
+    for _ in range(2000):
+        job = rng.choice(job_types + ['unknown'])
+        words = rng.choices(vocabulary, k=rng.randint(0, 12))
+        output = ''.join(word + rng.choice([' ', ' ', '\n', '\t', ', ', '. ', 's ', '']) for word in words)
+        mismatches += old_base_score(job, output) != AIValidator._calculate_base_score(job, output)
+        if job in PATTERNS:
+            mismatches += old_base_score(job, output) != regex_base_score(job, output)
+        case = (JOB_DESCRIPTIONS.get(job, job), output)
+        mismatches += old_completeness(*case) != MLValidator._calculate_completeness(*case)
+
+    print(f"\nScore mismatches against the old implementations: {mismatches}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Sharded Marketplace Benchmark
+Measures job throughput of the single-process marketplace against ShardRouter
+deployments with increasing shard counts
+
+Usage:
+    python benchmarks/bench_sharding.py --jobs 50000 --shards 1,2,4
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent import Agent
+from sharding import ShardRouter
+from simulation import DEFAULT_SKILL_WEIGHTS, JOB_DESCRIPTIONS, MarketplaceSimulation
+
+
+def make_agents(num_buyers, num_sellers, seed):
+    """Build the same buyer and seller population for every run"""
+    rng = random.Random(seed)
+    skills = list(DEFAULT_SKILL_WEIGHTS)
+    weights = list(DEFAULT_SKILL_WEIGHTS.values())
+    agents = [Agent(f"buyer_{i}", 'buyer', [], initial_balance=10**12, verbose=False)
+              for i in range(num_buyers)]
+    for i in range(num_sellers):
+        chosen = sorted({rng.choices(skills, weights)[0] for _ in range(rng.randint(1, 2))})
+        agents.append(Agent(f"seller_{i}", 'seller', chosen, initial_balance=0,
+                            max_concurrent_jobs=10, verbose=False))
+    return agents
+
+
+def make_jobs(num_jobs, num_buyers, seed):
+    """Pre-generate (buyer, description, type, budget) tuples"""
+    rng = random.Random(seed + 1)
+    skills = list(DEFAULT_SKILL_WEIGHTS)
+    weights = list(DEFAULT_SKILL_WEIGHTS.values())
+    jobs = []
+    for _ in range(num_jobs):
+        job_type = rng.choices(skills, weights)[0]
+        jobs.append((f"buyer_{rng.randrange(num_buyers)}", JOB_DESCRIPTIONS[job_type],
+                     job_type, rng.randint(8, 30)))
+    return jobs
+
+
+def run_sharded(num_shards, agents, jobs, seed):
+    """Push all jobs through a ShardRouter and time it end to end"""
+    router = ShardRouter(num_shards=num_shards, skill_weights=DEFAULT_SKILL_WEIGHTS, seed=seed)
+    router.start()
+    for agent in agents:
+        router.register_agent(agent)
+
+    start = time.perf_counter()
+    for buyer_id, description, job_type, budget in jobs:
+        router.submit_job(buyer_id, description, job_type, budget)
+    ledger = router.stop()
+    elapsed = time.perf_counter() - start
+
+    return elapsed, router, ledger
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub sharded marketplace throughput")
+    parser.add_argument('--jobs', type=int, default=50_000)
+    parser.add_argument('--buyers', type=int, default=50)
+    parser.add_argument('--sellers', type=int, default=200)
+    parser.add_argument('--shards', default='1,2,4', help='comma-separated shard counts')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("SHARDED MARKETPLACE BENCHMARK")
+    print("=" * 70)
+    print(f"Jobs: {args.jobs}  Buyers: {args.buyers}  Sellers: {args.sellers}  CPUs: {os.cpu_count()}")
+
+    baseline = MarketplaceSimulation(num_buyers=args.buyers, num_sellers=args.sellers,
+                                     history_limit=1_000, seed=args.seed).run(args.jobs)
+    base_rate = baseline['throughput_jobs_per_s']
+    print(f"\n{'Deployment':<22}{'time s':>10}{'jobs/s':>12}{'speedup':>10}{'blocks':>10}")
+    print(f"{'single process':<22}{baseline['wall_time_s']:>10.2f}{base_rate:>12.0f}"
+          f"{1.0:>10.2f}{baseline['memory']['blocks']:>10}")
+
+    jobs = make_jobs(args.jobs, args.buyers, args.seed)
+    for num_shards in (int(n) for n in args.shards.split(',')):
+        agents = make_agents(args.buyers, args.sellers, args.seed)
+        elapsed, router, ledger = run_sharded(num_shards, agents, jobs, args.seed)
+        rate = args.jobs / elapsed
+        print(f"{f'{num_shards} shard(s)':<22}{elapsed:>10.2f}{rate:>12.0f}"
+              f"{rate / base_rate:>10.2f}{ledger['blocks']:>10}")
+        print(f"   jobs per shard: {router.jobs_per_shard}  outcomes: {router.results}  "
+              f"ledger valid: {ledger['valid']}")
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
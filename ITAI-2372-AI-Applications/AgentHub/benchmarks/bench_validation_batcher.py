@@ -0,0 +1,117 @@
+"""
+Validation Batcher Benchmark
+Concurrent clients submit single validations, either straight to the model
+(one forward pass per request) or through ValidationBatcher at several
+max batch size / max wait settings
+
+By default the model is simulated: a forward pass costs a fixed overhead
+plus a per-item cost, which is the shape that makes batching pay off on
+CPU. Pass --ml to use MLValidator's real models instead.
+
+Usage:
+    python benchmarks/bench_validation_batcher.py --clients 32 --requests 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from validation_batcher import ValidationBatcher
+from validation_stats import ValidationStats
+
+
+class SimulatedModel:
+    """Stand-in batch validator: one forward pass at a time, overhead + per-item cost"""
+
+    def __init__(self, overhead=0.004, per_item=0.0002):
+        self.overhead = overhead
+        self.per_item = per_item
+        self.validation_stats = ValidationStats()
+        self._device = threading.Lock()  # One forward pass at a time, as on a shared CPU
+
+    def validate_batch(self, pairs, batch_size=32):
+        with self._device:
+            time.sleep(self.overhead + self.per_item * len(pairs))
+        return [{'score': 80, 'confidence': 0.9, 'passed': True, 'breakdown': {}} for _ in pairs]
+
+    def validate_work(self, job_description, work_output, job_type=None):
+        return self.validate_batch([(job_description, work_output, job_type)])[0]
+
+
+def run_clients(validate, clients, requests):
+    """Run requests split across client threads; return (seconds, latencies)"""
+    latencies = []
+    lock = threading.Lock()
+    per_client = requests // clients
+
+    def client(seed):
+        rng = random.Random(seed)
+        mine = []
+        for i in range(per_client):
+            started = time.perf_counter()
+            validate(f"Job {seed}-{i}", "output " * rng.randint(5, 60), 'data_analysis')
+            mine.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub validation batcher benchmark")
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--settings', default='8:1,32:2,32:5,64:10',
+                        help='comma-separated max_batch_size:max_wait_ms pairs')
+    parser.add_argument('--overhead', type=float, default=0.004, help='simulated seconds per forward pass')
+    parser.add_argument('--per-item', type=float, default=0.0002, help='simulated seconds per item')
+    parser.add_argument('--ml', action='store_true', help='use MLValidator instead of the simulated model')
+    args = parser.parse_args()
+
+    if args.ml:
+        from ml_validator import MLValidator
+        model = MLValidator(use_gpu=False, verbose=False)
+        model_name = f"MLValidator ({model.device})"
+    else:
+        model = SimulatedModel(args.overhead, args.per_item)
+        model_name = f"simulated ({args.overhead * 1000:.1f} ms + {args.per_item * 1000:.2f} ms/item)"
+
+    print("=" * 70)
+    print("VALIDATION BATCHER BENCHMARK")
+    print("=" * 70)
+    print(f"Clients: {args.clients}  Requests: {args.requests}  Model: {model_name}")
+    print(f"\n{'Strategy':<22}{'items/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'batch':>8}{'peak q':>8}")
+
+    elapsed, latencies = run_clients(model.validate_work, args.clients, args.requests)
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"{'one pass per request':<22}{len(latencies) / elapsed:>9.0f}{p50:>9.1f}{p99:>9.1f}{1:>8.1f}{'-':>8}")
+
+    for setting in args.settings.split(','):
+        size, wait_ms = setting.split(':')
+        batcher = ValidationBatcher(model, max_batch_size=int(size), max_wait=float(wait_ms) / 1000)
+        elapsed, latencies = run_clients(batcher.validate_work, args.clients, args.requests)
+        batcher.shutdown()
+        stats = batcher.get_batching_stats()
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        name = f"batcher {size} / {wait_ms} ms"
+        print(f"{name:<22}{len(latencies) / elapsed:>9.0f}{p50:>9.1f}{p99:>9.1f}"
+              f"{stats['batch_size']['mean']:>8.1f}{stats['peak_queue_depth']:>8}")
+    print("\n(batch: mean requests per forward pass; peak q: deepest request queue seen)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
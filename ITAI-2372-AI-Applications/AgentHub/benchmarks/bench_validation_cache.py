@@ -0,0 +1,136 @@
+"""
+Validation Result Cache Benchmark
+Replays a marketplace validation stream (agents' canned outputs for the
+simulation's job descriptions) through MLValidator without a result cache,
+with the in-memory cache, and after a restart on the SQLite tier, then
+checks that a model version change invalidates the persisted results
+
+By default the cross-encoder and sentence encoder are simulated (fixed cost
+per call plus a cost per text); pass --ml to use the real models.
+
+Usage:
+    python benchmarks/bench_validation_cache.py --validations 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent import simulate_work
+from bench_embedding_cache import SimulatedEncoder
+from embeddings import EmbeddingService
+from ml_validator import ML_AVAILABLE, MLValidator
+from simulation import JOB_DESCRIPTIONS
+
+
+class SimulatedCrossEncoder:
+    """Stand-in CrossEncoder: deterministic logits, overhead + per-pair cost"""
+
+    def __init__(self, overhead=0.004, per_pair=0.001):
+        self.overhead = overhead
+        self.per_pair = per_pair
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        time.sleep(self.overhead + self.per_pair * len(pairs))
+        return np.array([(len(job) % 7 + len(output) % 5) / 3 - 1 for job, output in pairs])
+
+
+def make_validator(args, cache_size, cache_path=None):
+    validator = MLValidator(verbose=False, cache_size=cache_size, cache_path=cache_path)
+    if not args.ml:
+        validator.ml_enabled = True
+        embeddings = EmbeddingService(verbose=False)
+        embeddings.model = SimulatedEncoder()
+        validator._models.update({'quality': SimulatedCrossEncoder(), 'semantic': embeddings, 'classifier': None})
+    return validator
+
+
+def workload(validations, seed=7):
+    """Validation requests as the marketplace issues them: (job description, output, job type)"""
+    rng = random.Random(seed)
+    skills = list(JOB_DESCRIPTIONS)
+    requests = []
+    for _ in range(validations):
+        job_type = rng.choice(skills)
+        description = JOB_DESCRIPTIONS[job_type]
+        # Usually the best-matching agent wins; sometimes another skill does the job
+        skill = job_type if rng.random() < 0.8 else rng.choice(skills)
+        requests.append((description, simulate_work(skill, description), job_type))
+    return requests
+
+
+def replay(validator, requests):
+    """Validate each request; return (seconds, per-request latencies, scores)"""
+    latencies = []
+    scores = []
+    start = time.perf_counter()
+    for request in requests:
+        started = time.perf_counter()
+        scores.append(validator.validate_work(*request)['score'])
+        latencies.append(time.perf_counter() - started)
+    return time.perf_counter() - start, latencies, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub validation result cache benchmark")
+    parser.add_argument('--validations', type=int, default=2000)
+    parser.add_argument('--ml', action='store_true', help='use the real models instead of simulated ones')
+    args = parser.parse_args()
+
+    if args.ml and not ML_AVAILABLE:
+        print("ML libraries are required for --ml: pip install sentence-transformers transformers torch")
+        return
+
+    requests = workload(args.validations)
+    distinct = len(set(requests))
+
+    print("=" * 70)
+    print("VALIDATION RESULT CACHE BENCHMARK")
+    print("=" * 70)
+    print(f"Validations: {args.validations}  Distinct (job, output, type): {distinct}  "
+          f"Model: {'real' if args.ml else 'simulated'}")
+
+    path = os.path.join(tempfile.mkdtemp(prefix='agenthub-validation-cache-'), 'results.sqlite3')
+    runs = [('no cache', make_validator(args, 0))]
+    runs.append(('memory', make_validator(args, 10_000)))
+    runs.append(('memory + disk', make_validator(args, 10_000, path)))
+    runs.append(('after restart', make_validator(args, 10_000, path)))
+
+    print(f"\n{'Cache':<16}{'seconds':>9}{'val/s':>10}{'p50 µs':>10}{'hit p50 µs':>12}{'hit rate':>10}{'speedup':>9}")
+    baseline = None
+    reference = None
+    for name, validator in runs:
+        seconds, latencies, scores = replay(validator, requests)
+        stats = validator.cache.get_stats()
+        # Hits are the fastest requests: every miss runs the models
+        hit_latencies = sorted(latencies)[:stats['hits']]
+        hit_p50 = f"{np.percentile(hit_latencies, 50) * 1e6:.1f}" if hit_latencies else '-'
+        baseline = baseline or seconds
+        reference = reference or scores
+        mismatches = sum(a != b for a, b in zip(scores, reference))
+        print(f"{name:<16}{seconds:>9.3f}{len(requests) / seconds:>10.0f}{np.percentile(latencies, 50) * 1e6:>10.0f}"
+              f"{hit_p50:>12}{stats['hit_rate']:>10.1%}{baseline / seconds:>8.1f}x"
+              + (f"  ⚠️  {mismatches} scores differ" if mismatches else ""))
+        if name == 'after restart':
+            print(f"{'':<16}disk hits: {stats['disk_hits']} (results reloaded from SQLite, no inference)")
+
+    # A model upgrade changes the version, so the persisted results must not be reused
+    MLValidator.SCORING_VERSION += 1
+    upgraded = make_validator(args, 10_000, path)
+    persisted = upgraded.cache.get_stats()['persisted']
+    upgraded.validate_work(*requests[0])
+    stats = upgraded.cache.get_stats()
+    print(f"\nVersion change: {persisted} stale rows left after reopening, "
+          f"first lookup {'missed (recomputed)' if stats['misses'] == 1 else 'HIT (stale!)'}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Validation Pool Benchmark
+Concurrent clients (standing in for Flask request threads) validate unique
+outputs either on one in-process validator or through ValidationPool at
+several worker counts
+
+By default the validator is simulated: each item costs pure-Python work that
+holds the GIL (tokenising, post-processing) plus native inference time that
+releases it, the mix that makes an in-process validator stop scaling with
+threads. Pass --ml to use MLValidator's real models instead.
+
+It also times the pool's transport on its own: batches of 32 validation
+requests sent through a multiprocessing queue to an echo process and back,
+next to copying the same pickled batch through a SharedMemory block (no
+signalling), at several output sizes.
+
+Usage:
+    python benchmarks/bench_validation_pool.py --clients 16 --requests 800 --workers 1,2,4
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from validation_pool import ValidationPool
+from validation_stats import ValidationStats
+
+
+class SimulatedValidator:
+    """Stand-in validator: GIL-bound Python work plus GIL-free 'inference' per item"""
+
+    def __init__(self, python_steps, native_steps):
+        """
+        Args:
+            python_steps: Interpreter loop iterations per item (see calibrate)
+            native_steps: Matrix products per item (see calibrate)
+        """
+        self.python_steps = python_steps
+        self.native_steps = native_steps
+        self.validation_stats = ValidationStats()
+        self._weights = np.random.default_rng(0).standard_normal((128, 128))
+
+    @staticmethod
+    def calibrate(python_ms, native_ms):
+        """Fixed amounts of work taking python_ms and native_ms on an idle core"""
+        probe = SimulatedValidator(2000, 200)
+        started = time.perf_counter()
+        probe._python_work('calibration')
+        python_steps = int(2000 * python_ms / ((time.perf_counter() - started) * 1000))
+        started = time.perf_counter()
+        probe._native_work(1)
+        native_steps = int(200 * native_ms / ((time.perf_counter() - started) * 1000))
+        return max(1, python_steps), max(1, native_steps)
+
+    def _python_work(self, text):
+        # Pure interpreter work, as tokenising and post-processing are
+        checksum = 0
+        for _ in range(self.python_steps):
+            checksum = (checksum * 31 + sum(map(ord, text))) % 1_000_003
+        return checksum
+
+    def _native_work(self, items):
+        # Matrix products release the GIL but still need a core, as torch inference does
+        for _ in range(self.native_steps * items):
+            self._weights @ self._weights
+
+    def validate_batch(self, pairs, batch_size=32):
+        checksums = [self._python_work(pair[1]) for pair in pairs]
+        self._native_work(len(pairs))
+        results = [{'score': 60 + checksum % 40, 'confidence': 0.9, 'passed': True, 'breakdown': {}}
+                   for checksum in checksums]
+        self.validation_stats.record_many(results, [pair[2] for pair in pairs])
+        return results
+
+    def validate_work(self, job_description, work_output, job_type=None):
+        return self.validate_batch([(job_description, work_output, job_type)])[0]
+
+
+class SimulatedFactory:
+    """Picklable factory so each pool worker builds its own simulated validator"""
+
+    def __init__(self, python_steps, native_steps):
+        self.python_steps = python_steps
+        self.native_steps = native_steps
+
+    def __call__(self):
+        return SimulatedValidator(self.python_steps, self.native_steps)
+
+
+def _echo(requests, results):
+    """Transport probe: send every message straight back"""
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+        results.put(message)
+
+
+def transport_overhead(sizes, batch=32, rounds=200):
+    """
+    Per-item cost of moving request batches through the pool's queues
+    Returns: List of (output size, queue round trip us/item, SharedMemory copy us/item)
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+    requests, results = context.Queue(), context.Queue()
+    echo = context.Process(target=_echo, args=(requests, results), daemon=True)
+    echo.start()
+    report = []
+    for size in sizes:
+        payload = [(i, 'validate', ("Analyze customer satisfaction survey data", 'x' * size, 'data_analysis'))
+                   for i in range(batch)]
+        started = time.perf_counter()
+        for _ in range(rounds):
+            requests.put(payload)
+            results.get()
+        queue_us = (time.perf_counter() - started) / (rounds * batch) * 1e6
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            data = pickle.dumps(payload)
+            block = shared_memory.SharedMemory(create=True, size=len(data))
+            block.buf[:len(data)] = data
+            pickle.loads(bytes(block.buf[:len(data)]))
+            block.close()
+            block.unlink()
+        shm_us = (time.perf_counter() - started) / (rounds * batch) * 1e6
+        report.append((size, queue_us, shm_us))
+    requests.put(None)
+    echo.join()
+    return report
+
+
+def run_clients(validate, clients, requests):
+    """Run unique validations split across client threads; return (seconds, latencies)"""
+    latencies = []
+    lock = threading.Lock()
+    per_client = requests // clients
+
+    def client(seed):
+        mine = []
+        for i in range(per_client):
+            started = time.perf_counter()
+            validate("Analyze customer satisfaction survey data",
+                     f"Analysis {seed}-{i}: satisfaction rose {i % 17}% with {seed} key drivers", 'data_analysis')
+            mine.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+def report(name, seconds, latencies, baseline):
+    print(f"{name:<22}{len(latencies) / seconds:>10.0f}{np.percentile(latencies, 50) * 1000:>10.1f}"
+          f"{np.percentile(latencies, 95) * 1000:>10.1f}{baseline / seconds if baseline else 1.0:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub validation pool benchmark")
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=800)
+    parser.add_argument('--workers', default='1,2,4', help='comma-separated pool sizes')
+    parser.add_argument('--python-ms', type=float, default=2.0, help='simulated GIL-bound ms per item')
+    parser.add_argument('--native-ms', type=float, default=2.0, help='simulated GIL-free ms per item')
+    parser.add_argument('--transport-sizes', default='200,2000,100000',
+                        help='comma-separated output sizes (chars) for the transport probe')
+    parser.add_argument('--ml', action='store_true', help='use MLValidator instead of the simulated model')
+    args = parser.parse_args()
+
+    if args.ml:
+        from ml_validator import ML_AVAILABLE, MLValidator
+        if not ML_AVAILABLE:
+            print("ML libraries are required for --ml: pip install sentence-transformers transformers torch")
+            return
+        in_process = MLValidator(verbose=False, lazy=False, cache_size=0)
+        in_process.warm_up(background=False)
+        factory = None
+    else:
+        steps = SimulatedValidator.calibrate(args.python_ms, args.native_ms)
+        in_process = SimulatedValidator(*steps)
+        factory = SimulatedFactory(*steps)
+
+    print("=" * 70)
+    print("VALIDATION POOL BENCHMARK")
+    print("=" * 70)
+    print(f"Clients: {args.clients}  Requests: {args.requests}  CPUs: {os.cpu_count()}  "
+          f"Model: {'real' if args.ml else f'simulated ({args.python_ms} ms GIL + {args.native_ms} ms native)'}")
+    print(f"\n{'Validator':<22}{'val/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'speedup':>10}")
+
+    # Outputs are unique, so the pool's result cache never answers for the workers
+    seconds, latencies = run_clients(in_process.validate_work, args.clients, args.requests)
+    baseline = seconds
+    report('in-process', seconds, latencies, None)
+
+    for workers in [int(w) for w in args.workers.split(',')]:
+        pool = ValidationPool(num_workers=workers, verbose=False, validator_factory=factory)
+        while not pool.readiness()['ready']:
+            time.sleep(0.05)
+        seconds, latencies = run_clients(pool.validate_work, args.clients, args.requests)
+        batch = pool.get_stats()['pool']['batch_size']
+        report(f"pool x{workers} (batch {batch['mean']:.1f})", seconds, latencies, baseline)
+        pool.shutdown()
+
+    print(f"\n{'Transport (us/item)':<22}{'queue':>10}{'shm copy':>10}")
+    for size, queue_us, shm_us in transport_overhead([int(s) for s in args.transport_sizes.split(',')]):
+        print(f"{f'{size} char output':<22}{queue_us:>10.1f}{shm_us:>10.1f}")
+    print("(queue: round trip through the pool's queues; shm copy: pickled batch via SharedMemory, one way)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Work Executor Benchmark
+Runs auction rounds whose work takes real (fake) time, comparing inline
+execution with thread-pool, process-pool and async executors
+
+Usage:
+    python benchmarks/bench_work_executors.py --jobs 200 --latency lognormal --mean 0.05
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent import Agent
+from ai_validator import AIValidator
+from blockchain import Blockchain
+from executors import (AsyncWorkExecutor, FakeWorker, ProcessWorkExecutor,
+                       ThreadWorkExecutor, WorkExecutor)
+from marketplace import Marketplace
+from smart_contract import SmartContract
+
+SKILLS = ['data_analysis', 'image_generation', 'text_generation', 'code_review', 'validation']
+
+
+def run(executor, args):
+    """Post jobs, clear one auction round and execute it on the executor"""
+    random.seed(args.seed)
+    rng = random.Random(args.seed)
+    stages = defaultdict(list)
+    blockchain = Blockchain()
+    market = Marketplace(
+        blockchain,
+        SmartContract(blockchain, verbose=False),
+        AIValidator(verbose=False),
+        verbose=False,
+        stage_timer=lambda stage, seconds: stages[stage].append(seconds),
+        executor=executor
+    )
+    buyer = Agent('buyer', 'buyer', [], initial_balance=10**9, verbose=False)
+    market.register_agent(buyer)
+    for i in range(args.sellers):
+        market.register_agent(Agent(f"seller_{i}", 'seller', rng.sample(SKILLS, 2), verbose=False))
+    market.enable_batch_auction(seller_capacity=3)
+    for i in range(args.jobs):
+        market.post_job(buyer, f"Benchmark job {i}", rng.choice(SKILLS), rng.randint(8, 30))
+
+    start = time.perf_counter()
+    result = market.run_auction_round(execute=True)
+    elapsed = time.perf_counter() - start
+    executor.shutdown()
+    return elapsed, result, stages['work'], executor.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub work executor benchmark")
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--sellers', type=int, default=100)
+    parser.add_argument('--latency', choices=FakeWorker.DISTRIBUTIONS, default='lognormal')
+    parser.add_argument('--mean', type=float, default=0.05, help='mean work latency in seconds')
+    parser.add_argument('--spread', type=float, default=0.5)
+    parser.add_argument('--failure-rate', type=float, default=0.05)
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='seconds per attempt (default: 5x the mean latency)')
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=64)
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    timeout = args.timeout or args.mean * 5
+    worker = FakeWorker(args.latency, args.mean, args.spread, args.failure_rate, seed=args.seed)
+    policy = {'timeout': timeout, 'retries': args.retries}
+    executors = [
+        ('inline', lambda: WorkExecutor(worker, **policy)),
+        (f"threads ({args.threads})", lambda: ThreadWorkExecutor(worker, max_workers=args.threads, **policy)),
+        (f"processes ({args.processes})", lambda: ProcessWorkExecutor(worker, max_workers=args.processes, **policy)),
+        ('async', lambda: AsyncWorkExecutor(worker.serve, **policy)),
+    ]
+
+    print("=" * 70)
+    print("WORK EXECUTOR BENCHMARK")
+    print("=" * 70)
+    print(f"Jobs: {args.jobs}  Latency: {args.latency} mean {args.mean}s  "
+          f"Failure rate: {args.failure_rate}  Timeout: {timeout:.3f}s  Retries: {args.retries}")
+    print(f"\n{'Executor':<18}{'wall s':>8}{'jobs/s':>9}{'work p50':>10}{'work p99':>10}"
+          f"{'done':>6}{'retried':>9}{'t/o':>5}{'failed':>8}")
+
+    for name, factory in executors:
+        elapsed, result, work, stats = run(factory(), args)
+        executed = len(result['executed'])
+        p50, p99 = np.percentile(work, [50, 99]) if work else (0.0, 0.0)
+        print(f"{name:<18}{elapsed:>8.2f}{executed / elapsed:>9.0f}{p50 * 1000:>9.1f}m{p99 * 1000:>9.1f}m"
+              f"{stats['completed']:>6}{stats['retried']:>9}{stats['timeouts']:>5}{stats['failed']:>8}")
+    print("\n(work p50/p99: from submitting the work to its output being ready, retries included)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
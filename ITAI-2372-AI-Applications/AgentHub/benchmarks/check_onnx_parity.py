@@ -0,0 +1,104 @@
+"""
+ONNX Backend Parity Check
+Scores bench_onnx_backend's fixed validation set on PyTorch and on each ONNX
+backend, and fails if a backend drifts from PyTorch past its tolerances:
+the largest per-pair change in quality, similarity, classification and
+final score, the share of pass/fail verdicts that match, and the share of
+outputs the job type classifier gives the same top label
+
+Skipped (exit status 0) when the ML libraries, ONNX Runtime or optimum are
+not installed. Exits with status 1 if a backend is out of tolerance or its
+models fail to load.
+
+Usage:
+    python benchmarks/check_onnx_parity.py --backends onnx,onnx-int8
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_onnx_backend import compare, run_backends, validation_set
+
+# Largest allowed difference from PyTorch (quality, similarity and classification
+# on 0-1, score on 0-100) and smallest share of matching verdicts and top labels
+TOLERANCES = {
+    # Same fp32 graph: only float rounding may differ
+    'onnx': {'quality': 0.005, 'similarity': 0.005, 'classification': 0.01, 'score': 1,
+             'verdicts': 1.0, 'labels': 1.0},
+    # int8 weights drift a little, but no verdict may change
+    'onnx-int8': {'quality': 0.05, 'similarity': 0.03, 'classification': 0.1, 'score': 3,
+                  'verdicts': 1.0, 'labels': 0.9},
+}
+
+MAX_DELTAS = ('quality', 'similarity', 'classification', 'score')
+
+
+def missing_dependencies():
+    """Packages the ONNX backends need that aren't installed"""
+    return [package for package in ('torch', 'sentence_transformers', 'onnxruntime', 'optimum')
+            if importlib.util.find_spec(package) is None]
+
+
+def violations(delta, tolerance):
+    """Human-readable list of the tolerances a backend's deltas break"""
+    broken = [f"{name} {delta[name]:g} > {tolerance[name]:g}" for name in MAX_DELTAS if delta[name] > tolerance[name]]
+    broken += [f"{name} {delta[name]:.0%} < {tolerance[name]:.0%}" for name in ('verdicts', 'labels')
+               if delta[name] < tolerance[name]]
+    return broken
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHub ONNX backend parity check")
+    parser.add_argument('--backends', default='onnx,onnx-int8', help='comma-separated ONNX backends to check')
+    args = parser.parse_args()
+    backends = [backend for backend in args.backends.split(',') if backend != 'torch']
+    unknown = [backend for backend in backends if backend not in TOLERANCES]
+    if unknown:
+        parser.error(f"no tolerances for {', '.join(unknown)} (choose from {', '.join(TOLERANCES)})")
+
+    print("=" * 70)
+    print("ONNX BACKEND PARITY CHECK")
+    print("=" * 70)
+    missing = missing_dependencies()
+    if missing:
+        print(f"SKIPPED: not installed: {', '.join(missing)} (pip install optimum[onnxruntime])")
+        print("=" * 70)
+        return
+
+    results = run_backends(backends, repeats=1)
+    print(f"Validation set: {len(validation_set())} pairs against PyTorch")
+    failed = []
+    if 'error' in results['torch']:
+        print(f"torch      ERROR: {results['torch']['error']}")
+        failed = backends
+    for backend in backends:
+        if backend in failed:
+            continue
+        result = results[backend]
+        if 'error' in result:
+            print(f"{backend:<11}ERROR: {result['error']}")
+            failed.append(backend)
+            continue
+        delta = compare(result, results['torch'])
+        broken = violations(delta, TOLERANCES[backend])
+        print(f"{backend:<11}{'FAIL' if broken else 'OK':<6}"
+              f"Δquality {delta['quality']:.4f}  Δsim {delta['similarity']:.4f}  "
+              f"Δclass {delta['classification']:.4f}  Δscore {delta['score']}  "
+              f"verdicts {delta['verdicts']:.0%}  labels {delta['labels']:.0%}")
+        for message in broken:
+            print(f"{'':<17}{message}")
+        if broken:
+            failed.append(backend)
+
+    print(f"\nParity: {'FAILED for ' + ', '.join(failed) if failed else 'OK'}")
+    print("=" * 70)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -50,6 +50,33 @@ class Blockchain:
         self.chain.append(block)
         return block
     
+    def add_blocks(self, entries):
+        """
+        Append a batch of blocks in order, sharing one timestamp
+        Args:
+            entries: List of transaction data dicts
+        Returns: List of new blocks
+        """
+        timestamp = str(datetime.now())
+        previous_hash = self.chain[-1]['hash'] if self.chain else '0'
+        index = len(self.chain)
+        blocks = []
+        
+        for data in entries:
+            block = {
+                'index': index,
+                'data': data,
+                'timestamp': timestamp,
+                'previous_hash': previous_hash
+            }
+            block_string = json.dumps(block, sort_keys=True).encode()
+            previous_hash = block['hash'] = hashlib.sha256(block_string).hexdigest()
+            blocks.append(block)
+            index += 1
+        
+        self.chain.extend(blocks)
+        return blocks
+    
     def is_valid(self):
         """
         Validate the entire blockchain
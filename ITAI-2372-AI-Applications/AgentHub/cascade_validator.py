@@ -0,0 +1,233 @@
+"""
+Cascade Validator for AgentHub
+Cheap rule-based pre-screen in front of the transformer models
+
+Most outputs are easy calls: a one-line answer that ignores the job fails,
+a long on-topic answer that hits the job type's keywords passes. The cascade
+scores every output first with two signals that cost microseconds: the ML
+validator's completeness check (length and keyword coverage against the job)
+and the rule-based AIValidator score for the job type (without its random
+variance). When their combined screen score is clearly past the pass or fail
+threshold and each signal on its own is on the same side of the pass mark,
+the screen result is returned at once.
+Only ambiguous outputs go on to the wrapped validator's models.
+
+A small audit_rate sends a share of the screened outputs to the models as
+well, so the thresholds can be tuned against how often the screen's verdict
+matches the models'.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from ai_validator import AIValidator
+from ml_validator import MLValidator
+from streaming_stats import RunningStats
+
+
+class CascadeValidator:
+    """
+    Two-tier validator: rule-based screen, then the ML models for ambiguous outputs
+    Features:
+    - Screen tier: completeness + job type rules, no model calls
+    - Configurable pass/fail thresholds; both signals must agree with the verdict
+    - Ambiguous outputs escalate to the wrapped validator (batched in validate_batch)
+    - Per-tier hit rates and latencies; optional audit of screened verdicts
+    - Drop-in validator: validate_work, validate_batch, submit
+    """
+
+    PASS_MARK = 70  # Same pass mark as MLValidator
+
+    def __init__(self, validator, pass_threshold=85, fail_threshold=40, completeness_weight=0.5,
+                 audit_rate=0.0, seed=None, verbose=False):
+        """
+        Args:
+            validator: Model-backed validator (MLValidator, ValidationBatcher or ValidationPool)
+            pass_threshold: Screen score (0-100) at or above which an output passes
+                without the models (None never short-circuits a pass)
+            fail_threshold: Screen score below which an output fails without the
+                models (None never short-circuits a failure)
+            completeness_weight: Weight of completeness in the screen score (rules get the rest)
+            audit_rate: Share of screened outputs also sent to the models to check the verdict
+            seed: Random seed for audit sampling
+            verbose: Whether to print per-validation tier decisions
+        """
+        if pass_threshold is not None and fail_threshold is not None and fail_threshold > pass_threshold:
+            raise ValueError("fail_threshold must not be above pass_threshold")
+        self.validator = validator
+        self.validator_id = getattr(validator, 'validator_id', type(validator).__name__)
+        self.pass_threshold = pass_threshold
+        self.fail_threshold = fail_threshold
+        self.completeness_weight = completeness_weight
+        self.audit_rate = audit_rate
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.tiers = {'screen_pass': 0, 'screen_fail': 0, 'model': 0}
+        self.audited = 0
+        self.audit_agreed = 0
+        self.screen_ms = RunningStats()
+        self.model_ms = RunningStats()  # Per escalated output
+
+    def __getattr__(self, name):
+        # Anything else (validation_stats, readiness, get_stats, ...) comes from the wrapped validator
+        if name == 'validator':
+            raise AttributeError(name)
+        return getattr(self.validator, name)
+
+    def screen(self, job_description, work_output, job_type=None):
+        """
+        Score an output with the cheap signals only
+        Args:
+            job_description: Original job requirements
+            work_output: Agent's work output
+            job_type: Job type for the rule-based score
+        Returns: Result dict in MLValidator's format, with 'tier' set to
+            'screen_pass', 'screen_fail' or 'ambiguous'
+        """
+        completeness = MLValidator._calculate_completeness(job_description, work_output) * 100
+        rules = min(100, AIValidator._calculate_base_score(job_type or '', work_output))
+        score = int(self.completeness_weight * completeness + (1 - self.completeness_weight) * rules)
+        # Confidence from how closely the two signals agree, as MLValidator's does for its models
+        confidence = max(0.0, 1 - abs(completeness - rules) / 100)
+
+        tier = 'ambiguous'
+        if (self.pass_threshold is not None and score >= self.pass_threshold
+                and min(completeness, rules) >= self.PASS_MARK):
+            tier = 'screen_pass'
+        elif (self.fail_threshold is not None and score < self.fail_threshold
+                and max(completeness, rules) < self.PASS_MARK):
+            tier = 'screen_fail'
+        return {
+            'score': score,
+            'confidence': round(confidence, 3),
+            'passed': score >= self.PASS_MARK,
+            'breakdown': {
+                'completeness': int(completeness),
+                'rules': int(rules)
+            },
+            'tier': tier
+        }
+
+    def _audit(self):
+        return self.audit_rate > 0 and self._rng.random() < self.audit_rate
+
+    def _record_screen(self, result, started, job_type):
+        with self._lock:
+            self.tiers[result['tier']] += 1
+            self.screen_ms.update((time.perf_counter() - started) * 1000)
+        self.validator.validation_stats.record(result, job_type)
+        if self.verbose:
+            print(f"   ⚡ Screened: {result['score']}/100 ({'✅ PASSED' if result['passed'] else '❌ FAILED'})")
+
+    def _record_model(self, result, screened, seconds_each):
+        """Count an escalated (or audited) output and tag its result"""
+        with self._lock:
+            self.model_ms.update(seconds_each * 1000)
+            if screened['tier'] == 'ambiguous':
+                self.tiers['model'] += 1
+            else:
+                # Audited: the screen would have answered; the models' result is used
+                self.tiers[screened['tier']] += 1
+                self.audited += 1
+                self.audit_agreed += result['passed'] == screened['passed']
+        result['tier'] = 'model'
+        return result
+
+    def validate_work(self, job_description, work_output, job_type=None):
+        """
+        Validate one output, escalating to the models only when the screen is unsure
+        Same signature and result format as MLValidator.validate_work
+        """
+        started = time.perf_counter()
+        screened = self.screen(job_description, work_output, job_type)
+        if screened['tier'] != 'ambiguous' and not self._audit():
+            self._record_screen(screened, started, job_type)
+            return screened
+        model_started = time.perf_counter()
+        result = self.validator.validate_work(job_description, work_output, job_type)
+        return self._record_model(result, screened, time.perf_counter() - model_started)
+
+    def validate_batch(self, pairs, batch_size=32):
+        """
+        Validate many outputs; the ambiguous ones go to the models in one batch
+        Args:
+            pairs: List of (job_description, work_output[, job_type]) tuples
+            batch_size: Items per forward pass for the escalated outputs
+        Returns: List of result dicts in input order
+        """
+        pairs = [(pair[0], pair[1], pair[2] if len(pair) > 2 else None) for pair in pairs]
+        results = [None] * len(pairs)
+        screens = {}
+        escalate = []
+        for i, pair in enumerate(pairs):
+            started = time.perf_counter()
+            screened = self.screen(*pair)
+            if screened['tier'] != 'ambiguous' and not self._audit():
+                self._record_screen(screened, started, pair[2])
+                results[i] = screened
+            else:
+                screens[i] = screened
+                escalate.append(i)
+        if escalate:
+            started = time.perf_counter()
+            scored = self.validator.validate_batch([pairs[i] for i in escalate], batch_size=batch_size)
+            seconds_each = (time.perf_counter() - started) / len(escalate)
+            for i, result in zip(escalate, scored):
+                results[i] = self._record_model(result, screens[i], seconds_each)
+        return results
+
+    def submit(self, job_description, work_output, job_type=None):
+        """
+        Queue one validation
+        Screened outputs resolve at once; escalated ones use the wrapped validator's
+        submit() when it has one (batcher or pool), otherwise run now
+        Returns: Future resolving to the result dict
+        """
+        started = time.perf_counter()
+        screened = self.screen(job_description, work_output, job_type)
+        future = Future()
+        if screened['tier'] != 'ambiguous' and not self._audit():
+            self._record_screen(screened, started, job_type)
+            future.set_result(screened)
+            return future
+        if not hasattr(self.validator, 'submit'):
+            future.set_result(self.validate_work(job_description, work_output, job_type))
+            return future
+
+        model_started = time.perf_counter()
+        inner = self.validator.submit(job_description, work_output, job_type)
+
+        def done(inner):
+            if inner.exception() is not None:
+                future.set_exception(inner.exception())
+            else:
+                future.set_result(self._record_model(inner.result(), screened, time.perf_counter() - model_started))
+
+        inner.add_done_callback(done)
+        return future
+
+    def get_cascade_stats(self):
+        """Per-tier counts, hit rates and latencies, plus audit agreement"""
+        with self._lock:
+            tiers = dict(self.tiers)
+            total = sum(tiers.values())
+            return {
+                'thresholds': {
+                    'pass': self.pass_threshold,
+                    'fail': self.fail_threshold
+                },
+                'total': total,
+                'tiers': tiers,
+                'hit_rates': {tier: round(count / total, 3) if total else 0.0 for tier, count in tiers.items()},
+                'screen_ms': self.screen_ms.to_dict(4),
+                'model_ms': self.model_ms.to_dict(3),
+                'audit': {
+                    'rate': self.audit_rate,
+                    'audited': self.audited,
+                    'agreement': round(self.audit_agreed / self.audited, 3) if self.audited else None
+                }
+            }
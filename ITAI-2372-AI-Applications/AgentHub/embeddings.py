@@ -0,0 +1,332 @@
+"""
+Embedding Service for AgentHub
+One shared sentence-transformer with a content-hash keyed LRU cache
+
+MLValidator and AIAssistant both embed text with all-MiniLM-L6-v2. They
+share one EmbeddingService per model and device, so the model is loaded
+once and a text that was embedded before (a job description, a skill label,
+a help question) is served from the cache instead of being re-encoded. The
+cache can be persisted as a float16 matrix file plus a small JSON index, so
+it survives restarts.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from onnx_backend import check_backend, load_model
+
+try:
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
+
+DEFAULT_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+
+
+class EmbeddingCache:
+    """
+    LRU cache of embedding vectors keyed by a hash of the text
+    Features:
+    - Vectors stored as rows of one matrix; evicted rows are reused
+    - O(1) lookup, insert and eviction (OrderedDict in LRU order)
+    - Optional on-disk persistence: float16 matrix + JSON index, one file pair
+      per namespace and capacity. The matrix is loaded into private memory and
+      save() writes new files and renames them into place, so processes never
+      share writable rows (a forked child gets a copy-on-write copy and does
+      not save)
+    """
+
+    def __init__(self, capacity=10_000, path=None, namespace=''):
+        """
+        Args:
+            capacity: Most vectors kept
+            path: Directory to persist the cache in (None keeps it in memory only)
+            namespace: Name the vectors belong to (e.g. the model); caches for
+                other namespaces in the same directory are left untouched
+        """
+        self.capacity = capacity
+        self.path = path
+        self.namespace = namespace
+        self.dim = None
+        self.matrix = None
+        self._rows = OrderedDict()  # key -> row, least recently used first
+        self._next_row = 0
+        self._pid = os.getpid()  # Only the process that opened the cache saves it
+        if path:
+            self._open()
+
+    @staticmethod
+    def key(text):
+        """Content hash used as the cache key"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def get(self, key):
+        """
+        Cached vector for a key, marking it recently used
+        Returns: float32 vector, or None on a miss
+        """
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        self._rows.move_to_end(key)
+        return np.array(self.matrix[row], dtype=np.float32)  # Copy: the row can be reused
+
+    def put(self, key, vector):
+        """Store a vector, evicting the least recently used one when full"""
+        if self.capacity <= 0:
+            return
+        if self.matrix is None:
+            self._allocate(len(vector))
+        row = self._rows.get(key)
+        if row is not None:
+            self._rows.move_to_end(key)
+        elif self._next_row < self.capacity:
+            row = self._next_row
+            self._next_row += 1
+            self._rows[key] = row
+        else:
+            _, row = self._rows.popitem(last=False)
+            self._rows[key] = row
+        self.matrix[row] = vector
+
+    def _files(self):
+        # One file pair per namespace and capacity, so caches for other models or backends are left alone
+        tag = hashlib.blake2b(f"{self.namespace}:{self.capacity}".encode('utf-8'), digest_size=6).hexdigest()
+        return (os.path.join(self.path, f'vectors-{tag}.f16'),
+                os.path.join(self.path, f'index-{tag}.json'))
+
+    def _allocate(self, dim):
+        """Create the vector matrix once the embedding size is known"""
+        self.dim = dim
+        # Persisted caches hold float16, the on-disk format
+        self.matrix = np.zeros((self.capacity, dim), dtype=np.float16 if self.path else np.float32)
+
+    def _open(self):
+        """Reopen a persisted cache if it matches this namespace and capacity"""
+        vectors, index = self._files()
+        if not (os.path.exists(vectors) and os.path.exists(index)):
+            return
+        try:
+            with open(index, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        if meta.get('namespace') != self.namespace or meta.get('capacity') != self.capacity:
+            return
+        try:
+            # Read into private memory rather than mapping the file, which other processes may share
+            matrix = np.fromfile(vectors, dtype=np.float16)
+        except OSError:
+            return
+        if matrix.size != self.capacity * meta['dim']:
+            return
+        self.dim = meta['dim']
+        self.matrix = matrix.reshape(self.capacity, self.dim)
+        self._rows = OrderedDict((key, row) for key, row in meta['rows'])
+        self._next_row = meta['next_row']
+
+    def save(self):
+        """
+        Write the vectors and index to new files and rename them into place
+        (no-op for in-memory caches and in processes forked after opening)
+        """
+        if not self.path or self.matrix is None or os.getpid() != self._pid:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        vectors, index = self._files()
+        suffix = f".{os.getpid()}.tmp"
+        self.matrix.tofile(vectors + suffix)
+        meta = {
+            'namespace': self.namespace,
+            'capacity': self.capacity,
+            'dim': self.dim,
+            'next_row': self._next_row,
+            'rows': list(self._rows.items())
+        }
+        with open(index + suffix, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        # Without an index the files are ignored, so a crash between the renames loses the cache, never mixes it
+        if os.path.exists(index):
+            os.remove(index)
+        os.replace(vectors + suffix, vectors)
+        os.replace(index + suffix, index)
+
+
+class EmbeddingService:
+    """
+    Shared sentence embedding model with a text-hash LRU cache
+    Features:
+    - Model loaded on first use
+    - Only texts missing from the cache are encoded, each once per call
+    - Normalised float32 embeddings (dot product = cosine similarity)
+    - Thread-safe; hit/miss counters for dashboards
+    """
+
+    def __init__(self, model_name=DEFAULT_MODEL, device='cpu', cache_size=10_000, cache_path=None, verbose=True,
+                 backend='torch'):
+        """
+        Args:
+            model_name: Sentence-transformers model
+            device: 'cpu' or 'cuda'
+            cache_size: Most embeddings cached
+            cache_path: Directory to persist the cache in (None for memory only)
+            verbose: Whether to print model loading messages
+            backend: 'torch', 'onnx' or 'onnx-int8' (see onnx_backend)
+        """
+        check_backend(backend)
+        self.model_name = model_name
+        self.device = device
+        self.verbose = verbose
+        self.backend = backend
+        self.model = None
+        # Backends give slightly different vectors, so each keeps its own persisted cache
+        namespace = model_name if backend == 'torch' else f"{model_name}:{backend}"
+        self.cache = EmbeddingCache(cache_size, cache_path, namespace=namespace)
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.encoded = 0
+
+    @property
+    def available(self):
+        """Whether sentence-transformers is installed"""
+        return EMBEDDINGS_AVAILABLE
+
+    def load(self):
+        """
+        Load the model if it isn't loaded yet
+        Returns: SentenceTransformer instance
+        """
+        if self.model is None:
+            with self._load_lock:
+                if self.model is None:
+                    if not EMBEDDINGS_AVAILABLE:
+                        raise RuntimeError("sentence-transformers is not installed")
+                    if self.verbose:
+                        print(f"   Loading {self.model_name} on {self.backend} (shared embedding service)...")
+                    self.model = load_model(SentenceTransformer, self.model_name, self.backend, self.device)
+        return self.model
+
+    def encode(self, texts, batch_size=32, cache=True):
+        """
+        Embed texts, encoding only those not already cached
+        Args:
+            texts: List of strings
+            batch_size: Texts per forward pass for the misses
+            cache: Whether to look up and store these texts in the cache
+                (pass False for one-off texts so they don't evict reusable ones)
+        Returns: float32 array of shape (len(texts), dim), rows L2-normalised
+        """
+        keys = [EmbeddingCache.key(text) for text in texts]
+        found = {}
+        missing = {}  # key -> text, each distinct text once
+        with self._lock:
+            for key, text in zip(keys, texts):
+                if key in found or key in missing:
+                    continue
+                vector = self.cache.get(key) if cache else None
+                if vector is None:
+                    missing[key] = text
+                else:
+                    found[key] = vector
+            if cache:
+                hits = sum(1 for key in keys if key in found)
+                self.hits += hits
+                self.misses += len(keys) - hits
+
+        if missing:
+            vectors = self.load().encode(
+                list(missing.values()),
+                batch_size=batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+            vectors = np.asarray(vectors, dtype=np.float32)
+            with self._lock:
+                self.encoded += len(missing)
+                for key, vector in zip(missing, vectors):
+                    found[key] = vector
+                    if cache:
+                        self.cache.put(key, vector)
+
+        if not keys:
+            return np.zeros((0, self.load().get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def save(self):
+        """Persist the cache (if it has a path)"""
+        with self._lock:
+            self.cache.save()
+
+    def get_stats(self):
+        """Cache counters for dashboards and benchmarks"""
+        lookups = self.hits + self.misses
+        return {
+            'model': self.model_name,
+            'backend': self.backend,
+            'loaded': self.model is not None,
+            'cached': len(self.cache),
+            'capacity': self.cache.capacity,
+            'persisted': bool(self.cache.path),
+            'hits': self.hits,
+            'misses': self.misses,
+            'encoded': self.encoded,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+class ChromaEmbeddingFunction:
+    """ChromaDB embedding function backed by the shared EmbeddingService"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def __call__(self, input):
+        return self.service.encode(list(input)).tolist()
+
+
+# Shared instances, one per (model, device, backend)
+_services = {}
+_services_lock = threading.Lock()
+
+def get_embedding_service(model_name=DEFAULT_MODEL, device='cpu', cache_size=10_000, cache_path=None,
+                          backend='torch'):
+    """
+    Get or create the shared embedding service for a model, device and backend
+    The first call configures the cache; later calls return the same instance
+
+    Args:
+        model_name: Sentence-transformers model
+        device: 'cpu' or 'cuda'
+        cache_size: Most embeddings cached
+        cache_path: Directory to persist the cache in (saved at exit)
+        backend: 'torch', 'onnx' or 'onnx-int8'
+
+    Returns:
+        EmbeddingService instance
+    """
+    with _services_lock:
+        key = (model_name, device, backend)
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = EmbeddingService(
+                model_name, device, cache_size=cache_size, cache_path=cache_path, backend=backend
+            )
+            if cache_path:
+                atexit.register(service.save)
+        return service
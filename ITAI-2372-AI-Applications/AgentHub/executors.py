@@ -0,0 +1,417 @@
+"""
+Work Executors for AgentHub
+Runs agent work through a pluggable backend (inline, thread pool, process
+pool or an async worker service) with timeouts, cancellation and retry
+
+Work is started with submit(), which returns a WorkTask immediately, and
+collected with result(), so a marketplace can start many jobs before waiting
+on any of them. Timeouts are measured from when an attempt starts running,
+not while it is queued behind a busy pool; a timed out or failed attempt is
+cancelled and resubmitted until the retry budget is spent. Failed attempts
+are resubmitted as soon as they fail, not when the caller gets round to
+collecting them, so one slow collection doesn't hold up other retries. FakeWorker
+stands in for a real model or service with configurable latency
+distributions and failure rates.
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from agent import simulate_work
+
+
+class WorkFailed(Exception):
+    """Raised when work still fails after every retry"""
+
+    def __init__(self, message, attempts, last_error=None):
+        super().__init__(message)
+        self.attempts = attempts
+        self.last_error = last_error
+
+
+class WorkTask:
+    """One unit of submitted work and its current attempt"""
+
+    __slots__ = ('skill', 'job_description', 'future', 'attempts', 'submitted', 'started', 'finished')
+
+    def __init__(self, skill, job_description):
+        self.skill = skill
+        self.job_description = job_description
+        self.future = None
+        self.attempts = 0
+        self.submitted = time.perf_counter()
+        self.started = None  # When the current attempt began running (None while queued)
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        """Seconds the current attempt has run (0 while queued)"""
+        if self.started is None:
+            return 0.0
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return max(0.0, end - self.started)
+
+    @property
+    def latency(self):
+        """Seconds from submission until the output was ready, queueing and retries included"""
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.submitted
+
+
+class WorkExecutor:
+    """
+    Runs work inline in the caller's thread
+    Base class for the pooled executors
+    Features:
+    - submit()/result() split so callers can start many jobs before waiting
+    - Per-attempt timeouts with cancellation of the stale attempt
+    - Retries with linear backoff
+    - Counters for dashboards and benchmarks
+
+    Inline work can't be interrupted, so timeouts only apply once it returns.
+    """
+
+    def __init__(self, worker=None, timeout=None, retries=0, backoff=0.0):
+        """
+        Args:
+            worker: Callable(skill, job_description) -> output (defaults to simulate_work)
+            timeout: Seconds allowed per attempt (None waits forever)
+            retries: Extra attempts after a failure or timeout
+            backoff: Seconds to wait before retry n, multiplied by n
+        """
+        self.worker = worker or simulate_work
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.retried = 0
+        self.cancelled = 0
+        self._counter_lock = threading.Lock()
+        self._retry_lock = threading.RLock()  # Re-entered when inline retries fail at once
+
+    def _start(self, task):
+        """Start one attempt and return its Future"""
+        future = Future()
+        try:
+            future.set_result(self._run(task, task.attempts))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _run(self, task, attempt):
+        """Call the worker, stamping when the attempt actually began"""
+        if task.attempts == attempt:
+            task.started = time.perf_counter()
+        return self.worker(task.skill, task.job_description)
+
+    def _launch(self, task):
+        """Start the next attempt for a task"""
+        task.attempts += 1
+        task.started = None
+        task.finished = None
+        attempt = task.attempts
+        future = task.future = self._start(task)
+        future.add_done_callback(lambda _: self._on_done(task, attempt, future))
+
+    def _on_done(self, task, attempt, future):
+        """Stamp the finish time, or resubmit straight away if the attempt failed"""
+        # A superseded attempt finishing late must not touch the current one
+        if task.attempts != attempt or future.cancelled():
+            return
+        task.finished = time.perf_counter()
+        if future.exception() is not None and not self.backoff:
+            self._retry(task, future)
+
+    def _retry(self, task, failed):
+        """
+        Resubmit a task whose attempt failed, once per failed attempt
+        Called from both the completion callback and the waiting caller
+        Returns: True if a newer attempt is running, False if retries are spent
+        """
+        with self._retry_lock:
+            if task.future is not failed:
+                return True
+            if task.attempts > self.retries:
+                return False
+            self.retried += 1
+            self._launch(task)
+            return True
+
+    def _count(self, counter):
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def submit(self, skill, job_description):
+        """
+        Start work without waiting for it
+        Args:
+            skill: Skill the work is done with
+            job_description: What work needs to be done
+        Returns: WorkTask to pass to result() or cancel()
+        """
+        task = WorkTask(skill, job_description)
+        self._count('submitted')
+        self._launch(task)
+        return task
+
+    def result(self, task):
+        """
+        Wait for a task, retrying failed or timed-out attempts
+        Args:
+            task: WorkTask from submit()
+        Returns: Work output
+        Raises: WorkFailed once the retry budget is spent
+        """
+        while True:
+            future = task.future
+            try:
+                output = self._wait(task, future)
+                self._count('completed')
+                return output
+            except FutureTimeout as e:
+                future.cancel()
+                self._count('timeouts')
+                error = e
+            except Exception as e:
+                error = e
+
+            if self.backoff and task.future is future and task.attempts <= self.retries:
+                time.sleep(self.backoff * task.attempts)
+            if not self._retry(task, future):
+                self._count('failed')
+                reason = 'timed out' if isinstance(error, FutureTimeout) else f"failed: {error}"
+                raise WorkFailed(f"Work {reason} after {task.attempts} attempts", task.attempts, error)
+
+    def _wait(self, task, future):
+        """
+        Wait for an attempt, raising FutureTimeout once it has run too long
+        Queued attempts are re-checked every timeout interval until they start
+        """
+        if self.timeout is None:
+            return future.result()
+
+        while True:
+            if task.started is None and (future.running() or future.done()):
+                # Pools that can't stamp the start (processes): use when it was seen running
+                task.started = time.perf_counter()
+            if task.started is None:
+                wait = self.timeout
+            else:
+                wait = max(0.0, task.started + self.timeout - time.perf_counter())
+            try:
+                output = future.result(timeout=wait)
+            except FutureTimeout:
+                if task.started is not None and time.perf_counter() >= task.started + self.timeout:
+                    raise
+                continue
+            if task.elapsed > self.timeout:
+                raise FutureTimeout()
+            return output
+
+    def run(self, skill, job_description):
+        """Submit work and wait for it"""
+        return self.result(self.submit(skill, job_description))
+
+    def cancel(self, task):
+        """
+        Cancel a task's current attempt
+        Returns: True if it was stopped before finishing
+        """
+        cancelled = task.future.cancel()
+        if cancelled:
+            self._count('cancelled')
+        return cancelled
+
+    def shutdown(self, wait=True):
+        """Release pool resources (nothing to do inline)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def get_stats(self):
+        """Executor counters"""
+        return {
+            'executor': type(self).__name__,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'timeouts': self.timeouts,
+            'retried': self.retried,
+            'cancelled': self.cancelled
+        }
+
+
+class ThreadWorkExecutor(WorkExecutor):
+    """
+    Runs work on a thread pool
+    Suits I/O-bound work (HTTP calls, model servers); a timed-out attempt
+    that already started keeps its thread until the worker returns
+    """
+
+    def __init__(self, worker=None, max_workers=32, **kwargs):
+        """
+        Args:
+            worker: Callable(skill, job_description) -> output
+            max_workers: Pool threads
+            **kwargs: timeout, retries, backoff (see WorkExecutor)
+        """
+        super().__init__(worker, **kwargs)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='agenthub-work')
+
+    def _start(self, task):
+        return self.pool.submit(self._run, task, task.attempts)
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class ProcessWorkExecutor(WorkExecutor):
+    """
+    Runs work in a process pool
+    Suits CPU-bound work; the worker must be picklable (a module-level
+    function or an instance such as FakeWorker). An attempt's timeout
+    starts when it is first seen running, so it may overrun by up to one
+    timeout interval
+    """
+
+    def __init__(self, worker=None, max_workers=None, **kwargs):
+        """
+        Args:
+            worker: Picklable callable(skill, job_description) -> output
+            max_workers: Pool processes (defaults to the CPU count)
+            **kwargs: timeout, retries, backoff (see WorkExecutor)
+        """
+        super().__init__(worker, **kwargs)
+        self.pool = ProcessPoolExecutor(max_workers=max_workers)
+
+    def _start(self, task):
+        # Only the worker crosses the process boundary; the start is observed in _wait
+        return self.pool.submit(self.worker, task.skill, task.job_description)
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class AsyncWorkExecutor(WorkExecutor):
+    """
+    Sends work to an async callable, e.g. a client for a local worker service
+    The coroutine runs on an event loop in a background thread, so thousands
+    of slow requests can be in flight without a thread each; a timed-out
+    attempt's coroutine is cancelled
+    """
+
+    def __init__(self, call, **kwargs):
+        """
+        Args:
+            call: Async callable(skill, job_description) -> output
+            **kwargs: timeout, retries, backoff (see WorkExecutor)
+        """
+        super().__init__(call, **kwargs)
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='agenthub-work-loop', daemon=True)
+        self._thread.start()
+
+    def _start(self, task):
+        return asyncio.run_coroutine_threadsafe(self._serve(task, task.attempts), self.loop)
+
+    @staticmethod
+    async def _cancel_pending():
+        """Cancel in-flight requests and let them unwind before the loop stops"""
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in pending:
+            t.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _serve(self, task, attempt):
+        if task.attempts == attempt:
+            task.started = time.perf_counter()
+        return await self.worker(task.skill, task.job_description)
+
+    def shutdown(self, wait=True):
+        if self.loop.is_closed():
+            return
+        if wait:
+            asyncio.run_coroutine_threadsafe(self._cancel_pending(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if wait:
+            self._thread.join()
+            self.loop.close()
+
+
+class FakeWorker:
+    """
+    Stand-in worker with configurable latency and failures
+    Features:
+    - Latency distributions: constant, uniform, exponential, lognormal, pareto
+    - Random failures for exercising retries
+    - Blocking __call__ for pooled executors, async serve() for AsyncWorkExecutor
+    - Picklable, so it also runs in a process pool (each copy sent to another
+      process draws from its own unseeded generator, or every call would
+      replay the same latency)
+    """
+
+    DISTRIBUTIONS = ('constant', 'uniform', 'exponential', 'lognormal', 'pareto')
+
+    def __init__(self, latency='lognormal', mean=1.0, spread=0.5, failure_rate=0.0, seed=None):
+        """
+        Args:
+            latency: Distribution name (see DISTRIBUTIONS)
+            mean: Mean latency in seconds
+            spread: Shape parameter: half-width fraction (uniform), sigma
+                (lognormal) or tail heaviness (pareto, larger is heavier)
+            failure_rate: Probability an attempt raises after its latency
+            seed: Random seed
+        """
+        if latency not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency}")
+        self.latency = latency
+        self.mean = mean
+        self.spread = spread
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.rng = random.Random()
+
+    def sample(self):
+        """Draw one latency in seconds"""
+        mean = self.mean
+        if self.latency == 'constant':
+            return mean
+        if self.latency == 'uniform':
+            return self.rng.uniform(mean * (1 - self.spread), mean * (1 + self.spread))
+        if self.latency == 'exponential':
+            return self.rng.expovariate(1 / mean)
+        if self.latency == 'lognormal':
+            sigma = self.spread
+            return self.rng.lognormvariate(math.log(mean) - sigma * sigma / 2, sigma)
+        # Pareto with shape alpha > 1, scaled so the mean matches
+        alpha = 1 + 1 / self.spread
+        return mean * (alpha - 1) / alpha * self.rng.paretovariate(alpha)
+
+    def _outcome(self, skill, job_description):
+        if self.rng.random() < self.failure_rate:
+            raise RuntimeError(f"Fake worker failed on {skill} job")
+        return simulate_work(skill, job_description)
+
+    def __call__(self, skill, job_description):
+        """Blocking work: sleep for a sampled latency, then return output"""
+        time.sleep(self.sample())
+        return self._outcome(skill, job_description)
+
+    async def serve(self, skill, job_description):
+        """Async work, as a local worker service would answer"""
+        await asyncio.sleep(self.sample())
+        return self._outcome(skill, job_description)
@@ -0,0 +1,262 @@
+"""
+ID Generation for AgentHub
+Snowflake-style 64-bit IDs: time-ordered, monotonic and collision-free
+across threads and processes
+
+Layout (most to least significant):
+    41 bits  milliseconds since EPOCH_MS
+    10 bits  worker ID (one per process)
+    12 bits  sequence within the millisecond
+
+String form is "<prefix>_<16 hex digits>", which sorts the same way as the
+integer, so either can be used as an ordered index key.
+
+Worker IDs come from, in order: the worker_id argument or set_worker(), the
+AGENTHUB_WORKER_ID environment variable, or a lease on the lowest free ID.
+A lease is an exclusive lock on a per-ID file in WORKER_LEASE_DIR, held
+until the process exits, so two live processes on one host never share a
+worker ID. Explicit IDs lock their file too when it is free, so leases skip
+them. Processes on different hosts need explicit worker IDs.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z
+
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+TIMESTAMP_SHIFT = WORKER_BITS + SEQUENCE_BITS
+
+WORKER_ID_ENV = 'AGENTHUB_WORKER_ID'
+WORKER_LEASE_DIR = os.path.join(tempfile.gettempdir(), 'agenthub-worker-ids')
+
+
+def _try_lock(fd):
+    """Take a non-blocking exclusive lock on an open file; False if another process holds it"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def lease_worker_id(lease_dir=None):
+    """
+    Claim the lowest worker ID no other live process on this host holds
+    Args:
+        lease_dir: Directory of per-ID lock files (defaults to WORKER_LEASE_DIR)
+    Returns: (worker_id, fd) - keep fd open for as long as the ID is in use
+    """
+    lease_dir = lease_dir or WORKER_LEASE_DIR
+    os.makedirs(lease_dir, exist_ok=True)
+    for worker_id in range(MAX_WORKER_ID + 1):
+        fd = os.open(os.path.join(lease_dir, f"worker-{worker_id}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        if _try_lock(fd):
+            return worker_id, fd
+        os.close(fd)
+    raise RuntimeError(f"All {MAX_WORKER_ID + 1} worker IDs are leased; set {WORKER_ID_ENV} explicitly")
+
+
+def claim_worker_id(worker_id, lease_dir=None):
+    """
+    Lock an explicitly chosen worker ID's file, if no other process holds it,
+    so lease_worker_id() won't hand the same ID to another process
+    Args:
+        worker_id: Worker number 0-1023
+        lease_dir: Directory of per-ID lock files (defaults to WORKER_LEASE_DIR)
+    Returns: fd holding the lock, or None if it couldn't be taken
+    """
+    lease_dir = lease_dir or WORKER_LEASE_DIR
+    try:
+        os.makedirs(lease_dir, exist_ok=True)
+        fd = os.open(os.path.join(lease_dir, f"worker-{worker_id}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:
+        return None
+    if _try_lock(fd):
+        return fd
+    os.close(fd)
+    return None
+
+
+class IdGenerator:
+    """
+    Thread-safe Snowflake ID generator
+    Features:
+    - Strictly increasing IDs within a process, even if the wall clock steps back
+    - Per-process worker IDs (explicit, from the environment, or leased) so
+      concurrent processes never collide
+    - A forked child leases its own worker ID unless one was set explicitly;
+      lease() forces a fresh one (e.g. in a worker process that inherited
+      AGENTHUB_WORKER_ID)
+    """
+
+    def __init__(self, worker_id=None, clock=time.time, lease_dir=None):
+        """
+        Args:
+            worker_id: Worker number 0-1023 (defaults to AGENTHUB_WORKER_ID, else a leased ID)
+            clock: Time source returning seconds since the Unix epoch
+            lease_dir: Directory of worker ID lock files (defaults to WORKER_LEASE_DIR)
+        """
+        self.clock = clock
+        self.lease_dir = lease_dir
+        self._lock = threading.Lock()
+        self._lease_fd = None
+        if worker_id is None and os.environ.get(WORKER_ID_ENV):
+            worker_id = int(os.environ[WORKER_ID_ENV])
+        self._explicit_worker = worker_id is not None
+        self._pid = os.getpid()
+        if worker_id is None:
+            worker_id, self._lease_fd = lease_worker_id(lease_dir)
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+        if self._explicit_worker:
+            self._lease_fd = claim_worker_id(worker_id, lease_dir)
+        self.worker_id = worker_id
+        self._last_ms = -1
+        self._sequence = 0
+
+    def _release_lease(self):
+        """Give up a leased worker ID (in a forked child, only this process's copy of the lock)"""
+        if self._lease_fd is not None:
+            os.close(self._lease_fd)
+            self._lease_fd = None
+
+    def set_worker(self, worker_id):
+        """
+        Pin the worker ID, e.g. to a shard number
+        Args:
+            worker_id: Worker number 0-1023
+        """
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+        with self._lock:
+            self._release_lease()
+            self._lease_fd = claim_worker_id(worker_id, self.lease_dir)
+            self.worker_id = worker_id
+            self._explicit_worker = True
+            self._pid = os.getpid()
+
+    def lease(self):
+        """
+        Replace the worker ID with a freshly leased one, even if it was set
+        explicitly or came from AGENTHUB_WORKER_ID
+        Returns: The leased worker ID
+        """
+        with self._lock:
+            # In a forked child this drops only the child's copy: the parent keeps its ID locked
+            self._release_lease()
+            self.worker_id, self._lease_fd = lease_worker_id(self.lease_dir)
+            self._explicit_worker = False
+            self._pid = os.getpid()
+            self._last_ms = -1
+            return self.worker_id
+
+    def next_id(self):
+        """
+        Generate the next ID
+        Returns: 63-bit integer ID
+        """
+        with self._lock:
+            pid = os.getpid()
+            if pid != self._pid:
+                # Forked child: don't reuse the parent's worker ID or sequence
+                self._pid = pid
+                if not self._explicit_worker:
+                    # The inherited lock still belongs to the parent
+                    self._release_lease()
+                    self.worker_id, self._lease_fd = lease_worker_id(self.lease_dir)
+                self._last_ms = -1
+
+            now_ms = int(self.clock() * 1000) - EPOCH_MS
+            if now_ms <= self._last_ms:
+                # Same millisecond, or the clock stepped back: keep counting
+                now_ms = self._last_ms
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    now_ms += 1
+            else:
+                self._sequence = 0
+            self._last_ms = now_ms
+
+            return (now_ms << TIMESTAMP_SHIFT) | (self.worker_id << SEQUENCE_BITS) | self._sequence
+
+
+def format_id(prefix, value):
+    """Render an integer ID as a fixed-width, sortable string"""
+    return f"{prefix}_{value:016x}"
+
+
+def parse_id(id_string):
+    """
+    Integer key for a string ID
+    Args:
+        id_string: ID such as "job_0123456789abcdef" (or an int)
+    Returns: Integer ID, or None if the string isn't a generated ID
+    """
+    if isinstance(id_string, int):
+        return id_string
+    try:
+        return int(str(id_string).rsplit('_', 1)[-1], 16)
+    except ValueError:
+        return None
+
+
+def id_to_ms(value):
+    """Milliseconds since the Unix epoch encoded in an ID"""
+    return (parse_id(value) >> TIMESTAMP_SHIFT) + EPOCH_MS
+
+
+def id_to_datetime(value):
+    """Creation time encoded in an ID (UTC)"""
+    return datetime.fromtimestamp(id_to_ms(value) / 1000, tz=timezone.utc)
+
+
+def id_floor(seconds):
+    """
+    Smallest possible ID created at or after a Unix timestamp
+    Use with id_floor(end) as an exclusive upper bound for range scans
+    Args:
+        seconds: Unix timestamp (float seconds)
+    """
+    return max(0, int(seconds * 1000) - EPOCH_MS) << TIMESTAMP_SHIFT
+
+
+# Global instance (singleton pattern)
+_id_generator = None
+_id_generator_lock = threading.Lock()
+
+
+def get_id_generator():
+    """Get or create the process-wide ID generator"""
+    global _id_generator
+    if _id_generator is None:
+        with _id_generator_lock:
+            if _id_generator is None:
+                _id_generator = IdGenerator()
+    return _id_generator
+
+
+def new_job_id():
+    """New job ID string"""
+    return format_id('job', get_id_generator().next_id())
+
+
+def new_contract_id():
+    """New contract ID string"""
+    return format_id('contract', get_id_generator().next_id())
@@ -0,0 +1,122 @@
+"""
+Prototype Job Classifier for AgentHub
+Classifies work outputs by job type with sentence embeddings
+
+Each candidate label is represented by a prototype: the normalised mean
+embedding of a few short descriptions of that kind of work. Prototypes are
+embedded once; classifying a batch of outputs is then a single encode call
+and one matrix product, instead of one NLI forward pass per label per output
+through BART. Callers that already embedded the outputs (MLValidator does,
+for semantic similarity) can pass the vectors in and skip the encode call.
+Results use the zero-shot pipeline's format, so MLValidator can swap the
+two without changing how it scores them.
+"""
+
+import numpy as np
+
+
+# Descriptions of each kind of work, embedded and averaged into the label's prototype
+LABEL_PROTOTYPES = {
+    'data analysis': [
+        'data analysis',
+        'Analysed the dataset and reported statistics, trends and insights',
+        'Cleaned the data, computed metrics and summarised the findings with charts',
+    ],
+    'content writing': [
+        'content writing',
+        'Wrote a blog post, article or product description in the requested tone',
+        'Drafted marketing copy with an introduction, sections and a call to action',
+    ],
+    'image generation': [
+        'image generation',
+        'Generated images, illustrations or artwork at the requested resolution and style',
+        'Created visual assets, logos and product renders',
+    ],
+    'code review': [
+        'code review',
+        'Reviewed the pull request and found bugs, race conditions and missing tests',
+        'Suggested refactoring, fixes and style improvements to the source code',
+    ],
+    'research': [
+        'research',
+        'Researched the topic, compared sources and summarised the literature',
+        'Gathered references and wrote a report of the findings',
+    ],
+    'design': [
+        'design',
+        'Designed the user interface layout, wireframes and visual style',
+        'Produced mockups and a design system for the application',
+    ],
+    'translation': [
+        'translation',
+        'Translated the document from one language into another',
+        'Localised the text and checked the translation for accuracy',
+    ],
+}
+
+
+class PrototypeClassifier:
+    """
+    Embedding-prototype job type classifier (drop-in for the zero-shot pipeline)
+    Features:
+    - One prototype vector per label, embedded once and reused
+    - One encode call per batch of outputs, or none with precomputed vectors;
+      cosine similarity by matrix product
+    - Softmax over label similarities gives pipeline-style scores
+    """
+
+    def __init__(self, embeddings, prototypes=None, temperature=0.05):
+        """
+        Args:
+            embeddings: EmbeddingService used for prototypes and outputs
+            prototypes: Dict of label -> list of descriptions (defaults to LABEL_PROTOTYPES)
+            temperature: Softmax temperature over cosine similarities (lower is sharper)
+        """
+        self.embeddings = embeddings
+        self.prototypes = prototypes or LABEL_PROTOTYPES
+        self.temperature = temperature
+        self._matrices = {}  # tuple of labels -> (labels, prototype matrix)
+
+    def _prototype_matrix(self, labels):
+        """Unit prototype vectors for labels, one row per label"""
+        key = tuple(labels)
+        if key not in self._matrices:
+            rows = []
+            for label in labels:
+                vectors = self.embeddings.encode(self.prototypes.get(label, [label]))
+                mean = vectors.mean(axis=0)
+                rows.append(mean / np.linalg.norm(mean))
+            self._matrices[key] = np.stack(rows)
+        return self._matrices[key]
+
+    def __call__(self, sequences, candidate_labels, batch_size=32, vectors=None):
+        """
+        Classify outputs against candidate labels
+        Args:
+            sequences: One output string or a list of them
+            candidate_labels: Labels to choose between
+            batch_size: Outputs per forward pass
+            vectors: Unit embeddings of the sequences from the same encoder, one
+                row each (skips encoding them)
+        Returns: Dict (or list of dicts) with 'sequence', and 'labels' and 'scores' best first
+        """
+        single = isinstance(sequences, str)
+        texts = [sequences] if single else list(sequences)
+        prototypes = self._prototype_matrix(candidate_labels)
+        if vectors is None:
+            # Outputs are one-off texts: keep them out of the embedding cache
+            vectors = self.embeddings.encode(texts, batch_size=batch_size, cache=False)
+        logits = vectors @ prototypes.T / self.temperature
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+        results = []
+        for text, row in zip(texts, probabilities):
+            order = np.argsort(-row)
+            results.append({
+                'sequence': text,
+                'labels': [candidate_labels[i] for i in order],
+                'scores': [float(row[i]) for i in order]
+            })
+        return results[0] if single else results
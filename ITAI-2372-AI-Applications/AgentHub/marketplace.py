@@ -4,7 +4,15 @@ Handles job posting, bidding, agent matching, and transaction coordination
 Simulates x402-style autonomous agent-to-agent transactions
 """
 
+import bisect
 import random
+import time
+
+from agent_index import AgentSearchIndex
+from auction import BatchAuction
+from executors import WorkFailed
+from ids import id_floor, parse_id
+from streaming_stats import QuantileSketch, RunningStats
 
 
 class Marketplace:
@@ -13,17 +21,64 @@ class Marketplace:
     Features:
     - Job posting and discovery
     - Automated bidding system
-    - Agent matching algorithm
+    - Load-aware agent matching algorithm
     - Transaction coordination
+    - Streaming job statistics (O(1) per completion and per read)
+    - Optional demand-based dynamic pricing
+    - Pluggable work executors, with concurrent work for batches of jobs
+    - Optional persistent agent registry with dirty-row flushing
+    - Indexed agent search (skill, reputation, price, availability)
     """
     
-    def __init__(self, blockchain, smart_contract, validator):
+    def __init__(self, blockchain, smart_contract, validator, load_weight=0.3, eta_reference=1.0,
+                 verbose=True, stage_timer=None, agent_store=None, reputation_engine=None,
+                 pricing_engine=None, executor=None, agents=None):
+        """
+        Args:
+            blockchain: Ledger for all transactions
+            smart_contract: Escrow and settlement system
+            validator: Work quality validator (a ValidationBatcher lets execute_jobs
+                validate a whole batch of jobs together)
+            load_weight: Share of the bid score given to estimated completion time
+            eta_reference: Completion time (seconds) that scores half the load credit
+            verbose: Whether to print progress for every step
+            stage_timer: Optional callable(stage, seconds) for job execution stages
+            agent_store: Optional AgentStore backing registered agents, used for bulk queries
+            reputation_engine: Optional ReputationEngine that batches reputation updates
+            pricing_engine: Optional PricingEngine fed with bids and clearing prices
+            executor: Optional WorkExecutor for seller work (None runs it inline)
+            agents: Optional agent registry mapping, e.g. a PersistentAgentRegistry (defaults to a dict)
+        """
         self.blockchain = blockchain
         self.smart_contract = smart_contract
         self.validator = validator
+        self.load_weight = load_weight
+        self.eta_reference = eta_reference
+        self.verbose = verbose
+        self.stage_timer = stage_timer
+        self.agent_store = agent_store
+        self.reputation_engine = reputation_engine
+        self.pricing_engine = pricing_engine
+        self.executor = executor
         self.active_jobs = []
         self.completed_jobs = []
-        self.agents = {}
+        self.disputed_jobs = []
+        self.agents = agents if agents is not None else {}
+        # Persistent registries are told which agents changed, and set up agents they load
+        self._mark_dirty = getattr(self.agents, 'mark_dirty', None)
+        if self._mark_dirty:
+            self.agents.on_load = self._adopt_agent
+        self._job_index = {}  # integer job ID -> job
+        self._job_keys = []  # integer job IDs in creation order
+        self.auction = None
+        self.agent_index = None  # Built on the first search
+        if reputation_engine is not None:
+            reputation_engine.on_apply = self._reputations_changed
+        self.jobs_disputed = 0
+        self.price_stats = RunningStats()
+        self.quality_stats = RunningStats()
+        self.price_quantiles = QuantileSketch((0.5, 0.95))
+        self.quality_quantiles = QuantileSketch((0.5, 0.95))
     
     def register_agent(self, agent):
         """
@@ -32,9 +87,18 @@ class Marketplace:
             agent: Agent instance
         """
         self.agents[agent.agent_id] = agent
-        print(f"✅ {agent.agent_id} registered in marketplace")
-        print(f"   Skills: {', '.join(agent.skills)}")
-        print(f"   Initial Balance: {agent.balance} tokens")
+        self._adopt_agent(agent)
+        if self.verbose:
+            print(f"✅ {agent.agent_id} registered in marketplace")
+            print(f"   Skills: {', '.join(agent.skills)}")
+            print(f"   Initial Balance: {agent.balance} tokens")
+    
+    def _adopt_agent(self, agent):
+        """Connect an agent to marketplace-wide services"""
+        if self.pricing_engine is not None:
+            agent.pricing_engine = self.pricing_engine
+        if self.agent_index is not None:
+            self.agent_index.add(agent)
     
     def post_job(self, poster_agent, job_description, job_type, budget):
         """
@@ -50,6 +114,14 @@ class Marketplace:
         
         if job:
             self.active_jobs.append(job)
+            key = parse_id(job['job_id'])
+            self._job_index[key] = job
+            if not self._job_keys or key > self._job_keys[-1]:
+                self._job_keys.append(key)
+            else:
+                bisect.insort(self._job_keys, key)
+            if self.auction:
+                self.auction.submit_job(job)
             return job['job_id']
         
         return None
@@ -65,16 +137,13 @@ class Marketplace:
         if not job:
             return []
         
-        print(f"\n📋 Collecting bids for {job_id}...")
+        if self.verbose:
+            print(f"\n📋 Collecting bids for {job_id}...")
         
         bids = []
-        for agent_id, agent in self.agents.items():
+        for agent in self.sellers_for(job['type']):
             # Skip the job poster
-            if agent_id == job['poster']:
-                continue
-            
-            # Only sellers can bid
-            if agent.agent_type != 'seller':
+            if agent.agent_id == job['poster']:
                 continue
             
             bid = agent.bid_on_job(job)
@@ -82,11 +151,26 @@ class Marketplace:
                 bids.append(bid)
         
         job['bids'] = bids
+        self.observe_bids(job)
         
-        print(f"   Total bids received: {len(bids)}")
+        if self.verbose:
+            print(f"   Total bids received: {len(bids)}")
         
         return bids
     
+    def sellers_for(self, skill):
+        """
+        Sellers offering a skill
+        A persistent registry answers from its skill index, building only those agents
+        Args:
+            skill: Job type
+        Returns: List of seller agents
+        """
+        lookup = getattr(self.agents, 'sellers_with_skill', None)
+        if lookup is not None:
+            return lookup(skill)
+        return [agent for agent in self.agents.values() if agent.agent_type == 'seller' and skill in agent.skills]
+    
     def select_winner(self, job_id):
         """
         Select winning bid using reputation-weighted algorithm
@@ -96,41 +180,82 @@ class Marketplace:
         """
         job = self._find_job(job_id)
         if not job or not job['bids']:
-            print(f"❌ No bids found for {job_id}")
+            if self.verbose:
+                print(f"❌ No bids found for {job_id}")
             return None
         
-        print(f"\n🎯 Selecting winner for {job_id}...")
+        if self.verbose:
+            print(f"\n🎯 Selecting winner for {job_id}...")
         
-        # Score each bid: lower price is better, higher reputation is better
+        # Score each bid: lower price, higher reputation and shorter queue are better
         best_score = -1
         winner = None
         
         for bid in job['bids']:
-            # Normalize price score (lower is better, scaled 0-1)
-            price_score = 1 - (bid['amount'] / job['budget'])
-            
-            # Normalize reputation score (higher is better, scaled 0-1)
-            reputation_score = bid['reputation'] / 5.0
+            bidder = self.agents.get(bid['bidder'])
             
-            # Weighted combination (60% reputation, 40% price)
-            total_score = (reputation_score * 0.6) + (price_score * 0.4)
+            # Skip sellers that filled up since bidding; use their current load
+            if bidder is None or not bidder.has_capacity():
+                continue
+            total_score = self.score_bid(bid, job['budget'], bidder.estimated_completion_time())
             
             if total_score > best_score:
                 best_score = total_score
                 winner = bid
         
         if winner:
-            print(f"   🏆 Winner: {winner['bidder']}")
-            print(f"   Amount: {winner['amount']} tokens")
-            print(f"   Reputation: {winner['reputation']:.1f}⭐")
-            print(f"   Score: {best_score:.2f}")
+            if self.verbose:
+                print(f"   🏆 Winner: {winner['bidder']}")
+                print(f"   Amount: {winner['amount']} tokens")
+                print(f"   Reputation: {winner['reputation']:.1f}⭐")
+                print(f"   Score: {best_score:.2f}")
             
             job['winner'] = winner['bidder']
             job['final_price'] = winner['amount']
             job['status'] = 'assigned'
+            self.agents[winner['bidder']].accept_job(job_id)
+            self.observe_clearing(job)
         
         return winner['bidder'] if winner else None
     
+    def observe_bids(self, job):
+        """Feed a job's bids (or lack of them) to the pricing engine"""
+        if self.pricing_engine is not None:
+            self.pricing_engine.record_bids(job['type'], [bid['amount'] for bid in job['bids']])
+    
+    def observe_clearing(self, job):
+        """Feed an awarded job's price to the pricing engine"""
+        if self.pricing_engine is not None:
+            self.pricing_engine.record_clearing(job['type'], job['final_price'])
+    
+    def score_bid(self, bid, budget, eta=None):
+        """
+        Score a bid: lower price is better, higher reputation is better,
+        and sooner estimated completion is better
+        Args:
+            bid: Bid dict from Agent.bid_on_job
+            budget: Job budget
+            eta: Current estimated completion time (defaults to the bid's)
+        Returns: Score between 0 and 1
+        """
+        # Normalize price score (lower is better, scaled 0-1)
+        price_score = 1 - (bid['amount'] / budget)
+        
+        # Normalize reputation score (higher is better, scaled 0-1)
+        reputation_score = bid['reputation'] / 5.0
+        
+        # Weighted combination (60% reputation, 40% price)
+        total_score = (reputation_score * 0.6) + (price_score * 0.4)
+        
+        # Blend in load: a seller with a long queue finishes later
+        if eta is None:
+            eta = bid.get('eta')
+        if eta is not None and self.load_weight:
+            speed_score = self.eta_reference / (self.eta_reference + eta)
+            total_score = (total_score * (1 - self.load_weight)) + (speed_score * self.load_weight)
+        
+        return total_score
+    
     def execute_job(self, job_id):
         """
         Execute a job: create contract, perform work, validate, release payment
@@ -138,10 +263,40 @@ class Marketplace:
             job_id: Job identifier
         Returns: True if successful, False otherwise
         """
+        execution = self._start_job(job_id)
+        return self._finish_job(execution) if execution else False
+    
+    def execute_jobs(self, job_ids):
+        """
+        Execute several jobs, starting all of their work before waiting on any
+        With a pooled executor the jobs' work runs concurrently, and with a
+        ValidationBatcher every job's validation is queued before any result
+        is awaited, so they share batches; settlement still happens one job
+        at a time, in the given order
+        Args:
+            job_ids: Job identifiers
+        Returns: List of True/False results, one per job
+        """
+        executions = [self._start_job(job_id) for job_id in job_ids]
+        if hasattr(self.validator, 'submit'):
+            for execution in executions:
+                if execution:
+                    self._await_work(execution)
+                    self._submit_validation(execution)
+        return [self._finish_job(execution) if execution else False for execution in executions]
+    
+    def _start_job(self, job_id):
+        """
+        Escrow payment, create the contract and start the seller's work
+        Args:
+            job_id: Job identifier
+        Returns: Execution dict for _finish_job, or None if the job can't run
+        """
         job = self._find_job(job_id)
         if not job or job['status'] != 'assigned':
-            print(f"❌ Job {job_id} not ready for execution")
-            return False
+            if self.verbose:
+                print(f"❌ Job {job_id} not ready for execution")
+            return None
         
         buyer_id = job['poster']
         seller_id = job['winner']
@@ -150,15 +305,22 @@ class Marketplace:
         buyer = self.agents[buyer_id]
         seller = self.agents[seller_id]
         
-        print(f"\n{'='*80}")
-        print(f"EXECUTING JOB: {job_id}")
-        print(f"{'='*80}")
+        if self.verbose:
+            print(f"\n{'='*80}")
+            print(f"EXECUTING JOB: {job_id}")
+            print(f"{'='*80}")
         
         # Step 1: Create smart contract and escrow payment
-        print("\n[STEP 1: SMART CONTRACT & ESCROW]")
-        if not buyer.make_payment(amount):
-            print(f"❌ {buyer_id} has insufficient balance")
-            return False
+        stage_started = time.perf_counter()
+        if self.verbose:
+            print("\n[STEP 1: SMART CONTRACT & ESCROW]")
+        if not buyer.make_payment(amount, hold=job_id):
+            if self.verbose:
+                print(f"❌ {buyer_id} has insufficient balance")
+            seller.finish_job(job_id)
+            return None
+        if self._mark_dirty:
+            self._mark_dirty(buyer_id)
         
         contract_id = self.smart_contract.create_contract(
             buyer_id,
@@ -167,50 +329,145 @@ class Marketplace:
             amount
         )
         
-        # Step 2: Seller performs work
-        print("\n[STEP 2: WORK EXECUTION]")
-        print(f"   🔨 {seller_id} performing work...")
-        work_output = seller.perform_work(job['description'])
-        print(f"   ✅ Work completed")
-        print(f"   Output: {work_output}")
+        stage_started = self._stage_done('escrow', stage_started)
         
-        # Step 3: AI validation
-        print("\n[STEP 3: AI VALIDATION]")
-        
-        # Check if using ML validator or legacy validator
-        if hasattr(self.validator, 'validate_work'):
-            # ML Validator returns a dict with 'score' key
-            validation_result = self.validator.validate_work(
-                job['description'],
-                work_output,
-                job['type']
-            )
-            # Handle both ML validator (dict) and legacy validator (int) return types
-            if isinstance(validation_result, dict):
-                quality_score = validation_result['score']
-                print(f"   🎯 ML Confidence: {validation_result.get('confidence', 'N/A')}")
+        # Step 2: Seller performs work (inline, or started on the executor)
+        if self.verbose:
+            print("\n[STEP 2: WORK EXECUTION]")
+            print(f"   🔨 {seller_id} performing work...")
+        execution = {
+            'job': job,
+            'seller': seller,
+            'amount': amount,
+            'contract_id': contract_id,
+            'stage_started': stage_started
+        }
+        if self.executor:
+            execution['task'] = self.executor.submit(seller.primary_skill, job['description'])
+        else:
+            execution['output'] = seller.perform_work(job['description'])
+            execution['work_error'] = None
+            work_finished = self._stage_done('work', stage_started)
+            seller.record_latency(work_finished - stage_started)
+        return execution
+    
+    def _await_work(self, execution):
+        """
+        Wait for work started on the executor and record its timings
+        Args:
+            execution: Dict from _start_job; gains 'output' and 'work_error'
+        """
+        if 'work_error' in execution:
+            return
+        task = execution['task']
+        try:
+            execution['output'] = self.executor.result(task)
+            execution['work_error'] = None
+        except WorkFailed as e:
+            execution['output'] = None
+            execution['work_error'] = str(e)
+        if self.stage_timer:
+            self.stage_timer('work', task.latency)
+        if execution['work_error'] is None:
+            execution['seller'].record_latency(task.elapsed)
+    
+    def _submit_validation(self, execution):
+        """
+        Queue a job's validation on the batching validator without waiting for it
+        Args:
+            execution: Dict from _start_job, after _await_work
+        """
+        if execution['work_error'] is None:
+            job = execution['job']
+            execution['validation_started'] = time.perf_counter()
+            execution['validation'] = self.validator.submit(job['description'], execution['output'], job['type'])
+    
+    def _finish_job(self, execution):
+        """
+        Wait for the work, validate it and settle the contract
+        Args:
+            execution: Dict from _start_job
+        Returns: True if payment was released, False otherwise
+        """
+        job = execution['job']
+        job_id = job['job_id']
+        seller = execution['seller']
+        seller_id = seller.agent_id
+        amount = execution['amount']
+        contract_id = execution['contract_id']
+        
+        self._await_work(execution)
+        work_output = execution['output']
+        work_error = execution['work_error']
+        # Batched validations are timed from when they were queued
+        stage_started = execution.get('validation_started') or time.perf_counter()
+        if self.verbose:
+            if work_error:
+                print(f"   ❌ Work failed: {work_error}")
             else:
-                quality_score = validation_result
+                print(f"   ✅ Work completed")
+                print(f"   Output: {work_output}")
+        
+        # Step 3: AI validation
+        if self.verbose:
+            print("\n[STEP 3: AI VALIDATION]")
+        
+        if work_error is not None:
+            # Failed work scores zero, so the contract is disputed
+            quality_score = 0
+            job['work_error'] = work_error
         else:
-            # Fallback for legacy validator
-            quality_score = self.validator.validate_work(
-                job['type'],
-                work_output,
-                job['description']
-            )
+            # Check if using ML validator or legacy validator
+            if hasattr(self.validator, 'validate_work'):
+                # ML Validator returns a dict with 'score' key
+                if 'validation' in execution:
+                    validation_result = execution['validation'].result()
+                else:
+                    validation_result = self.validator.validate_work(
+                        job['description'],
+                        work_output,
+                        job['type']
+                    )
+                # Handle both ML validator (dict) and legacy validator (int) return types
+                if isinstance(validation_result, dict):
+                    quality_score = validation_result['score']
+                    if self.verbose:
+                        print(f"   🎯 ML Confidence: {validation_result.get('confidence', 'N/A')}")
+                else:
+                    quality_score = validation_result
+            else:
+                # Fallback for legacy validator
+                quality_score = self.validator.validate_work(
+                    job['type'],
+                    work_output,
+                    job['description']
+                )
+        
+        stage_started = self._stage_done('validation', stage_started)
         
         # Step 4: Smart contract validates and releases payment
-        print("\n[STEP 4: PAYMENT SETTLEMENT]")
+        if self.verbose:
+            print("\n[STEP 4: PAYMENT SETTLEMENT]")
         payment_released = self.smart_contract.validate_and_release(
             contract_id,
             quality_score,
             self.validator.validator_id
         )
+        seller.finish_job(job_id)
+        
+        if payment_released and not seller.receive_payment(amount, hold=job_id):
+            # Escrow couldn't pay this job's hold out: settle it as a dispute, with no reputation credit
+            payment_released = False
+            job['payment_error'] = 'escrow release failed'
+            if self.verbose:
+                print(f"   ❌ Escrow release for {job_id} failed")
         
         if payment_released:
-            # Update agent balances and reputation
-            seller.receive_payment(amount)
-            seller.update_reputation(quality_score)
+            # Update reputation (the payment was released above)
+            if self.reputation_engine:
+                self.reputation_engine.record(seller, quality_score)
+            else:
+                seller.update_reputation(quality_score)
             
             job['status'] = 'completed'
             job['quality_score'] = quality_score
@@ -218,25 +475,199 @@ class Marketplace:
             
             self.completed_jobs.append(job)
             self.active_jobs.remove(job)
+            self.record_job_outcome(job)
+            self._agent_changed(seller_id)
+            self._stage_done('settlement', stage_started)
             
-            print(f"\n{'='*80}")
-            print(f"JOB COMPLETED SUCCESSFULLY ✅")
-            print(f"{'='*80}\n")
+            if self.verbose:
+                print(f"\n{'='*80}")
+                print(f"JOB COMPLETED SUCCESSFULLY ✅")
+                print(f"{'='*80}\n")
             
             return True
         else:
-            print(f"\n{'='*80}")
-            print(f"JOB DISPUTED - PAYMENT WITHHELD ❌")
-            print(f"{'='*80}\n")
+            # Disputed jobs leave the active list so they can't be executed twice
+            job['status'] = 'disputed'
+            job['quality_score'] = quality_score
+            job['contract_id'] = contract_id
+            
+            self.disputed_jobs.append(job)
+            self.active_jobs.remove(job)
+            self.record_job_outcome(job)
+            self._agent_changed(seller_id)
+            self._stage_done('settlement', stage_started)
+            
+            if self.verbose:
+                print(f"\n{'='*80}")
+                print(f"JOB DISPUTED - PAYMENT WITHHELD ❌")
+                print(f"{'='*80}\n")
             
             return False
     
+    def flush_reputation(self):
+        """
+        Apply reputation updates buffered by the reputation engine
+        Returns: Dict of agent ID -> new reputation
+        """
+        if not self.reputation_engine:
+            return {}
+        return self.reputation_engine.flush()
+    
+    def _agent_changed(self, agent_id):
+        """Note an agent's new state for the search index and persistent registry"""
+        if self.agent_index is not None:
+            self.agent_index.mark_stale(agent_id)
+        if self._mark_dirty:
+            self._mark_dirty(agent_id)
+            if self.agents.is_due():
+                self.persist()
+    
+    def _reputations_changed(self, agents):
+        """Mark agents re-rated by the reputation engine for re-indexing"""
+        if self.agent_index is not None:
+            for agent in agents:
+                self.agent_index.mark_stale(agent.agent_id)
+    
+    def search_agents(self, skill=None, min_reputation=None, min_price=None, max_price=None,
+                      available=None, agent_type=None, limit=20, cursor=None):
+        """
+        Search registered agents, highest reputation first
+        Args:
+            skill: Only agents offering this skill
+            min_reputation: Minimum reputation score
+            min_price: Minimum price for the skill
+            max_price: Maximum price for the skill
+            available: True for agents with free capacity, False for full ones
+            agent_type: Only agents of this type
+            limit: Page size
+            cursor: next_cursor from the previous page
+        Returns: Dict with 'agents', 'next_cursor' and 'scanned'
+        """
+        if self.agent_index is None:
+            index = AgentSearchIndex()
+            index.add_many(self.agents.values())
+            self.agent_index = index
+        return self.agent_index.search(
+            skill=skill,
+            min_reputation=min_reputation,
+            min_price=min_price,
+            max_price=max_price,
+            available=available,
+            agent_type=agent_type,
+            limit=limit,
+            cursor=cursor
+        )
+    
+    def persist(self):
+        """
+        Write changed agents to the persistent registry
+        Buffered reputation updates are applied first so they are not lost
+        Returns: Number of agent rows written (0 without a persistent registry)
+        """
+        self.flush_reputation()
+        if not self._mark_dirty:
+            return 0
+        return self.agents.flush()
+    
+    def top_agents(self, n=10, agent_type='seller', by='reputation_score'):
+        """
+        Highest-ranked registered agents by a numeric attribute
+        Args:
+            n: Number of agents to return
+            agent_type: Only rank agents of this type (None for all)
+            by: Attribute to rank by, e.g. 'reputation_score' or 'balance'
+        Returns: List of (agent_id, value) tuples, highest first
+        """
+        store = self.agent_store
+        if store is not None and store.size == len(self.agents) and agent_type in ('seller', None):
+            # Every registered agent is stored: rank with one vectorised pass
+            return store.top(by, n, sellers_only=agent_type == 'seller')
+        
+        ranked = [
+            (agent_id, getattr(agent, by))
+            for agent_id, agent in self.agents.items()
+            if agent_type is None or agent.agent_type == agent_type
+        ]
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:n]
+    
+    def total_balance(self):
+        """Sum of all registered agents' balances"""
+        store = self.agent_store
+        if store is not None and store.size == len(self.agents):
+            return float(store.column('balance').sum())
+        return sum(agent.balance for agent in self.agents.values())
+    
+    def record_job_outcome(self, job):
+        """
+        Fold a finished job into the running statistics
+        Args:
+            job: Job dict with status 'completed' or 'disputed'
+        """
+        if job['status'] != 'completed':
+            self.jobs_disputed += 1
+            return
+        
+        self.price_stats.update(job['final_price'])
+        self.price_quantiles.update(job['final_price'])
+        quality = job.get('quality_score', 0)
+        self.quality_stats.update(quality)
+        self.quality_quantiles.update(quality)
+    
+    def get_market_stats(self):
+        """
+        Aggregate job statistics from the running accumulators
+        Returns: Dict of counts, transaction value and quality metrics
+        """
+        return {
+            'total_agents': len(self.agents),
+            'active_jobs': len(self.active_jobs),
+            'completed_jobs': self.price_stats.count,
+            'disputed_jobs': self.jobs_disputed,
+            'total_value': round(self.price_stats.total, 2),
+            'avg_value': round(self.price_stats.mean, 2),
+            'value_std': round(self.price_stats.std, 2),
+            'value_quantiles': self.price_quantiles.to_dict(),
+            'avg_quality': round(self.quality_stats.mean, 1),
+            'quality_std': round(self.quality_stats.std, 1),
+            'quality_quantiles': self.quality_quantiles.to_dict(1)
+        }
+    
+    def prune_history(self, limit):
+        """
+        Drop all but the most recent finished jobs from memory
+        Args:
+            limit: Number of completed (and disputed) jobs to keep
+        """
+        for history in (self.completed_jobs, self.disputed_jobs):
+            if len(history) > limit:
+                for job in history[:-limit]:
+                    self._job_index.pop(parse_id(job['job_id']), None)
+                del history[:-limit]
+        self._job_keys = [key for key in self._job_keys if key in self._job_index]
+    
+    def jobs_created_between(self, start, end):
+        """
+        Range scan over indexed jobs by creation time
+        Args:
+            start: Unix timestamp (inclusive)
+            end: Unix timestamp (exclusive)
+        Returns: List of jobs in creation order
+        """
+        low = bisect.bisect_left(self._job_keys, id_floor(start))
+        high = bisect.bisect_left(self._job_keys, id_floor(end))
+        return [self._job_index[key] for key in self._job_keys[low:high]]
+    
     def _find_job(self, job_id):
         """Find a job by ID"""
-        for job in self.active_jobs + self.completed_jobs:
-            if job['job_id'] == job_id:
-                return job
-        return None
+        return self._job_index.get(parse_id(job_id))
+    
+    def _stage_done(self, stage, started):
+        """Report a finished execution stage to the stage timer"""
+        now = time.perf_counter()
+        if self.stage_timer:
+            self.stage_timer(stage, now - started)
+        return now
     
     def display_marketplace_stats(self):
         """Display marketplace statistics"""
@@ -254,21 +685,70 @@ class Marketplace:
             print(f"    Jobs Completed: {stats['jobs_completed']}")
             print(f"    Total Earned: {stats['total_earned']} tokens")
         
-        print(f"\nActive Jobs: {len(self.active_jobs)}")
-        print(f"Completed Jobs: {len(self.completed_jobs)}")
+        stats = self.get_market_stats()
+        print(f"\nActive Jobs: {stats['active_jobs']}")
+        print(f"Completed Jobs: {stats['completed_jobs']}")
+        print(f"Disputed Jobs: {stats['disputed_jobs']}")
         
-        if self.completed_jobs:
-            total_value = sum(job['final_price'] for job in self.completed_jobs)
-            avg_value = total_value / len(self.completed_jobs)
-            avg_quality = sum(job.get('quality_score', 0) for job in self.completed_jobs) / len(self.completed_jobs)
-            
+        if stats['completed_jobs']:
+            value = stats['value_quantiles']
+            quality = stats['quality_quantiles']
             print(f"\nTransaction Metrics:")
-            print(f"  Total Transaction Value: {total_value} tokens")
-            print(f"  Average Job Value: {avg_value:.2f} tokens")
-            print(f"  Average Quality Score: {avg_quality:.1f}/100")
+            print(f"  Total Transaction Value: {stats['total_value']} tokens")
+            print(f"  Average Job Value: {stats['avg_value']:.2f} tokens (p50 {value['p50']}, p95 {value['p95']})")
+            print(f"  Average Quality Score: {stats['avg_quality']:.1f}/100 (p50 {quality['p50']}, p95 {quality['p95']})")
         
         print(f"{'='*80}\n")
     
+    def enable_batch_auction(self, clearing_interval=5.0, seller_capacity=1):
+        """
+        Switch bidding to periodic sealed-bid batch auctions
+        Args:
+            clearing_interval: Seconds between clearing rounds
+            seller_capacity: Maximum jobs a seller can win per round
+        Returns: BatchAuction instance
+        """
+        self.auction = BatchAuction(
+            self,
+            clearing_interval=clearing_interval,
+            seller_capacity=seller_capacity
+        )
+        if self.verbose:
+            print(f"🔨 Batch auction enabled (clearing every {clearing_interval}s, capacity {seller_capacity})")
+        return self.auction
+    
+    def run_auction_round(self, execute=True):
+        """
+        Clear all pending auction jobs at once, then optionally execute them
+        Args:
+            execute: Whether to execute assigned jobs after clearing
+        Returns: Clearing result dict
+        """
+        if not self.auction:
+            if self.verbose:
+                print("❌ Batch auction not enabled")
+            return None
+        
+        # Offer each seller only the capacity its work queue has left
+        capacity = {
+            agent_id: min(agent.available_capacity(), self.auction.seller_capacity)
+            for agent_id, agent in self.agents.items()
+            if agent.agent_type == 'seller'
+        }
+        result = self.auction.clear(capacity)
+        for job_id, seller_id in result['assignments']:
+            self.agents[seller_id].accept_job(job_id)
+        if self.verbose:
+            print(f"\n🔨 Auction round {result['round']} cleared: "
+                  f"{len(result['assignments'])} assigned, {result['unmatched']} unmatched "
+                  f"({result['clearing_time'] * 1000:.1f} ms)")
+        
+        if execute:
+            result['executed'] = self.execute_jobs([job_id for job_id, _ in result['assignments']])
+            self.flush_reputation()
+        
+        return result
+    
     def run_full_job_cycle(self, poster_id, job_description, job_type, budget):
         """
         Run a complete job cycle: post → bid → select → execute
@@ -281,7 +761,8 @@ class Marketplace:
         """
         poster = self.agents.get(poster_id)
         if not poster:
-            print(f"❌ Agent {poster_id} not found")
+            if self.verbose:
+                print(f"❌ Agent {poster_id} not found")
             return False
         
         # Post job
@@ -292,7 +773,8 @@ class Marketplace:
         # Collect bids
         bids = self.collect_bids(job_id)
         if not bids:
-            print(f"❌ No bids received for {job_id}")
+            if self.verbose:
+                print(f"❌ No bids received for {job_id}")
             return False
         
         # Select winner
@@ -4,20 +4,33 @@ Uses state-of-the-art transformer models for accurate work validation
 
 Models Used:
 - cross-encoder/ms-marco-MiniLM-L6-v2: Quality validation (job vs output matching)
-- sentence-transformers/all-MiniLM-L6-v2: Semantic similarity, skill matching
-- facebook/bart-large-mnli: Zero-shot job classification
+- sentence-transformers/all-MiniLM-L6-v2: Semantic similarity, skill matching,
+  prototype job classification (default)
+- facebook/bart-large-mnli: Zero-shot job classification (opt-in, job_classifier='bart')
 - BAAI/bge-reranker-v2-m3: Re-ranking for best results
 
 This replaces the rule-based validator with actual ML models.
 """
 
+import copy
 import os
+import threading
+from importlib import metadata
+import time
 from typing import Dict, List, Tuple
 import warnings
+
+import numpy as np
 warnings.filterwarnings('ignore')
 
+from embeddings import DEFAULT_MODEL, get_embedding_service
+from job_classifier import PrototypeClassifier
+from onnx_backend import check_backend, load_model
+from validation_cache import ValidationCache
+from validation_stats import ValidationStats
+
 try:
-    from sentence_transformers import SentenceTransformer, CrossEncoder
+    from sentence_transformers import CrossEncoder
     from transformers import pipeline
     import torch
     ML_AVAILABLE = True
@@ -35,18 +48,71 @@ class MLValidator:
     1. Semantic quality validation (job description vs output)
     2. Skill matching (agent skills vs job requirements)
     3. Zero-shot job classification
-    4. Re-ranking of multiple outputs
+    4. Re-ranking of multiple outputs (batched, with bi-encoder shortlist and top-k)
+    5. Batch validation (each model runs once per batch; each output is
+       embedded once, for both similarity and prototype classification)
+    6. Lazy per-model loading with optional background warm-up
+    7. Memoised results for repeated (job, output, job type) triples
+       (results with any fallback score are never memoised)
     """
     
-    def __init__(self, use_gpu=False):
+    # Candidate labels for zero-shot job type classification
+    CANDIDATE_LABELS = [
+        'data analysis',
+        'content writing',
+        'image generation',
+        'code review',
+        'research',
+        'design',
+        'translation'
+    ]
+    
+    # Models in warm-up order, cheapest first
+    MODELS = ('semantic', 'quality', 'classifier')
+    
+    # Job type classifiers: MiniLM label prototypes (fast) or BART zero-shot (opt-in, slower)
+    JOB_CLASSIFIERS = ('prototype', 'bart')
+    
+    QUALITY_MODEL = 'cross-encoder/ms-marco-MiniLM-L6-v2'
+    BART_MODEL = 'facebook/bart-large-mnli'
+    
+    # Bump when the scoring rules change, so cached results from the old rules are dropped
+    SCORING_VERSION = 1
+    
+    # Common words left out of the completeness keyword coverage
+    STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for'})
+    
+    def __init__(self, use_gpu=False, verbose=True, lazy=True, backend='torch', job_classifier='prototype',
+                 cache_size=10_000, cache_path=None, history_size=100):
         """
-        Initialize ML models
+        Initialize ML validator
         
         Args:
             use_gpu: Whether to use GPU acceleration (if available)
+            verbose: Whether to print per-validation details
+            lazy: Load each model on first use (False loads every model now)
+            backend: Inference backend for the cross-encoder and sentence encoder:
+                'torch', 'onnx' or 'onnx-int8' (see onnx_backend)
+            job_classifier: 'prototype' (embedding prototypes, one encode call) or
+                'bart' (zero-shot NLI, one forward pass per label; higher accuracy)
+            cache_size: Most validation results memoised in memory (0 disables)
+            cache_path: SQLite file to persist memoised results in (None for memory only)
+            history_size: Most recent results kept alongside the running stats
         """
+        if job_classifier not in self.JOB_CLASSIFIERS:
+            raise ValueError(f"Unknown job classifier {job_classifier!r} (choose from {', '.join(self.JOB_CLASSIFIERS)})")
         self.device = 'cuda' if use_gpu and torch.cuda.is_available() else 'cpu'
-        self.validation_history = []
+        self.backend = backend
+        self.job_classifier = job_classifier
+        self.validation_stats = ValidationStats(recent_size=history_size)
+        self.verbose = verbose
+        self._models = {}  # name -> loaded model (None if it failed to load)
+        self._model_status = {name: 'not_loaded' for name in self.MODELS}
+        self._load_seconds = {}
+        self._load_locks = {name: threading.Lock() for name in self.MODELS}
+        self._warm_up_thread = None
+        self._inference = threading.local()  # fell_back: a scoring step on this thread used a fallback score
+        self.cache = ValidationCache(cache_size, cache_path, version=self.model_version())
         
         if not ML_AVAILABLE:
             print("⚠️  ML Validator running in fallback mode (rule-based)")
@@ -54,35 +120,179 @@ class MLValidator:
             return
         
         self.ml_enabled = True
-        print(f"🤖 Initializing ML Validator on {self.device.upper()}...")
-        
-        # Model 1: Quality Validation (23MB, fast)
-        print("   Loading cross-encoder for quality validation...")
-        self.quality_model = CrossEncoder(
-            'cross-encoder/ms-marco-MiniLM-L6-v2',
-            device=self.device
-        )
-        
-        # Model 2: Semantic Similarity (23MB, fast)
-        print("   Loading sentence transformer for semantic matching...")
-        self.semantic_model = SentenceTransformer(
-            'sentence-transformers/all-MiniLM-L6-v2',
-            device=self.device
-        )
+        check_backend(backend)
+        if lazy:
+            print(f"🤖 ML Validator on {self.device.upper()}/{backend} (models load on first use)")
+            return
         
+        print(f"🤖 Initializing ML Validator on {self.device.upper()}...")
+        for name in self.MODELS:
+            self._model(name)
+        print("✅ ML Validator ready!\n")
+    
+    @property
+    def quality_model(self):
+        """Cross-encoder for job/output relevance (loaded on first use)"""
+        return self._model('quality')
+    
+    @property
+    def embeddings(self):
+        """Shared embedding service for semantic similarity (loaded on first use)"""
+        return self._model('semantic')
+    
+    @property
+    def classifier(self):
+        """Job type classifier, or None if it couldn't be loaded (loaded on first use)"""
+        return self._model('classifier')
+    
+    def _model(self, name: str):
+        """
+        Get a model, loading it the first time it is needed
+        Concurrent first uses wait for a single load
+        """
+        if name in self._models:
+            return self._models[name]
+        with self._load_locks[name]:
+            if name not in self._models:
+                self._model_status[name] = 'loading'
+                started = time.perf_counter()
+                try:
+                    model = self._load_model(name)
+                except Exception as e:
+                    print(f"   ⚠️  Could not load {name} model (using fallback score): {e}")
+                    model = None
+                self._load_seconds[name] = round(time.perf_counter() - started, 3)
+                self._model_status[name] = 'ready' if model is not None else 'failed'
+                self._models[name] = model
+        return self._models[name]
+    
+    def _start_scoring(self):
+        """Clear this thread's fallback flag before scoring new outputs"""
+        self._inference.fell_back = False
+    
+    def _fall_back(self, score):
+        """Note that this thread's current scoring used a fallback score, and return it"""
+        self._inference.fell_back = True
+        return score
+    
+    def _cacheable(self) -> bool:
+        """
+        Whether the results just scored on this thread may be memoised: every
+        model loaded and no inference step fell back. Degraded scores would
+        otherwise outlive the failure in a persistent cache.
+        """
+        return not getattr(self._inference, 'fell_back', False) and 'failed' not in self._model_status.values()
+    
+    def _load_model(self, name: str):
+        """Build one model"""
+        if name == 'quality':
+            # Model 1: Quality Validation (23MB, fast)
+            print("   Loading cross-encoder for quality validation...")
+            return load_model(CrossEncoder, self.QUALITY_MODEL, self.backend, self.device)
+        if name == 'semantic':
+            # Model 2: Semantic Similarity (23MB, fast), shared with the AI assistant
+            print("   Loading sentence transformer for semantic matching...")
+            service = get_embedding_service(device=self.device, backend=self.backend)
+            service.load()
+            return service
+        if self.job_classifier == 'prototype':
+            # Job classification from label prototypes on the shared sentence encoder
+            print("   Building label prototypes for job classification...")
+            return PrototypeClassifier(self.embeddings)
         # Model 3: Zero-shot classification (407MB, slower but accurate)
         print("   Loading BART for job classification...")
-        try:
-            self.classifier = pipeline(
-                "zero-shot-classification",
-                model="facebook/bart-large-mnli",
-                device=0 if self.device == 'cuda' else -1
-            )
-        except Exception as e:
-            print(f"   ⚠️  Could not load BART (using lightweight fallback): {e}")
-            self.classifier = None
+        return pipeline(
+            "zero-shot-classification",
+            model=self.BART_MODEL,
+            device=0 if self.device == 'cuda' else -1
+        )
+    
+    def model_version(self) -> str:
+        """
+        Identify everything that decides this validator's results
+        Returns: Version string (cached results are only reused under the same one)
+        """
+        return self.version_for(self.backend, self.job_classifier)
+    
+    @classmethod
+    def version_for(cls, backend: str = 'torch', job_classifier: str = 'prototype') -> str:
+        """
+        Model version for a backend and job classifier: model names, scoring
+        rules and library versions (see model_version)
+        """
+        classifier = cls.BART_MODEL if job_classifier == 'bart' else f"prototype:{DEFAULT_MODEL}"
+        libraries = []
+        for package in ('sentence-transformers', 'transformers', 'torch'):
+            try:
+                libraries.append(f"{package}=={metadata.version(package)}")
+            except metadata.PackageNotFoundError:
+                libraries.append(f"{package}==none")
+        return ';'.join([
+            f"scoring={cls.SCORING_VERSION}",
+            f"quality={cls.QUALITY_MODEL}",
+            f"semantic={DEFAULT_MODEL}",
+            f"classifier={classifier}",
+            f"backend={backend}",
+            *libraries
+        ])
+    
+    def warm_up(self, background: bool = True):
+        """
+        Load every model and run one small inference through each, so the
+        first real validation doesn't pay for loading or first-call setup
         
-        print("✅ ML Validator ready!\n")
+        Args:
+            background: Run on a daemon thread and return immediately
+            
+        Returns:
+            The warm-up thread (None when run in the foreground or in fallback mode)
+        """
+        if not self.ml_enabled:
+            return None
+        if not background:
+            self._warm_up()
+            return None
+        if self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(target=self._warm_up, name='ml-validator-warm-up', daemon=True)
+            self._warm_up_thread.start()
+        return self._warm_up_thread
+    
+    def _warm_up(self):
+        started = time.perf_counter()
+        for name in self.MODELS:
+            self._model(name)
+        # One tiny pass through each model, kept out of validation_stats
+        sample = ('Analyze sales data', 'Sales rose 5% in Q3', 'data analysis')
+        self._batch_quality_scores([sample[0]], [sample[1]], 1)
+        self._batch_semantic_similarity([sample[0]], [sample[1]], 1)
+        self._batch_job_type_scores([sample], 1)
+        print(f"✅ ML Validator warmed up in {time.perf_counter() - started:.1f}s")
+    
+    def readiness(self) -> Dict:
+        """
+        Model loading state for readiness checks
+        
+        Returns:
+            Dictionary with:
+            - ready: True once no model is still waiting to load
+            - degraded: True if a model failed to load (fallback scores are used)
+            - mode: 'ml' or 'fallback'
+            - models: Per-model status and load time
+        """
+        if not self.ml_enabled:
+            return {'ready': True, 'degraded': True, 'mode': 'fallback', 'models': {}}
+        status = dict(self._model_status)
+        return {
+            'ready': all(state in ('ready', 'failed') for state in status.values()),
+            'degraded': any(state == 'failed' for state in status.values()),
+            'mode': 'ml',
+            'backend': self.backend,
+            'job_classifier': self.job_classifier,
+            'models': {
+                name: {'status': state, 'load_seconds': self._load_seconds.get(name)}
+                for name, state in status.items()
+            }
+        }
     
     def validate_work(self, job_description: str, work_output: str, job_type: str = None) -> Dict:
         """
@@ -103,25 +313,220 @@ class MLValidator:
         if not self.ml_enabled:
             return self._fallback_validation(job_description, work_output, job_type)
         
-        print(f"\n🔍 ML Validator analyzing work...")
-        print(f"   Job: {job_description[:60]}...")
-        print(f"   Output: {work_output[:60]}...")
-        
+        key = self.cache.key(job_description, work_output, job_type)
+        cached = self.cache.get(key)
+        if cached is not None:
+            if self.verbose:
+                print(f"\n🔍 ML Validator: cached result {cached['score']}/100 "
+                      f"({'✅ PASSED' if cached['passed'] else '❌ FAILED'})")
+            self.validation_stats.record(cached, job_type)
+            return cached
+        
+        if self.verbose:
+            print(f"\n🔍 ML Validator analyzing work...")
+            print(f"   Job: {job_description[:60]}...")
+            print(f"   Output: {work_output[:60]}...")
+        
+        self._start_scoring()
         # 1. Quality Score (job-output relevance)
         quality_score = self._calculate_quality_score(job_description, work_output)
         
-        # 2. Semantic Similarity
-        similarity_score = self._calculate_semantic_similarity(job_description, work_output)
+        # 2. Semantic Similarity (the output embedding is reused for classification)
+        output_embeddings = self._encode_outputs([work_output], 1)
+        similarity_score = self._calculate_semantic_similarity(job_description, work_output, output_embeddings)
         
         # 3. Completeness Check
         completeness_score = self._calculate_completeness(job_description, work_output)
         
         # 4. Job Type Classification (if classifier available)
-        if self.classifier and job_type:
-            classification_score = self._validate_job_type(work_output, job_type)
+        if job_type and self.classifier:
+            classification_score = self._validate_job_type(work_output, job_type, output_embeddings)
         else:
             classification_score = 0.85  # Default if classifier not available
         
+        result = self._build_result(quality_score, similarity_score, completeness_score, classification_score)
+        
+        if self.verbose:
+            print(f"   ✓ Quality: {result['breakdown']['quality']}/100")
+            print(f"   ✓ Similarity: {result['breakdown']['similarity']}/100")
+            print(f"   ✓ Completeness: {result['breakdown']['completeness']}/100")
+            print(f"   ✓ Classification: {result['breakdown']['classification']}/100")
+            print(f"   → Final Score: {result['score']}/100 (confidence: {result['confidence']:.2f})")
+            print(f"   → Status: {'✅ PASSED' if result['passed'] else '❌ FAILED'}\n")
+        
+        if self._cacheable():
+            self.cache.put(key, result)
+        self.validation_stats.record(result, job_type)
+        return result
+    
+    def validate_batch(self, pairs: List[Tuple], batch_size: int = 32) -> List[Dict]:
+        """
+        Validate many job/output pairs, running each model once over the batch
+        
+        Pairs are sorted by text length before being split into model batches,
+        so each batch pads to a similar length instead of to the longest item
+        in the whole list. Triples already in the result cache, and repeats
+        within the batch, are scored only once. Results come back in input order.
+        
+        Args:
+            pairs: List of (job_description, work_output) or
+                (job_description, work_output, job_type) tuples
+            batch_size: Items per forward pass
+            
+        Returns:
+            List of result dicts, the same as validate_work returns per pair
+        """
+        pairs = [(pair[0], pair[1], pair[2] if len(pair) > 2 else None) for pair in pairs]
+        if not pairs:
+            return []
+        if not self.ml_enabled:
+            results = [self._fallback_validation(*pair) for pair in pairs]
+            self.validation_stats.record_many(results, [job_type for _, _, job_type in pairs])
+            return results
+        
+        # Cached triples are served from the cache; each distinct new one is scored once
+        keys = [self.cache.key(*pair) for pair in pairs]
+        results = [self.cache.get(key) for key in keys]
+        first = {}  # key -> index of its first uncached occurrence
+        for i, (key, result) in enumerate(zip(keys, results)):
+            if result is None and key not in first:
+                first[key] = i
+        
+        if first:
+            if self.verbose:
+                print(f"\n🔍 ML Validator analyzing {len(first)} outputs in batches of {batch_size} "
+                      f"({len(pairs) - len(first)} cached or repeated)...")
+            fresh = [pairs[i] for i in first.values()]
+            jobs = [job for job, _, _ in fresh]
+            outputs = [output for _, output, _ in fresh]
+            self._start_scoring()
+            quality_scores = self._batch_quality_scores(jobs, outputs, batch_size)
+            # One encode call per output, shared by similarity and the prototype classifier
+            output_embeddings = self._encode_outputs(outputs, batch_size)
+            similarity_scores = self._batch_semantic_similarity(jobs, outputs, batch_size, output_embeddings)
+            classification_scores = self._batch_job_type_scores(fresh, batch_size, output_embeddings)
+            
+            computed = {}
+            for j, (key, (job, output, _)) in enumerate(zip(first, fresh)):
+                computed[key] = self._build_result(
+                    quality_scores[j],
+                    similarity_scores[j],
+                    self._calculate_completeness(job, output),
+                    classification_scores[j]
+                )
+            if self._cacheable():
+                self.cache.put_many(computed.items())
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    # Repeats within the batch get their own copy of the result
+                    results[i] = computed[key] if first[key] == i else copy.deepcopy(computed[key])
+        elif self.verbose:
+            print(f"\n🔍 ML Validator: {len(pairs)} cached results")
+        
+        if self.verbose:
+            passed = sum(1 for r in results if r['passed'])
+            print(f"   → {passed}/{len(results)} passed")
+        
+        self.validation_stats.record_many(results, [job_type for _, _, job_type in pairs])
+        return results
+    
+    @staticmethod
+    def _length_order(lengths: List[int]) -> List[int]:
+        """Indices sorted by length, so model batches hold similar-length inputs"""
+        return sorted(range(len(lengths)), key=lengths.__getitem__)
+    
+    def _batch_quality_scores(self, jobs: List[str], outputs: List[str], batch_size: int) -> List[float]:
+        """
+        Cross-encoder quality scores for every pair in one predict call
+        Returns: Scores between 0 and 1, in input order
+        """
+        try:
+            order = self._length_order([len(job) + len(out) for job, out in zip(jobs, outputs)])
+            logits = self.quality_model.predict(
+                [[jobs[i], outputs[i]] for i in order],
+                batch_size=batch_size,
+                show_progress_bar=False
+            )
+            scores = [0.0] * len(order)
+            for i, logit in zip(order, np.asarray(logits, dtype=np.float64).reshape(-1)):
+                # Same sigmoid normalisation as _calculate_quality_score
+                scores[i] = float(1 / (1 + np.exp(-logit)))
+            return scores
+        except Exception as e:
+            print(f"   ⚠️  Quality model error: {e}")
+            return self._fall_back([0.75] * len(jobs))
+    
+    def _encode_outputs(self, outputs: List[str], batch_size: int):
+        """
+        Embed work outputs once for similarity and prototype classification
+        Returns: Unit vectors, one row per output (None if the encoder fails;
+            each scoring step then falls back on its own)
+        """
+        try:
+            # Outputs are one-off texts: don't let them evict cached job descriptions
+            return self.embeddings.encode(outputs, batch_size=batch_size, cache=False)
+        except Exception:
+            return None
+    
+    def _batch_semantic_similarity(self, jobs: List[str], outputs: List[str], batch_size: int,
+                                   output_embeddings=None) -> List[float]:
+        """
+        Cosine similarity for every pair, encoding only uncached job descriptions
+        (SentenceTransformer.encode already groups inputs by length)
+        Args:
+            output_embeddings: Precomputed output vectors (None encodes the outputs here)
+        Returns: Similarities in input order
+        """
+        try:
+            job_embeddings = self.embeddings.encode(jobs, batch_size=batch_size)
+            if output_embeddings is None:
+                output_embeddings = self.embeddings.encode(outputs, batch_size=batch_size, cache=False)
+            # Unit vectors: the row-wise dot product is the cosine similarity
+            similarities = np.einsum('ij,ij->i', job_embeddings, output_embeddings)
+            return [float(similarity) for similarity in similarities]
+        except Exception as e:
+            print(f"   ⚠️  Similarity model error: {e}")
+            return self._fall_back([0.75] * len(jobs))
+    
+    def _batch_job_type_scores(self, pairs: List[Tuple], batch_size: int, output_embeddings=None) -> List[float]:
+        """
+        Zero-shot job type scores for pairs that have a job type, in one pipeline call
+        Args:
+            output_embeddings: Precomputed output vectors, reused by the prototype classifier
+        Returns: Scores in input order (0.85 where no classifier or job type)
+        """
+        scores = [0.85] * len(pairs)
+        typed = [i for i, (_, _, job_type) in enumerate(pairs) if job_type]
+        if not typed or not self.classifier:
+            return scores
+        try:
+            order = [typed[i] for i in self._length_order([len(pairs[i][1]) for i in typed])]
+            kwargs = {}
+            if output_embeddings is not None and isinstance(self.classifier, PrototypeClassifier):
+                kwargs['vectors'] = output_embeddings[order]
+            results = self.classifier(
+                [pairs[i][1] for i in order],
+                self.CANDIDATE_LABELS,
+                batch_size=batch_size,
+                **kwargs
+            )
+            if isinstance(results, dict):
+                results = [results]
+            for i, result in zip(order, results):
+                scores[i] = self._type_match_score(result, pairs[i][2])
+        except Exception as e:
+            print(f"   ⚠️  Classification error: {e}")
+            self._fall_back(None)
+            for i in typed:
+                scores[i] = 0.85
+        return scores
+    
+    def _build_result(self, quality_score: float, similarity_score: float,
+                      completeness_score: float, classification_score: float) -> Dict:
+        """
+        Combine the per-model scores into a validation result
+        Returns: Result dict (score, confidence, passed, breakdown)
+        """
         # Weighted combination
         final_score = (
             quality_score * 0.40 +           # 40% weight - most important
@@ -133,7 +538,7 @@ class MLValidator:
         # Ensure final_score is valid
         if not isinstance(final_score, (int, float)) or final_score != final_score:  # Check for NaN
             print(f"   ⚠️  Invalid final score detected, using fallback")
-            final_score = 0.75
+            final_score = self._fall_back(0.75)
         
         # Clamp to valid range
         final_score = max(0.0, min(1.0, final_score))
@@ -154,7 +559,7 @@ class MLValidator:
         if all_pass or all_fail:
             confidence = min(1.0, confidence + 0.2)  # Boost for consensus
         
-        result = {
+        return {
             'score': final_score,
             'confidence': round(confidence, 3),
             'passed': final_score >= 70,
@@ -165,16 +570,6 @@ class MLValidator:
                 'classification': int(classification_score * 100)
             }
         }
-        
-        print(f"   ✓ Quality: {result['breakdown']['quality']}/100")
-        print(f"   ✓ Similarity: {result['breakdown']['similarity']}/100")
-        print(f"   ✓ Completeness: {result['breakdown']['completeness']}/100")
-        print(f"   ✓ Classification: {result['breakdown']['classification']}/100")
-        print(f"   → Final Score: {final_score}/100 (confidence: {confidence:.2f})")
-        print(f"   → Status: {'✅ PASSED' if result['passed'] else '❌ FAILED'}\n")
-        
-        self.validation_history.append(result)
-        return result
     
     def _calculate_quality_score(self, job_description: str, work_output: str) -> float:
         """
@@ -201,27 +596,31 @@ class MLValidator:
             return normalized
         except Exception as e:
             print(f"   ⚠️  Quality model error: {e}")
-            return 0.75  # Default fallback
+            return self._fall_back(0.75)  # Default fallback
     
-    def _calculate_semantic_similarity(self, job_description: str, work_output: str) -> float:
+    def _calculate_semantic_similarity(self, job_description: str, work_output: str,
+                                       output_embeddings=None) -> float:
         """
         Calculate semantic similarity using sentence transformers
+        Args:
+            output_embeddings: Precomputed one-row output embedding (None encodes it here)
         Returns: Cosine similarity (0-1)
         """
         try:
-            # Encode both texts
-            embeddings = self.semantic_model.encode([job_description, work_output])
+            # Encode both texts (the job description is usually cached)
+            job_embedding = self.embeddings.encode([job_description])[0]
+            if output_embeddings is None:
+                output_embeddings = self.embeddings.encode([work_output], cache=False)
+            output_embedding = output_embeddings[0]
             
-            # Calculate cosine similarity
-            from sklearn.metrics.pairwise import cosine_similarity
-            similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-            
-            return float(similarity)
+            # Cosine similarity of unit vectors
+            return float(np.dot(job_embedding, output_embedding))
         except Exception as e:
             print(f"   ⚠️  Similarity model error: {e}")
-            return 0.75
+            return self._fall_back(0.75)
     
-    def _calculate_completeness(self, job_description: str, work_output: str) -> float:
+    @staticmethod
+    def _calculate_completeness(job_description: str, work_output: str) -> float:
         """
         Calculate completeness based on length and keyword coverage
         Returns: Score between 0 and 1
@@ -230,16 +629,14 @@ class MLValidator:
         min_length = len(job_description) * 0.5  # At least 50% of job description length
         length_ratio = min(len(work_output) / max(min_length, 1), 1.0)
         
-        # Keyword coverage (extract key terms from job, check if in output)
-        job_words = set(job_description.lower().split())
-        output_words = set(work_output.lower().split())
-        
-        # Remove common words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for'}
-        job_keywords = job_words - stop_words
+        # Keyword coverage (key terms from the job, minus common words, found in the output)
+        job_keywords = set(job_description.lower().split()) - MLValidator.STOP_WORDS
         
         if job_keywords:
-            coverage = len(job_keywords & output_words) / len(job_keywords)
+            # Look the few job keywords up in the lowercased output rather than splitting a long output
+            text = work_output.lower()
+            found = sum(1 for kw in job_keywords if MLValidator._contains_token(text, kw))
+            coverage = found / len(job_keywords)
         else:
             coverage = 0.5
         
@@ -247,44 +644,59 @@ class MLValidator:
         completeness = (length_ratio * 0.6) + (coverage * 0.4)
         return completeness
     
-    def _validate_job_type(self, work_output: str, expected_type: str) -> float:
+    @staticmethod
+    def _contains_token(text: str, word: str) -> bool:
         """
-        Validate if output matches expected job type using zero-shot classification
+        Whether word is one of text.split()'s tokens, found without splitting text
+        Returns: True if word occurs with whitespace (or the text's ends) on both sides
+        """
+        start = text.find(word)
+        while start != -1:
+            end = start + len(word)
+            if (start == 0 or text[start - 1].isspace()) and (end == len(text) or text[end].isspace()):
+                return True
+            start = text.find(word, start + 1)
+        return False
+    
+    def _validate_job_type(self, work_output: str, expected_type: str, output_embeddings=None) -> float:
+        """
+        Validate if output matches expected job type (prototype or zero-shot classification)
+        Args:
+            output_embeddings: Precomputed one-row output embedding, reused by the prototype classifier
         Returns: Confidence score (0-1)
         """
         if not self.classifier:
             return 0.85  # Default if classifier not available
         
         try:
-            # Define candidate labels based on common job types
-            candidate_labels = [
-                'data analysis',
-                'content writing',
-                'image generation',
-                'code review',
-                'research',
-                'design',
-                'translation'
-            ]
-            
             # Run classification
-            result = self.classifier(work_output, candidate_labels)
-            
-            # Check if top prediction matches expected type
-            top_label = result['labels'][0]
-            top_score = result['scores'][0]
-            
-            # Fuzzy match expected type with predicted label
-            type_match = expected_type.lower() in top_label or top_label in expected_type.lower()
-            
-            if type_match:
-                return top_score
+            if output_embeddings is not None and isinstance(self.classifier, PrototypeClassifier):
+                result = self.classifier(work_output, self.CANDIDATE_LABELS, vectors=output_embeddings)
             else:
-                # Penalize if type doesn't match
-                return top_score * 0.5
+                result = self.classifier(work_output, self.CANDIDATE_LABELS)
+            return self._type_match_score(result, expected_type)
         except Exception as e:
             print(f"   ⚠️  Classification error: {e}")
-            return 0.85
+            return self._fall_back(0.85)
+    
+    @staticmethod
+    def _type_match_score(result: Dict, expected_type: str) -> float:
+        """
+        Score a zero-shot classification against the expected job type
+        Returns: Top label confidence, halved if the label doesn't match
+        """
+        # Check if top prediction matches expected type
+        top_label = result['labels'][0]
+        top_score = result['scores'][0]
+        
+        # Fuzzy match expected type with predicted label
+        type_match = expected_type.lower() in top_label or top_label in expected_type.lower()
+        
+        if type_match:
+            return top_score
+        else:
+            # Penalize if type doesn't match
+            return top_score * 0.5
     
     def _fallback_validation(self, job_description: str, work_output: str, job_type: str) -> Dict:
         """
@@ -335,85 +747,123 @@ class MLValidator:
             return matches
         
         # Encode job requirements
-        job_embedding = self.semantic_model.encode([job_requirements])
+        job_embedding = self.embeddings.encode([job_requirements])[0]
         
-        # Encode all skills
-        skill_embeddings = self.semantic_model.encode(agent_skills)
+        # Encode all skills (fixed labels, so almost always cached)
+        skill_embeddings = self.embeddings.encode(agent_skills)
         
-        # Calculate similarities
-        from sklearn.metrics.pairwise import cosine_similarity
-        similarities = cosine_similarity(job_embedding, skill_embeddings)[0]
+        # Cosine similarities of unit vectors
+        similarities = skill_embeddings @ job_embedding
         
         # Create result dictionary
         matches = {skill: float(score) for skill, score in zip(agent_skills, similarities)}
         
         return matches
     
-    def rerank_outputs(self, job_description: str, outputs: List[str]) -> List[Tuple[str, float]]:
+    def rerank_outputs(self, job_description: str, outputs: List[str], top_k: int = None,
+                       prefilter: int = None, batch_size: int = 32) -> List[Tuple[str, float]]:
         """
         Re-rank multiple outputs by quality
         
+        The cross-encoder scores every (job, output) pair in one batched
+        predict call. With prefilter, the bi-encoder first shortlists the
+        outputs most similar to the job (one encode call and a dot product),
+        and only the shortlist goes through the cross-encoder, so thousands
+        of candidates cost a few dozen cross-encoder pairs. With top_k, only
+        the best k are selected (partial selection) and sorted.
+        
         Args:
             job_description: Original job description
             outputs: List of different agent outputs
+            top_k: Return only the k best outputs (None returns every scored output)
+            prefilter: Shortlist size for the bi-encoder stage (None scores every output);
+                outputs left off the shortlist are not returned
+            batch_size: Pairs per forward pass
             
         Returns:
             List of (output, score) tuples sorted by quality
         """
+        if not outputs:
+            return []
         if not self.ml_enabled:
             # Simple length-based ranking
-            return sorted([(out, len(out)) for out in outputs], key=lambda x: x[1], reverse=True)
-        
-        # Score each output
-        scored_outputs = []
-        for output in outputs:
-            score = self.quality_model.predict([[job_description, output]])[0]
-            scored_outputs.append((output, float(score)))
-        
-        # Sort by score descending
-        scored_outputs.sort(key=lambda x: x[1], reverse=True)
-        
-        return scored_outputs
+            scores = np.array([len(out) for out in outputs], dtype=np.float64)
+            order = self._top_indices(scores, top_k)
+            return [(outputs[i], int(scores[i])) for i in order]
+        
+        candidates = list(range(len(outputs)))
+        if prefilter is not None and prefilter < len(outputs):
+            # Stage 1: bi-encoder shortlist (outputs are one-off texts, so not cached)
+            job_embedding = self.embeddings.encode([job_description])[0]
+            output_embeddings = self.embeddings.encode(outputs, batch_size=batch_size, cache=False)
+            candidates = self._top_indices(output_embeddings @ job_embedding, prefilter)
+        
+        # Stage 2: cross-encoder over the shortlist in one predict call, similar lengths batched together
+        order = [candidates[i] for i in self._length_order([len(outputs[i]) for i in candidates])]
+        if not order:
+            return []
+        logits = self.quality_model.predict(
+            [[job_description, outputs[i]] for i in order],
+            batch_size=batch_size,
+            show_progress_bar=False
+        )
+        scores = np.asarray(logits, dtype=np.float64).reshape(-1)
+        return [(outputs[order[i]], float(scores[i])) for i in self._top_indices(scores, top_k)]
+    
+    @staticmethod
+    def _top_indices(scores: np.ndarray, k: int = None) -> List[int]:
+        """
+        Indices of the k highest scores, best first
+        Partial selection (argpartition) finds the k before sorting only those
+        """
+        if k is not None and k < len(scores):
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        # Stable sort keeps input order among equal scores
+        return [int(i) for i in top[np.argsort(-scores[top], kind='stable')]]
     
     def get_stats(self) -> Dict:
-        """Get validation statistics"""
-        if not self.validation_history:
-            return {
-                'total_validations': 0,
-                'pass_rate': 0,
-                'average_score': 0,
-                'average_confidence': 0
-            }
-        
-        total = len(self.validation_history)
-        passed = sum(1 for v in self.validation_history if v['passed'])
-        avg_score = sum(v['score'] for v in self.validation_history) / total
-        avg_conf = sum(v['confidence'] for v in self.validation_history) / total
-        
+        """Get validation statistics (running totals, no history scan)"""
+        return self.stats_report(self.validation_stats, self.cache)
+    
+    @staticmethod
+    def stats_report(validation_stats: ValidationStats, cache: ValidationCache) -> Dict:
+        """get_stats() response built from a ValidationStats and a result cache"""
+        summary = validation_stats.summary()
         return {
-            'total_validations': total,
-            'pass_rate': round((passed / total) * 100, 1),
-            'average_score': round(avg_score, 1),
-            'average_confidence': round(avg_conf, 3)
+            'total_validations': summary['total_validations'],
+            'pass_rate': summary['pass_rate'],
+            'average_score': summary['average_score'],
+            'average_confidence': summary['average_confidence'],
+            'score_quantiles': summary['score_quantiles'],
+            'by_job_type': validation_stats.by_job_type(),
+            'cache': cache.get_stats()
         }
 
 
 # Singleton instance for easy import
 _validator_instance = None
 
-def get_validator(use_gpu=False) -> MLValidator:
+def get_validator(use_gpu=False, backend='torch', job_classifier='prototype', cache_path=None) -> MLValidator:
     """
     Get or create singleton ML validator instance
     
     Args:
         use_gpu: Whether to use GPU acceleration
+        backend: 'torch', 'onnx' or 'onnx-int8' for the cross-encoder and sentence encoder
+        job_classifier: 'prototype' (fast) or 'bart' (zero-shot, higher accuracy)
+        cache_path: SQLite file to persist memoised validation results in
         
     Returns:
         MLValidator instance
     """
     global _validator_instance
     if _validator_instance is None:
-        _validator_instance = MLValidator(use_gpu=use_gpu)
+        _validator_instance = MLValidator(use_gpu=use_gpu, backend=backend, job_classifier=job_classifier,
+                                          cache_path=cache_path)
     return _validator_instance
 
 
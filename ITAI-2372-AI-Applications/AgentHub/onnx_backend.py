@@ -0,0 +1,94 @@
+"""
+ONNX Runtime Backend for AgentHub
+Loads the validator's cross-encoder and MiniLM encoder as PyTorch, ONNX
+or dynamically int8-quantised ONNX models
+
+Backends:
+- torch: full-precision PyTorch (default)
+- onnx: the same weights exported to ONNX Runtime
+- onnx-int8: ONNX with dynamic int8 quantisation of the linear layers,
+  tuned for the CPU's instruction set (arm64, avx2, avx512, avx512_vnni)
+
+Exports go through sentence-transformers' ONNX support (which needs
+`pip install optimum[onnxruntime]`) and are written once to .onnx_models/,
+then reused. The prototype job classifier shares the MiniLM encoder (and so
+its backend); the opt-in BART zero-shot classifier always runs on PyTorch.
+"""
+
+import os
+import platform
+
+try:
+    import onnxruntime  # noqa: F401  (required by the onnx backends)
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+
+ONNX_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.onnx_models')
+
+
+def check_backend(backend):
+    """
+    Validate a backend name
+    Raises: ValueError for unknown backends, RuntimeError if ONNX Runtime is missing
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r} (choose from {', '.join(BACKENDS)})")
+    if backend != 'torch' and not ONNX_AVAILABLE:
+        raise RuntimeError(f"The {backend} backend needs ONNX Runtime: pip install optimum[onnxruntime]")
+
+
+def quantization_target():
+    """Dynamic quantisation config matching this CPU's best int8 instructions"""
+    machine = platform.machine().lower()
+    if machine in ('arm64', 'aarch64'):
+        return 'arm64'
+    try:
+        with open('/proc/cpuinfo', 'r', encoding='utf-8') as f:
+            flags = f.read()
+    except OSError:
+        return 'avx2'
+    if 'avx512_vnni' in flags or 'avx512vnni' in flags:
+        return 'avx512_vnni'
+    if 'avx512f' in flags:
+        return 'avx512'
+    return 'avx2'
+
+
+def export_dir(model_name):
+    """Local directory holding a model's ONNX exports"""
+    return os.path.join(ONNX_MODEL_DIR, model_name.replace('/', '--'))
+
+
+def load_model(model_class, model_name, backend='torch', device='cpu'):
+    """
+    Load a SentenceTransformer or CrossEncoder on the chosen backend
+
+    Args:
+        model_class: SentenceTransformer or CrossEncoder
+        model_name: Hugging Face model name
+        backend: 'torch', 'onnx' or 'onnx-int8'
+        device: Device for the torch backend (ONNX backends run on CPU)
+
+    Returns:
+        Model instance with the usual encode()/predict() API
+    """
+    check_backend(backend)
+    if backend == 'torch':
+        return model_class(model_name, device=device)
+    if backend == 'onnx':
+        return model_class(model_name, device='cpu', backend='onnx')
+
+    # onnx-int8: export and quantise once, then load the quantised file
+    target = quantization_target()
+    local = export_dir(model_name)
+    file_name = f"onnx/model_qint8_{target}.onnx"
+    if not os.path.exists(os.path.join(local, file_name)):
+        print(f"   Exporting {model_name} to ONNX with int8 quantisation ({target})...")
+        model = model_class(model_name, device='cpu', backend='onnx')
+        model.save_pretrained(local)
+        export_dynamic_quantized_onnx_model(model, target, local)
+    return model_class(local, device='cpu', backend='onnx', model_kwargs={'file_name': file_name})
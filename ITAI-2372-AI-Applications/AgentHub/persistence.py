@@ -0,0 +1,376 @@
+"""
+Agent Persistence for AgentHub
+SQLite-backed agent registry with dirty tracking and lazy loading
+
+Agents are loaded from the database the first time they are looked up, so
+startup costs one connection rather than one query per agent. The
+marketplace marks agents dirty when it changes their balances, reputation or
+counters, and flush() writes only those rows, in batched transactions, at
+most once per flush interval.
+
+Skills are stored as a JSON list, and triggers keep an agent_skills index
+table in step with it, so bidding can look up a skill's sellers without
+loading every agent.
+"""
+
+import json
+import sqlite3
+import time
+from collections.abc import MutableMapping
+
+from agent import Agent
+
+
+# Persisted agent state: column name -> SQLite type
+AGENT_COLUMNS = {
+    'agent_type': 'TEXT NOT NULL',
+    'skills': 'TEXT NOT NULL',  # JSON list
+    'balance': 'REAL NOT NULL',
+    'reputation_score': 'REAL NOT NULL',
+    'jobs_completed': 'INTEGER NOT NULL',
+    'jobs_requested': 'INTEGER NOT NULL',
+    'total_earned': 'REAL NOT NULL',
+    'total_spent': 'REAL NOT NULL',
+    'max_concurrent_jobs': 'INTEGER NOT NULL',
+    'latency_ewma': 'REAL NOT NULL'
+}
+
+
+class AgentRepository:
+    """
+    SQLite table of agent state
+    Features:
+    - One row per agent, upserted by agent ID
+    - Batched writes: many rows per transaction via executemany
+    - WAL journal so readers don't block the writer
+    - Skill -> agent index table maintained by triggers on the agents table
+    """
+
+    def __init__(self, path=':memory:'):
+        """
+        Args:
+            path: SQLite database file (':memory:' for a throwaway database)
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        columns = ', '.join(f"{name} {kind}" for name, kind in AGENT_COLUMNS.items())
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS agents (agent_id TEXT PRIMARY KEY, {columns}, updated_at REAL)")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS agent_skills (
+                skill TEXT NOT NULL, agent_id TEXT NOT NULL, PRIMARY KEY (skill, agent_id)
+            ) WITHOUT ROWID;
+            CREATE TRIGGER IF NOT EXISTS agent_skills_insert AFTER INSERT ON agents BEGIN
+                INSERT OR IGNORE INTO agent_skills SELECT value, NEW.agent_id FROM json_each(NEW.skills);
+            END;
+            CREATE TRIGGER IF NOT EXISTS agent_skills_update AFTER UPDATE OF skills ON agents
+            WHEN OLD.skills IS NOT NEW.skills BEGIN
+                DELETE FROM agent_skills WHERE agent_id = OLD.agent_id;
+                INSERT OR IGNORE INTO agent_skills SELECT value, NEW.agent_id FROM json_each(NEW.skills);
+            END;
+            CREATE TRIGGER IF NOT EXISTS agent_skills_delete AFTER DELETE ON agents BEGIN
+                DELETE FROM agent_skills WHERE agent_id = OLD.agent_id;
+            END;
+        """)
+        self._migrate_skills()
+        self.conn.commit()
+
+        names = ['agent_id', *AGENT_COLUMNS, 'updated_at']
+        updates = ', '.join(f"{name} = excluded.{name}" for name in names[1:])
+        self._upsert = (
+            f"INSERT INTO agents ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+            f"ON CONFLICT(agent_id) DO UPDATE SET {updates}"
+        )
+        self._select = f"SELECT {', '.join(AGENT_COLUMNS)} FROM agents WHERE agent_id = ?"
+
+    def _migrate_skills(self):
+        """Rewrite comma-joined skills from older databases as JSON (the update trigger indexes them)"""
+        legacy = self.conn.execute("SELECT agent_id, skills FROM agents WHERE json_valid(skills) = 0").fetchall()
+        if legacy:
+            with self.conn:
+                self.conn.executemany("UPDATE agents SET skills = ? WHERE agent_id = ?", [
+                    (json.dumps(skills.split(',') if skills else []), agent_id) for agent_id, skills in legacy
+                ])
+
+    def save_many(self, rows, batch_size=500):
+        """
+        Upsert agent rows, batch_size rows per transaction
+        Args:
+            rows: List of tuples in (agent_id, *AGENT_COLUMNS) order
+            batch_size: Rows per transaction
+        Returns: Number of transactions committed
+        """
+        now = time.time()
+        transactions = 0
+        for start in range(0, len(rows), batch_size):
+            with self.conn:
+                self.conn.executemany(self._upsert, [(*row, now) for row in rows[start:start + batch_size]])
+            transactions += 1
+        return transactions
+
+    def load(self, agent_id):
+        """
+        Stored state for one agent
+        Returns: Dict of column -> value, or None if the agent isn't stored
+        """
+        row = self.conn.execute(self._select, (agent_id,)).fetchone()
+        return dict(zip(AGENT_COLUMNS, row)) if row else None
+
+    def load_all(self):
+        """
+        Stored state for every agent in one query
+        Returns: Iterator of (agent_id, dict of column -> value)
+        """
+        cursor = self.conn.execute(f"SELECT agent_id, {', '.join(AGENT_COLUMNS)} FROM agents ORDER BY rowid")
+        for row in cursor:
+            yield row[0], dict(zip(AGENT_COLUMNS, row[1:]))
+
+    def ids_with_skill(self, skill, agent_type='seller'):
+        """
+        IDs of stored agents of one type offering a skill, from the skill index
+        Returns: List of agent IDs in insertion order
+        """
+        cursor = self.conn.execute(
+            "SELECT a.agent_id FROM agent_skills s JOIN agents a ON a.agent_id = s.agent_id "
+            "WHERE s.skill = ? AND a.agent_type = ? ORDER BY a.rowid",
+            (skill, agent_type)
+        )
+        return [row[0] for row in cursor]
+
+    def exists(self, agent_id):
+        """Check whether an agent has a row"""
+        return self.conn.execute("SELECT 1 FROM agents WHERE agent_id = ?", (agent_id,)).fetchone() is not None
+
+    def ids(self):
+        """All stored agent IDs, in insertion order"""
+        return [row[0] for row in self.conn.execute("SELECT agent_id FROM agents ORDER BY rowid")]
+
+    def delete(self, agent_id):
+        """Remove an agent's row"""
+        with self.conn:
+            self.conn.execute("DELETE FROM agents WHERE agent_id = ?", (agent_id,))
+
+    def count(self):
+        """Number of stored agents"""
+        return self.conn.execute("SELECT COUNT(*) FROM agents").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+class PersistentAgentRegistry(MutableMapping):
+    """
+    Drop-in replacement for the marketplace's agent dict, backed by SQLite
+    Features:
+    - Agents built from their row on first access, then cached
+    - Agent IDs loaded only when the registry is iterated or sized
+    - Sellers looked up by skill from the skill index, loading only those agents
+    - Dirty set of changed agents; flush() writes only those rows
+    - Interval-based flushing via maybe_flush()
+    """
+
+    def __init__(self, repository, factory=Agent, flush_interval=5.0, batch_size=500, verbose=False):
+        """
+        Args:
+            repository: AgentRepository holding the rows
+            factory: Callable(agent_id, agent_type, skills, **kwargs) building an agent
+                (Agent, or AgentStore.create_agent)
+            flush_interval: Seconds between automatic flushes
+            batch_size: Rows per write transaction
+            verbose: Verbose flag for agents built from rows
+        """
+        self.repository = repository
+        self.factory = factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.verbose = verbose
+        self.on_load = None  # Optional callable(agent) run for agents built from rows
+
+        self._agents = {}  # Loaded agents
+        self._ids = None  # Every known agent ID in order, loaded on first iteration
+        self._new_ids = {}  # IDs added before _ids was loaded (dict as ordered set)
+        self._complete = False  # All agents loaded and _agents in _ids order
+        self._dirty = set()
+        self._skill_ids = {}  # skill -> seller IDs offering it, filled on first lookup
+        self._last_flush = time.monotonic()
+
+        self.loaded = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.transactions = 0
+
+    def __getitem__(self, agent_id):
+        agent = self._agents.get(agent_id)
+        if agent is not None:
+            return agent
+        row = self.repository.load(agent_id)
+        if row is None:
+            raise KeyError(agent_id)
+        agent = self._agents[agent_id] = self._build(agent_id, row)
+        return agent
+
+    def __setitem__(self, agent_id, agent):
+        if agent_id not in self:
+            if self._ids is not None:
+                self._ids[agent_id] = None
+            else:
+                self._new_ids[agent_id] = None
+            if agent.agent_type == 'seller':
+                for skill in agent.skills:
+                    if skill in self._skill_ids:
+                        self._skill_ids[skill].append(agent_id)
+        else:
+            self._skill_ids.clear()  # The replacement may offer other skills
+        self._agents[agent_id] = agent
+        self._dirty.add(agent_id)
+
+    def __delitem__(self, agent_id):
+        if agent_id not in self:
+            raise KeyError(agent_id)
+        self._agents.pop(agent_id, None)
+        self._new_ids.pop(agent_id, None)
+        if self._ids is not None:
+            self._ids.pop(agent_id, None)
+        self._dirty.discard(agent_id)
+        self._skill_ids.clear()
+        self.repository.delete(agent_id)
+
+    def __contains__(self, agent_id):
+        if agent_id in self._agents:
+            return True
+        if self._ids is not None:
+            return agent_id in self._ids
+        return agent_id in self._new_ids or self.repository.exists(agent_id)
+
+    def __iter__(self):
+        if self._complete:
+            return iter(self._agents)
+        return iter(self._all_ids())
+
+    def __len__(self):
+        return len(self._all_ids())
+
+    def items(self):
+        # Iteration means every agent is needed: load them once, then serve the dict directly
+        return self._load_all().items()
+
+    def values(self):
+        return self._load_all().values()
+
+    def get(self, agent_id, default=None):
+        agent = self._agents.get(agent_id)
+        if agent is not None:
+            return agent
+        try:
+            return self[agent_id]
+        except KeyError:
+            return default
+
+    def sellers_with_skill(self, skill):
+        """
+        Sellers offering a skill, building only those agents
+        Stored sellers come first (from the skill index), then ones added since the last flush
+        Returns: List of agents
+        """
+        ids = self._skill_ids.get(skill)
+        if ids is None:
+            ids = self.repository.ids_with_skill(skill)
+            stored = set(ids)
+            ids += [agent_id for agent_id, agent in self._agents.items()
+                    if agent_id not in stored and agent.agent_type == 'seller' and skill in agent.skills]
+            self._skill_ids[skill] = ids
+        return [self[agent_id] for agent_id in ids]
+
+    def _all_ids(self):
+        """Ordered IDs of stored and newly added agents"""
+        if self._ids is None:
+            self._ids = dict.fromkeys(self.repository.ids())
+            self._ids.update(self._new_ids)
+            self._new_ids = {}
+        return self._ids
+
+    def _load_all(self):
+        """Build every agent not yet loaded, keeping registration order"""
+        if not self._complete:
+            loaded = self._agents
+            for agent_id, row in self.repository.load_all():
+                if agent_id not in loaded:
+                    loaded[agent_id] = self._build(agent_id, row)
+            self._agents = {agent_id: loaded[agent_id] for agent_id in self._all_ids()}
+            self._complete = True
+        return self._agents
+
+    def _build(self, agent_id, row):
+        """Create an agent from its stored row"""
+        agent = self.factory(
+            agent_id,
+            row['agent_type'],
+            json.loads(row['skills']),
+            initial_balance=row['balance'],
+            max_concurrent_jobs=row['max_concurrent_jobs'],
+            expected_latency=row['latency_ewma'],
+            verbose=self.verbose
+        )
+        agent.reputation_score = row['reputation_score']
+        agent.jobs_completed = row['jobs_completed']
+        agent.jobs_requested = row['jobs_requested']
+        agent.total_earned = row['total_earned']
+        agent.total_spent = row['total_spent']
+        agent.invalidate_pricing()
+        self.loaded += 1
+        if self.on_load:
+            self.on_load(agent)
+        return agent
+
+    @staticmethod
+    def _row(agent):
+        """Row tuple in (agent_id, *AGENT_COLUMNS) order"""
+        return (
+            agent.agent_id, agent.agent_type, json.dumps(agent.skills), agent.balance,
+            agent.reputation_score, agent.jobs_completed, agent.jobs_requested,
+            agent.total_earned, agent.total_spent, agent.max_concurrent_jobs, agent.latency_ewma
+        )
+
+    def mark_dirty(self, agent_id):
+        """Record that an agent's state changed since the last flush"""
+        self._dirty.add(agent_id)
+
+    @property
+    def dirty_count(self):
+        """Agents waiting to be written"""
+        return len(self._dirty)
+
+    def is_due(self):
+        """Check whether the flush interval has elapsed"""
+        return time.monotonic() - self._last_flush >= self.flush_interval
+
+    def maybe_flush(self):
+        """Flush if the flush interval has elapsed"""
+        return self.flush() if self.is_due() else 0
+
+    def flush(self):
+        """
+        Write every dirty agent's row
+        Returns: Number of rows written
+        """
+        self._last_flush = time.monotonic()
+        if not self._dirty:
+            return 0
+        dirty, self._dirty = self._dirty, set()
+        rows = [self._row(self._agents[agent_id]) for agent_id in dirty if agent_id in self._agents]
+        self.transactions += self.repository.save_many(rows, self.batch_size)
+        self.flushes += 1
+        self.rows_written += len(rows)
+        return len(rows)
+
+    def get_stats(self):
+        """Registry counters for dashboards and reports"""
+        return {
+            'loaded_agents': len(self._agents),
+            'built_from_rows': self.loaded,
+            'dirty': len(self._dirty),
+            'flushes': self.flushes,
+            'rows_written': self.rows_written,
+            'transactions': self.transactions
+        }
@@ -0,0 +1,225 @@
+"""
+Dynamic Pricing Engine for AgentHub
+Demand-based per-skill pricing from a rolling window of recent bids and
+clearing prices, with cached price curves so bidding stays a dict lookup
+
+For each skill the engine tracks how many sellers bid on each recent job.
+Sellers only bid while they have free capacity, so bids per job measures
+free supply against demand. When jobs draw fewer bids than target_bids
+(sellers are busy, or too few offer the skill) the skill's market
+multiplier rises; when they draw more it falls, and it is 1.0 when supply
+meets demand. Jobs that draw no bids count too. Prices do not feed back into
+the signal, so it settles instead of spiralling. Price curves are cached
+per (skill, reputation bucket) and rebuilt only when a skill's multiplier
+moves past the invalidation threshold.
+"""
+
+from types import MappingProxyType
+
+from agent import BASE_PRICES
+
+
+class RingBuffer:
+    """Fixed-size window of recent float samples with an O(1) running mean"""
+
+    __slots__ = ('values', 'capacity', 'count', 'position', 'total')
+
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity: Number of most recent samples kept
+        """
+        self.values = [0.0] * capacity
+        self.capacity = capacity
+        self.count = 0
+        self.position = 0
+        self.total = 0.0
+
+    def append(self, value):
+        """Add one sample, overwriting the oldest when full"""
+        if self.count == self.capacity:
+            self.total -= self.values[self.position]
+        else:
+            self.count += 1
+        self.values[self.position] = value
+        self.total += value
+        self.position += 1
+        if self.position == self.capacity:
+            self.position = 0
+            # Re-sum once per wrap so rounding in the running total can't accumulate
+            self.total = float(sum(self.values))
+
+    def mean(self):
+        """Mean of the samples in the window (0.0 when empty)"""
+        return self.total / self.count if self.count else 0.0
+
+    def __len__(self):
+        return self.count
+
+
+class PricingEngine:
+    """
+    Per-skill dynamic pricing
+    Features:
+    - Ring buffers of recent bids per job, asks (mean bid per job) and clearing prices per skill
+    - Market multiplier = target bids per job / mean bids per job, clamped to bounds
+    - Price curves cached per (skill, reputation bucket) and shared by agents
+    - Curves invalidated only when a skill's multiplier moves past a threshold
+    """
+
+    def __init__(self, window=256, bucket_size=0.1, threshold=0.05, min_samples=16,
+                 sensitivity=1.0, bounds=(0.5, 2.0), base_prices=None, target_bids=3.0):
+        """
+        Args:
+            window: Recent jobs' bid counts, asks and clearing prices kept per skill
+            bucket_size: Reputation (stars) covered by one cached price point
+            threshold: Relative multiplier change that invalidates a skill's curve
+            min_samples: Jobs seen before a skill's price moves
+            sensitivity: Exponent applied to the target/actual bids per job ratio
+            bounds: (min, max) market multiplier
+            base_prices: Skill -> base price at 5 stars (defaults to BASE_PRICES)
+            target_bids: Competing bids per job at which supply meets demand (multiplier 1.0)
+        """
+        self.window = window
+        self.bucket_size = bucket_size
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.sensitivity = sensitivity
+        self.bounds = bounds
+        self.base_prices = base_prices or BASE_PRICES
+        self.target_bids = target_bids
+
+        self.competition = {}  # skill -> RingBuffer of bids per job
+        self.bids = {}  # skill -> RingBuffer of mean bid per job
+        self.clearing = {}  # skill -> RingBuffer of clearing prices
+        self.applied = {}  # skill -> multiplier the cached curve was built with
+        self.curves = {}  # skill -> {reputation bucket: price}
+        self.tables = {}  # (skills, reputation bucket) -> {skill: price}
+        self.generation = 0  # Bumped on every invalidation so agents drop their tables
+        self.invalidations = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _buffer(self, buffers, skill):
+        """Ring buffer for a skill, created on first use"""
+        buffer = buffers.get(skill)
+        if buffer is None:
+            buffer = buffers[skill] = RingBuffer(self.window)
+        return buffer
+
+    def record_bids(self, skill, amounts):
+        """
+        Add a job's bid count (and mean bid) to the skill's window and refresh
+        the skill's curve if the market moved
+        One sample per job keeps recording O(1) however many sellers bid
+        Args:
+            skill: Job type
+            amounts: List of bid amounts (empty when no seller could take the job)
+        """
+        self._buffer(self.competition, skill).append(len(amounts))
+        if amounts:
+            self._buffer(self.bids, skill).append(sum(amounts) / len(amounts))
+        self._check(skill)
+
+    def record_clearing(self, skill, price):
+        """
+        Add a clearing price to the skill's window (reported, not priced from)
+        Args:
+            skill: Job type
+            price: Price the job was awarded at
+        """
+        self._buffer(self.clearing, skill).append(price)
+
+    def multiplier(self, skill):
+        """
+        Live market multiplier for a skill from the current window
+        Returns: 1.0 until min_samples jobs have been seen
+        """
+        competition = self.competition.get(skill)
+        if competition is None or len(competition) < self.min_samples:
+            return 1.0
+        low, high = self.bounds
+        bids_per_job = competition.mean()
+        if not bids_per_job:
+            return high
+        ratio = (self.target_bids / bids_per_job) ** self.sensitivity
+        return min(max(ratio, low), high)
+
+    def _check(self, skill):
+        """Invalidate a skill's cached prices once its multiplier drifts past the threshold"""
+        current = self.multiplier(skill)
+        applied = self.applied.get(skill, 1.0)
+        if abs(current - applied) <= self.threshold * applied:
+            return
+        self.applied[skill] = current
+        self.curves.pop(skill, None)
+        # Tables mix skills, so any table may contain the stale curve
+        self.tables.clear()
+        self.generation += 1
+        self.invalidations += 1
+
+    def _bucket(self, reputation_score):
+        """Reputation bucket index"""
+        return int(round(reputation_score / self.bucket_size))
+
+    def _price(self, skill, bucket):
+        """Price of a skill at a reputation bucket, from the skill's cached curve"""
+        curve = self.curves.get(skill)
+        if curve is None:
+            curve = self.curves[skill] = {}
+        price = curve.get(bucket)
+        if price is None:
+            # Higher reputation = higher prices, scaled by current market conditions
+            reputation_multiplier = bucket * self.bucket_size / 5.0
+            price = curve[bucket] = round(
+                self.base_prices.get(skill, 5) * reputation_multiplier * self.applied.get(skill, 1.0), 2
+            )
+        return price
+
+    def price(self, skill, reputation_score):
+        """
+        Current price for one skill
+        Args:
+            skill: Job type
+            reputation_score: Seller reputation (stars)
+        Returns: Price in tokens
+        """
+        return self._price(skill, self._bucket(reputation_score))
+
+    def price_table(self, skills, reputation_score):
+        """
+        Price list for a skill set, cached and shared between agents (read-only)
+        Args:
+            skills: Tuple of skills
+            reputation_score: Seller reputation (stars)
+        Returns: Read-only mapping of skill -> price
+        """
+        bucket = self._bucket(reputation_score)
+        key = (skills, bucket)
+        table = self.tables.get(key)
+        if table is not None:
+            self.cache_hits += 1
+            return table
+        self.cache_misses += 1
+        table = self.tables[key] = MappingProxyType({skill: self._price(skill, bucket) for skill in skills})
+        return table
+
+    def get_stats(self):
+        """Per-skill market multipliers and cache counters"""
+        skills = sorted(set(self.competition) | set(self.clearing))
+        return {
+            'skills': {
+                skill: {
+                    'multiplier': round(self.applied.get(skill, 1.0), 4),
+                    'live_multiplier': round(self.multiplier(skill), 4),
+                    'bids_per_job': round(self.competition[skill].mean(), 2) if skill in self.competition else 0.0,
+                    'avg_bid': round(self.bids[skill].mean(), 2) if skill in self.bids else 0.0,
+                    'avg_clearing_price': round(self.clearing[skill].mean(), 2) if skill in self.clearing else 0.0
+                }
+                for skill in skills
+            },
+            'cached_tables': len(self.tables),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'invalidations': self.invalidations
+        }
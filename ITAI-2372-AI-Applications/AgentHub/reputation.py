@@ -0,0 +1,127 @@
+"""
+Bulk Reputation Engine for AgentHub
+Applies batches of quality results to agent reputations in one vectorised
+pass, with the same exponential moving average as Agent.update_reputation
+"""
+
+import numpy as np
+
+from agent import REPUTATION_WEIGHT
+from agent_store import StoredAgent
+
+
+class ReputationEngine:
+    """
+    Vectorised reputation updates
+    Features:
+    - Buffers (agent, quality_score) results and applies them in batches
+    - Exact EMA for agents rated several times in one batch (in order)
+    - Direct column reads/writes for AgentStore-backed agents
+    - Lazy price table refresh for every affected agent
+    """
+
+    def __init__(self, weight=REPUTATION_WEIGHT, batch_size=1024, store=None):
+        """
+        Args:
+            weight: Weight of a new rating in the moving average
+            batch_size: Buffered results that trigger an automatic flush
+            store: Optional AgentStore; its agents are updated column-wise
+        """
+        self.weight = weight
+        self.batch_size = batch_size
+        self.store = store
+        self.pending = []
+        self.updates_applied = 0
+        self.on_apply = None  # Optional callable(agents) told which agents were re-rated
+
+    def record(self, agent, quality_score):
+        """
+        Buffer one quality result, flushing when the batch is full
+        Args:
+            agent: Agent that did the work
+            quality_score: Quality score from validator (0-100)
+        """
+        self.pending.append((agent, quality_score))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Apply all buffered results
+        Returns: Dict of agent ID -> new reputation
+        """
+        pending, self.pending = self.pending, []
+        return self.apply(pending)
+
+    def apply(self, results):
+        """
+        Apply a batch of quality results in one pass
+        For an agent rated r1..rk (in order) with weight w the result is
+        (1-w)^k * R + sum_j w * (1-w)^(k-j) * r_j, identical to k sequential
+        update_reputation calls
+        Args:
+            results: List of (agent, quality_score) tuples
+        Returns: Dict of agent ID -> new reputation
+        """
+        if not results:
+            return {}
+
+        # Group results by agent identity; a stable sort keeps each agent's results in order
+        size = len(results)
+        rated = [agent for agent, _ in results]
+        keys = np.fromiter(map(id, rated), dtype=np.int64, count=size)
+        ratings = np.fromiter((score for _, score in results), dtype=np.float64, count=size)
+        ratings *= 5 / 100  # 0-100 score -> 0-5 stars
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        is_first = np.empty(size, dtype=bool)
+        is_first[0] = True
+        np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=is_first[1:])
+        starts = np.flatnonzero(is_first)
+        counts = np.diff(np.append(starts, size))
+        sorted_groups = np.cumsum(is_first) - 1
+        agents = [rated[i] for i in order[starts].tolist()]
+
+        # Each result's group, and how many later results for the same agent follow it
+        groups = np.empty(size, dtype=np.int64)
+        groups[order] = sorted_groups
+        later = np.empty(size, dtype=np.int64)
+        later[order] = counts[sorted_groups] - 1 - (np.arange(size) - starts[sorted_groups])
+
+        decay = 1 - self.weight
+        contributions = self.weight * decay ** later * ratings
+        rows = self._stored_rows(agents)
+        current = self._read(agents, rows)
+        updated = decay ** counts * current + np.bincount(groups, weights=contributions, minlength=len(agents))
+        self._write(agents, rows, updated)
+
+        for agent in agents:
+            agent.invalidate_pricing()
+        self.updates_applied += size
+        if self.on_apply:
+            self.on_apply(agents)
+
+        return {agent.agent_id: value for agent, value in zip(agents, updated.tolist())}
+
+    def _stored_rows(self, agents):
+        """Store rows for the agents if all of them live in this engine's store"""
+        store = self.store
+        if store is None:
+            return None
+        if not all(isinstance(a, StoredAgent) and a._store is store for a in agents):
+            return None
+        return np.fromiter((a._row for a in agents), dtype=np.int64, count=len(agents))
+
+    def _read(self, agents, rows):
+        """Current reputations as an array"""
+        if rows is not None:
+            return self.store.columns['reputation_score'][rows]
+        return np.fromiter((a.reputation_score for a in agents), dtype=np.float64, count=len(agents))
+
+    def _write(self, agents, rows, values):
+        """Store new reputations"""
+        if rows is not None:
+            self.store.columns['reputation_score'][rows] = values
+            return
+        for agent, value in zip(agents, values.tolist()):
+            agent.reputation_score = value
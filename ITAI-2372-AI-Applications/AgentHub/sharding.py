@@ -0,0 +1,403 @@
+"""
+Sharded Marketplace for AgentHub
+Partitions jobs by job type (skill) across worker processes, each running its
+own Marketplace shard. A coordinating router owns agent registration and
+balances, and every shard feeds one ordered ledger writer.
+
+Usage:
+    router = ShardRouter(num_shards=4)
+    router.start()
+    router.register_agent(Agent("buyer_0", 'buyer', [], initial_balance=1000))
+    router.register_agent(Agent("seller_0", 'seller', ['data_analysis']))
+    router.submit_job("buyer_0", "Analyze sales data", 'data_analysis', 20)
+    router.drain()
+    summary = router.stop()
+"""
+
+import multiprocessing as mp
+import random
+import zlib
+
+from agent import Agent
+from ai_validator import AIValidator
+from blockchain import Blockchain
+from ids import get_id_generator
+from marketplace import Marketplace
+from smart_contract import SmartContract
+
+
+DEFAULT_SKILLS = ['data_analysis', 'image_generation', 'text_generation', 'code_review', 'validation']
+
+
+def assign_skills(skills, num_shards, weights=None):
+    """
+    Spread skills over shards so expected job volume is balanced
+    Args:
+        skills: List of skill names
+        num_shards: Number of shards
+        weights: Optional dict of skill -> relative job demand
+    Returns: Dict of skill -> shard index
+    """
+    weights = weights or {}
+    load = [0.0] * num_shards
+    assignment = {}
+    # Largest skills first, each onto the currently lightest shard
+    for skill in sorted(skills, key=lambda s: (-weights.get(s, 1.0), s)):
+        shard = load.index(min(load))
+        assignment[skill] = shard
+        load[shard] += weights.get(skill, 1.0)
+    return assignment
+
+
+class ShardLedger:
+    """
+    Blockchain stand-in used inside a shard
+    Buffers transaction data instead of hashing it; the router's ledger
+    writer assigns the global order and builds the chain
+    """
+
+    def __init__(self, shard_id):
+        self.shard_id = shard_id
+        self.pending = []
+
+    def add_block(self, data):
+        """Queue transaction data for the ledger writer"""
+        data['shard'] = self.shard_id
+        self.pending.append(data)
+        return data
+
+    def drain(self):
+        """Return and clear the queued transaction data"""
+        pending, self.pending = self.pending, []
+        return pending
+
+
+class ShardRouter:
+    """
+    Coordinator for a sharded marketplace deployment
+    Features:
+    - One worker process and Marketplace shard per group of job types
+    - Cross-shard agent registration (sellers go to the shards for their skills)
+    - Router-held balances with per-job escrow holds
+    - Router-held seller reputation, synced to every shard holding the seller
+    - Batched job dispatch with a bounded number of batches in flight
+    - Single ordered ledger writer fed by all shards
+    """
+
+    def __init__(self, num_shards=4, skills=None, skill_weights=None, batch_size=256,
+                 max_in_flight=4, history_limit=1_000, seed=None):
+        """
+        Args:
+            num_shards: Number of worker processes
+            skills: Job types to partition (defaults to the built-in skills)
+            skill_weights: Optional dict of skill -> relative demand, used to balance shards
+            batch_size: Jobs sent to a shard per message
+            max_in_flight: Unanswered batches allowed per shard before the router waits
+            history_limit: Finished jobs each shard keeps in memory
+            seed: Base random seed for the shards
+        """
+        self.num_shards = num_shards
+        self.skill_shard = assign_skills(skills or DEFAULT_SKILLS, num_shards, skill_weights)
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.history_limit = history_limit
+        self.seed = seed
+
+        self.agents = {}
+        self.held = {}  # buyer ID -> tokens held for jobs in flight
+        self.jobs = {}  # job ref -> (buyer ID, budget) while in flight
+        self.results = {'completed': 0, 'disputed': 0, 'unmatched': 0}
+        self.jobs_per_shard = [0] * num_shards
+        self.seller_shards = {}  # seller ID -> shards holding a copy, for sellers on more than one
+        self._reputation_updates = {}  # seller ID -> reputation not yet sent to its shards
+        self.ledger_summary = None
+
+        self._next_ref = 0
+        self._batches = [[] for _ in range(num_shards)]
+        self._in_flight = [0] * num_shards
+        self._inboxes = []
+        self._workers = []
+        self._outbox = None
+        self._ledger_queue = None
+        self._ledger_summary_queue = None
+        self._ledger_writer = None
+
+    def shard_for(self, job_type):
+        """Shard index that handles a job type"""
+        shard = self.skill_shard.get(job_type)
+        if shard is None:
+            shard = zlib.crc32(job_type.encode()) % self.num_shards
+        return shard
+
+    def start(self):
+        """Start the ledger writer and one worker process per shard"""
+        ctx = mp.get_context()
+        self._outbox = ctx.Queue()
+        self._ledger_queue = ctx.Queue()
+        self._ledger_summary_queue = ctx.Queue()
+        self._ledger_writer = ctx.Process(
+            target=_ledger_main,
+            args=(self._ledger_queue, self._ledger_summary_queue),
+            daemon=True
+        )
+        self._ledger_writer.start()
+
+        for shard_id in range(self.num_shards):
+            inbox = ctx.Queue()
+            seed = None if self.seed is None else self.seed + shard_id
+            worker = ctx.Process(
+                target=_shard_main,
+                args=(shard_id, inbox, self._outbox, self._ledger_queue, self.history_limit, seed),
+                daemon=True
+            )
+            worker.start()
+            self._inboxes.append(inbox)
+            self._workers.append(worker)
+
+    def register_agent(self, agent):
+        """
+        Register an agent with the router and every shard that needs it
+        Buyers are replicated to all shards; sellers only to the shards
+        that handle their skills
+        Args:
+            agent: Agent instance (the router's copy holds the real balance)
+        """
+        self.agents[agent.agent_id] = agent
+        spec = (agent.agent_id, agent.agent_type, list(agent.skills),
+                agent.reputation_score, agent.max_concurrent_jobs)
+
+        if agent.agent_type == 'seller':
+            shards = {self.shard_for(skill) for skill in agent.skills}
+            if len(shards) > 1:
+                self.seller_shards[agent.agent_id] = sorted(shards)
+        else:
+            shards = range(self.num_shards)
+        for shard in shards:
+            self._inboxes[shard].put(('register', spec))
+
+    def submit_job(self, buyer_id, job_description, job_type, budget):
+        """
+        Hold the buyer's budget and queue the job for its shard
+        Args:
+            buyer_id: Agent posting the job
+            job_description: Description of work needed
+            job_type: Type of service required
+            budget: Maximum payment
+        Returns: Job reference or None if the buyer can't cover the budget
+        """
+        buyer = self.agents.get(buyer_id)
+        if buyer is None or buyer.balance < budget:
+            return None
+
+        buyer.balance -= budget
+        self.held[buyer_id] = self.held.get(buyer_id, 0) + budget
+        ref = self._next_ref
+        self._next_ref += 1
+        self.jobs[ref] = (buyer_id, budget)
+
+        shard = self.shard_for(job_type)
+        batch = self._batches[shard]
+        batch.append((ref, buyer_id, job_description, job_type, budget))
+        if len(batch) >= self.batch_size:
+            self._send(shard)
+        return ref
+
+    def flush(self):
+        """Send every partially filled batch to its shard"""
+        for shard in range(self.num_shards):
+            if self._batches[shard]:
+                self._send(shard)
+
+    def drain(self):
+        """Flush pending jobs and settle every result still in flight"""
+        self.flush()
+        while any(self._in_flight):
+            self._collect()
+
+    def stop(self):
+        """
+        Drain outstanding work, stop the shards and close the ledger
+        Returns: Ledger writer summary dict
+        """
+        self.drain()
+        for inbox in self._inboxes:
+            inbox.put(('stop', None))
+        for worker in self._workers:
+            worker.join()
+
+        self._ledger_queue.put(None)
+        self.ledger_summary = self._ledger_summary_queue.get()
+        self._ledger_writer.join()
+        return self.ledger_summary
+
+    def _send(self, shard):
+        """Dispatch a shard's batch, waiting while too many are in flight"""
+        while self._in_flight[shard] >= self.max_in_flight:
+            self._collect()
+        batch, self._batches[shard] = self._batches[shard], []
+        self._inboxes[shard].put(('jobs', batch))
+        self._in_flight[shard] += 1
+        self.jobs_per_shard[shard] += len(batch)
+
+    def _collect(self):
+        """Settle one batch of results from any shard"""
+        shard, results = self._outbox.get()
+        self._in_flight[shard] -= 1
+        for ref, seller_id, charged, released, quality_score in results:
+            self._settle(ref, seller_id, charged, released, quality_score)
+        self._sync_reputations()
+
+    def _sync_reputations(self):
+        """Send changed reputations of multi-shard sellers to every shard holding them"""
+        if not self._reputation_updates:
+            return
+        per_shard = {}
+        for seller_id, reputation in self._reputation_updates.items():
+            for shard in self.seller_shards[seller_id]:
+                per_shard.setdefault(shard, {})[seller_id] = reputation
+        self._reputation_updates = {}
+        for shard, reputations in per_shard.items():
+            self._inboxes[shard].put(('reputations', reputations))
+
+    def _settle(self, ref, seller_id, charged, released, quality_score):
+        """
+        Move tokens between router balances for one finished job
+        Args:
+            ref: Job reference
+            seller_id: Winning seller or None if the job was never escrowed
+            charged: Tokens the buyer paid into escrow
+            released: Whether escrow was released to the seller
+            quality_score: Validator score for the work (None if the job was never escrowed)
+        """
+        buyer_id, budget = self.jobs.pop(ref)
+        buyer = self.agents[buyer_id]
+
+        # Release the hold; the buyer keeps whatever escrow didn't take
+        self.held[buyer_id] -= budget
+        buyer.balance += budget - charged
+        if charged:
+            buyer.total_spent += charged
+            buyer.jobs_requested += 1
+
+        if seller_id is None:
+            self.results['unmatched'] += 1
+            return
+
+        seller = self.agents[seller_id]
+        if released:
+            # The router's copy is the seller's reputation of record; every rating is applied to it once
+            seller.update_reputation(quality_score)
+            if seller_id in self.seller_shards:
+                self._reputation_updates[seller_id] = seller.reputation_score
+            seller.balance += charged
+            seller.total_earned += charged
+            seller.jobs_completed += 1
+            self.results['completed'] += 1
+        else:
+            self.results['disputed'] += 1
+
+
+def _shard_main(shard_id, inbox, outbox, ledger_queue, history_limit, seed):
+    """
+    Worker process loop: run a Marketplace shard over batches of jobs
+    Args:
+        shard_id: Index of this shard
+        inbox: Queue of ('register' | 'jobs' | 'reputations' | 'stop', payload) messages
+        outbox: Queue for (shard_id, results) replies
+        ledger_queue: Queue feeding the ledger writer
+        history_limit: Finished jobs kept in memory
+        seed: Random seed for this shard
+    """
+    if seed is not None:
+        random.seed(seed)
+    # Job and contract IDs stay unique across shards: each shard leases its own worker ID,
+    # whatever it inherited from the router (including AGENTHUB_WORKER_ID)
+    get_id_generator().lease()
+
+    ledger = ShardLedger(shard_id)
+    smart_contract = SmartContract(ledger, verbose=False)
+    market = Marketplace(ledger, smart_contract, AIValidator(verbose=False), verbose=False)
+    processed = 0
+
+    while True:
+        kind, payload = inbox.get()
+
+        if kind == 'register':
+            agent_id, agent_type, skills, reputation, max_jobs = payload
+            # Balances live on the router; buyers are funded job by job
+            agent = Agent(agent_id, agent_type, skills, initial_balance=0,
+                          max_concurrent_jobs=max_jobs, verbose=False)
+            agent.reputation_score = reputation
+            agent.pricing = agent._generate_pricing()
+            market.register_agent(agent)
+
+        elif kind == 'reputations':
+            # The router's reputations of record, replacing this shard's local estimates
+            for agent_id, reputation in payload.items():
+                agent = market.agents[agent_id]
+                agent.reputation_score = reputation
+                agent.invalidate_pricing()
+                market._agent_changed(agent_id)
+
+        elif kind == 'jobs':
+            results = [_run_job(market, job) for job in payload]
+            # Ledger entries go out before results so each shard's order is kept
+            ledger_queue.put((shard_id, ledger.drain()))
+            outbox.put((shard_id, results))
+
+            processed += len(payload)
+            if processed >= history_limit:
+                processed = 0
+                market.prune_history(history_limit)
+                smart_contract.prune_history(history_limit)
+
+        elif kind == 'stop':
+            break
+
+
+def _run_job(market, job):
+    """
+    Run one job through a shard: post, bid, select, execute
+    Args:
+        market: Marketplace shard
+        job: (ref, buyer_id, description, job_type, budget) tuple
+    Returns: (ref, seller_id, charged, released, quality_score) tuple
+    """
+    ref, buyer_id, description, job_type, budget = job
+    buyer = market.agents[buyer_id]
+    buyer.balance = budget
+
+    job_id = market.post_job(buyer, description, job_type, budget)
+    if not market.collect_bids(job_id) or not market.select_winner(job_id):
+        return (ref, None, 0, False, None)
+
+    released = market.execute_job(job_id)
+    posted = market._find_job(job_id)
+    if posted['status'] not in ('completed', 'disputed'):
+        return (ref, None, 0, False, None)
+    seller = market.agents[posted['winner']]
+    charged = budget - buyer.balance
+    return (ref, seller.agent_id, charged, released, posted['quality_score'])
+
+
+def _ledger_main(queue, summary_queue):
+    """
+    Ledger writer process: append shard transactions to one chain in arrival order
+    Args:
+        queue: Queue of (shard_id, [transaction data]) batches, None to stop
+        summary_queue: Queue that receives the final chain summary
+    """
+    blockchain = Blockchain()
+    while True:
+        batch = queue.get()
+        if batch is None:
+            break
+        _, entries = batch
+        if entries:
+            blockchain.add_blocks(entries)
+
+    summary_queue.put({
+        'blocks': len(blockchain.chain),
+        'last_hash': blockchain.chain[-1]['hash'],
+        'valid': blockchain.is_valid()
+    })
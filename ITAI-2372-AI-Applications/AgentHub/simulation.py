@@ -0,0 +1,417 @@
+"""
+Marketplace Simulation Harness for AgentHub
+Headless, seeded load generator for regression-testing marketplace performance
+
+Spins up N buyers and M sellers with configurable skill distributions, drives
+a target job arrival rate on a virtual clock (no wall-clock sleeps, no printing)
+and reports throughput, per-stage latency percentiles and memory.
+
+Usage:
+    python simulation.py --jobs 1000000 --buyers 50 --sellers 200 --rate 5000
+    python simulation.py --jobs 100000 --mode batch --clearing-interval 0.5
+"""
+
+import argparse
+import json
+import random
+import resource
+import time
+from array import array
+
+from agent import Agent
+from agent_store import AgentStore
+from ai_validator import AIValidator
+from blockchain import Blockchain
+from marketplace import Marketplace
+from persistence import AgentRepository, PersistentAgentRegistry
+from pricing import PricingEngine
+from reputation import ReputationEngine
+from smart_contract import SmartContract
+
+
+DEFAULT_SKILL_WEIGHTS = {
+    'data_analysis': 0.30,
+    'image_generation': 0.20,
+    'text_generation': 0.20,
+    'code_review': 0.20,
+    'validation': 0.10
+}
+
+JOB_DESCRIPTIONS = {
+    'data_analysis': 'Analyze customer satisfaction survey data',
+    'image_generation': 'Generate product visualization for marketing campaign',
+    'text_generation': 'Write professional product description content',
+    'code_review': 'Review backend API implementation for issues',
+    'validation': 'Validate quality metrics for delivered work'
+}
+
+
+class StageTimer:
+    """
+    Collects latency samples per pipeline stage
+    Passed to Marketplace as its stage_timer and called by the harness directly
+    """
+
+    def __init__(self):
+        self.samples = {}
+
+    def __call__(self, stage, seconds):
+        samples = self.samples.get(stage)
+        if samples is None:
+            samples = self.samples[stage] = array('d')
+        samples.append(seconds)
+
+    def summary(self):
+        """Count, mean, p50 and p99 (milliseconds) for every stage"""
+        report = {}
+        for stage, samples in self.samples.items():
+            ordered = sorted(samples)
+            count = len(ordered)
+            report[stage] = {
+                'count': count,
+                'mean_ms': round(sum(ordered) / count * 1000, 4),
+                'p50_ms': round(ordered[int(0.50 * (count - 1))] * 1000, 4),
+                'p99_ms': round(ordered[int(0.99 * (count - 1))] * 1000, 4)
+            }
+        return report
+
+
+class VirtualClock:
+    """Simulated time source, advanced by the harness instead of sleeping"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class MarketplaceSimulation:
+    """
+    Seeded marketplace load test
+    Features:
+    - Configurable buyer/seller counts and skill distributions
+    - Poisson job arrivals at a target rate on a virtual clock
+    - Per-job cycle or periodic batch auction matching
+    - Per-stage latency percentiles, throughput and peak memory
+    """
+
+    def __init__(self, num_buyers=50, num_sellers=200, skill_weights=None,
+                 skills_per_seller=(1, 2), arrival_rate=1000.0, budget_range=(8, 30),
+                 mode='per_job', clearing_interval=1.0, seller_capacity=10,
+                 history_limit=10_000, seed=42, validator=None, use_agent_store=False,
+                 reputation_batch=0, dynamic_pricing=False, persist_path=None):
+        """
+        Args:
+            num_buyers: Number of buyer agents
+            num_sellers: Number of seller agents
+            skill_weights: Dict of skill -> relative job demand (also seller supply)
+            skills_per_seller: (min, max) number of skills per seller
+            arrival_rate: Target job arrivals per simulated second
+            budget_range: (min, max) job budget in tokens
+            mode: 'per_job' (post, bid, select, execute) or 'batch' (auction rounds)
+            clearing_interval: Simulated seconds between auction rounds in batch mode
+            seller_capacity: Concurrent jobs per seller
+            history_limit: Finished jobs kept in memory (None keeps everything)
+            seed: Random seed for the whole run
+            validator: Optional validator (defaults to a quiet AIValidator)
+            use_agent_store: Keep agent numeric state in a struct-of-arrays AgentStore
+            reputation_batch: Apply reputation updates in vectorised batches of this size (0 = per job)
+            dynamic_pricing: Price sellers from recent bids per job (free supply vs demand) via a PricingEngine
+            persist_path: SQLite file (or ':memory:') to persist agent state to, flushed every second
+        """
+        self.num_buyers = num_buyers
+        self.num_sellers = num_sellers
+        self.skill_weights = skill_weights or DEFAULT_SKILL_WEIGHTS
+        self.skills_per_seller = skills_per_seller
+        self.arrival_rate = arrival_rate
+        self.budget_range = budget_range
+        self.mode = mode
+        self.clearing_interval = clearing_interval
+        self.seller_capacity = seller_capacity
+        self.history_limit = history_limit
+        self.seed = seed
+        self.validator = validator
+        self.use_agent_store = use_agent_store
+        self.reputation_batch = reputation_batch
+        self.dynamic_pricing = dynamic_pricing
+        self.persist_path = persist_path
+
+        self.rng = random.Random(seed)
+        self.clock = VirtualClock()
+        self.timer = StageTimer()
+        self.marketplace = None
+        self.buyers = []
+
+    def setup(self):
+        """Create the blockchain, marketplace and agents"""
+        # Agents and the rule-based validator draw from the global generator
+        random.seed(self.seed)
+
+        blockchain = Blockchain()
+        validator = self.validator or AIValidator(verbose=False)
+        store = AgentStore(self.num_buyers + self.num_sellers) if self.use_agent_store else None
+        make_agent = store.create_agent if store else Agent
+        engine = None
+        if self.reputation_batch:
+            engine = ReputationEngine(batch_size=self.reputation_batch, store=store)
+        registry = None
+        if self.persist_path:
+            registry = PersistentAgentRegistry(AgentRepository(self.persist_path), factory=make_agent,
+                                               flush_interval=1.0)
+        self.marketplace = Marketplace(
+            blockchain,
+            SmartContract(blockchain, verbose=False),
+            validator,
+            verbose=False,
+            stage_timer=self.timer,
+            agent_store=store,
+            reputation_engine=engine,
+            pricing_engine=PricingEngine() if self.dynamic_pricing else None,
+            agents=registry
+        )
+
+        skills = list(self.skill_weights)
+        weights = [self.skill_weights[s] for s in skills]
+        low, high = self.skills_per_seller
+
+        self.buyers = []
+        for i in range(self.num_buyers):
+            buyer = make_agent(f"buyer_{i}", 'buyer', [], initial_balance=10**12, verbose=False)
+            self.marketplace.register_agent(buyer)
+            self.buyers.append(buyer)
+
+        for i in range(self.num_sellers):
+            chosen = set()
+            target = self.rng.randint(low, high)
+            while len(chosen) < target:
+                chosen.add(self.rng.choices(skills, weights)[0])
+            seller = make_agent(
+                f"seller_{i}", 'seller', sorted(chosen),
+                initial_balance=0,
+                max_concurrent_jobs=self.seller_capacity,
+                verbose=False
+            )
+            self.marketplace.register_agent(seller)
+
+        if self.mode == 'batch':
+            auction = self.marketplace.enable_batch_auction(
+                clearing_interval=self.clearing_interval,
+                seller_capacity=self.seller_capacity
+            )
+            auction.clock = self.clock
+            auction.last_cleared = self.clock()
+            auction.rng.seed(self.seed)
+
+    def run(self, num_jobs):
+        """
+        Drive num_jobs arrivals through the marketplace
+        Args:
+            num_jobs: Number of jobs to post
+        Returns: Report dict
+        """
+        if self.marketplace is None:
+            self.setup()
+
+        market = self.marketplace
+        timer = self.timer
+        rng = self.rng
+        skills = list(self.skill_weights)
+        weights = [self.skill_weights[s] for s in skills]
+        budget_low, budget_high = self.budget_range
+        outcomes = {'completed': 0, 'disputed': 0, 'unmatched': 0, 'failed': 0}
+
+        rss_before = _peak_rss_mb()
+        wall_start = time.perf_counter()
+
+        for i in range(num_jobs):
+            self.clock.advance(rng.expovariate(self.arrival_rate))
+            job_type = rng.choices(skills, weights)[0]
+            buyer = self.buyers[rng.randrange(len(self.buyers))]
+            budget = rng.randint(budget_low, budget_high)
+
+            started = time.perf_counter()
+            job_id = market.post_job(buyer, JOB_DESCRIPTIONS.get(job_type, job_type), job_type, budget)
+            posted = time.perf_counter()
+            timer('post', posted - started)
+
+            if self.mode == 'batch':
+                if market.auction.is_due():
+                    self._run_round(outcomes)
+            else:
+                self._run_cycle(job_id, started, posted, outcomes)
+
+            if self.history_limit is not None and i % self.history_limit == 0:
+                self._trim_history()
+
+        if self.mode == 'batch':
+            while market.auction.pending:
+                self.clock.advance(self.clearing_interval)
+                if not self._run_round(outcomes):
+                    break
+        market.persist()
+
+        wall_time = time.perf_counter() - wall_start
+        outcomes['unmatched'] += len(market.active_jobs)
+
+        return {
+            'config': {
+                'jobs': num_jobs,
+                'buyers': self.num_buyers,
+                'sellers': self.num_sellers,
+                'mode': self.mode,
+                'arrival_rate': self.arrival_rate,
+                'agent_store': self.use_agent_store,
+                'reputation_batch': self.reputation_batch,
+                'dynamic_pricing': self.dynamic_pricing,
+                'persist_path': self.persist_path,
+                'seed': self.seed
+            },
+            'outcomes': outcomes,
+            'wall_time_s': round(wall_time, 3),
+            'simulated_time_s': round(self.clock(), 3),
+            'throughput_jobs_per_s': round(num_jobs / wall_time, 1) if wall_time else 0.0,
+            'keeps_up_with_arrivals': num_jobs / wall_time >= self.arrival_rate if wall_time else True,
+            'stages': timer.summary(),
+            'pricing': market.pricing_engine.get_stats() if market.pricing_engine else None,
+            'persistence': market.agents.get_stats() if self.persist_path else None,
+            'memory': {
+                'peak_rss_mb': round(_peak_rss_mb(), 1),
+                'peak_rss_growth_mb': round(_peak_rss_mb() - rss_before, 1),
+                'blocks': len(market.blockchain.chain)
+            }
+        }
+
+    def _run_cycle(self, job_id, started, posted, outcomes):
+        """Bid, select and execute one job immediately"""
+        market = self.marketplace
+        timer = self.timer
+
+        bids = market.collect_bids(job_id)
+        bid_done = time.perf_counter()
+        timer('bid', bid_done - posted)
+        if not bids:
+            return
+
+        winner = market.select_winner(job_id)
+        selected = time.perf_counter()
+        timer('select', selected - bid_done)
+        if not winner:
+            outcomes['failed'] += 1
+            return
+
+        ok = market.execute_job(job_id)
+        finished = time.perf_counter()
+        timer('execute', finished - selected)
+        timer('end_to_end', finished - started)
+        outcomes['completed' if ok else 'disputed'] += 1
+
+    def _run_round(self, outcomes):
+        """Clear one auction round and execute its assignments"""
+        started = time.perf_counter()
+        result = self.marketplace.run_auction_round(execute=True)
+        self.timer('auction_round', time.perf_counter() - started)
+        self.timer('clear', result['clearing_time'])
+        for ok in result['executed']:
+            outcomes['completed' if ok else 'disputed'] += 1
+        return bool(result['assignments'])
+
+    def _trim_history(self):
+        """Keep only the most recent finished jobs and contracts in memory"""
+        market = self.marketplace
+        market.prune_history(self.history_limit)
+        market.smart_contract.prune_history(self.history_limit)
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def print_report(report):
+    """Print a simulation report"""
+    print(f"\n{'='*70}")
+    print("MARKETPLACE SIMULATION")
+    print(f"{'='*70}")
+    config = report['config']
+    print(f"Jobs: {config['jobs']}  Buyers: {config['buyers']}  Sellers: {config['sellers']}  "
+          f"Mode: {config['mode']}  Seed: {config['seed']}")
+    print(f"Outcomes: {report['outcomes']}")
+    print(f"\nWall time: {report['wall_time_s']} s (simulated: {report['simulated_time_s']} s)")
+    print(f"Throughput: {report['throughput_jobs_per_s']} jobs/s "
+          f"(target {config['arrival_rate']}/s, "
+          f"{'keeps up' if report['keeps_up_with_arrivals'] else 'falls behind'})")
+    print(f"\n{'Stage':<16}{'count':>10}{'mean ms':>12}{'p50 ms':>12}{'p99 ms':>12}")
+    for stage, stats in report['stages'].items():
+        print(f"{stage:<16}{stats['count']:>10}{stats['mean_ms']:>12.4f}"
+              f"{stats['p50_ms']:>12.4f}{stats['p99_ms']:>12.4f}")
+    pricing = report['pricing']
+    if pricing:
+        print(f"\nDynamic pricing ({pricing['invalidations']} curve invalidations, "
+              f"{pricing['cache_hits']} cache hits / {pricing['cache_misses']} misses)")
+        for skill, market in pricing['skills'].items():
+            print(f"   {skill:<18} x{market['multiplier']:<8} bids/job {market['bids_per_job']:<8} "
+                  f"avg bid {market['avg_bid']:<8} "
+                  f"avg clearing {market['avg_clearing_price']}")
+    persistence = report['persistence']
+    if persistence:
+        print(f"\nPersistence: {persistence['rows_written']} rows in {persistence['flushes']} flushes "
+              f"({persistence['transactions']} transactions)")
+    memory = report['memory']
+    print(f"\nPeak RSS: {memory['peak_rss_mb']} MB (+{memory['peak_rss_growth_mb']} MB during run)")
+    print(f"Blocks on chain: {memory['blocks']}")
+    print(f"{'='*70}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless AgentHub marketplace load test")
+    parser.add_argument('--jobs', type=int, default=100_000)
+    parser.add_argument('--buyers', type=int, default=50)
+    parser.add_argument('--sellers', type=int, default=200)
+    parser.add_argument('--rate', type=float, default=1000.0, help='target job arrivals per second')
+    parser.add_argument('--mode', choices=['per_job', 'batch'], default='per_job')
+    parser.add_argument('--clearing-interval', type=float, default=1.0)
+    parser.add_argument('--capacity', type=int, default=10, help='concurrent jobs per seller')
+    parser.add_argument('--skill-weights', type=json.loads, default=None,
+                        help='JSON dict of skill -> relative demand')
+    parser.add_argument('--history-limit', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--agent-store', action='store_true',
+                        help='keep agent state in a struct-of-arrays AgentStore')
+    parser.add_argument('--reputation-batch', type=int, default=0,
+                        help='batch reputation updates through the vectorised engine (0 = per job)')
+    parser.add_argument('--dynamic-pricing', action='store_true',
+                        help='price sellers from recent bids per job (free supply vs demand)')
+    parser.add_argument('--persist', default=None, metavar='PATH',
+                        help="persist agent state to this SQLite file (':memory:' for none on disk)")
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    simulation = MarketplaceSimulation(
+        num_buyers=args.buyers,
+        num_sellers=args.sellers,
+        skill_weights=args.skill_weights,
+        arrival_rate=args.rate,
+        mode=args.mode,
+        clearing_interval=args.clearing_interval,
+        seller_capacity=args.capacity,
+        history_limit=args.history_limit,
+        seed=args.seed,
+        use_agent_store=args.agent_store,
+        reputation_batch=args.reputation_batch,
+        dynamic_pricing=args.dynamic_pricing,
+        persist_path=args.persist
+    )
+    report = simulation.run(args.jobs)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
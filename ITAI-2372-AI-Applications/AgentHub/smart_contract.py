@@ -4,8 +4,10 @@ Handles escrow, payment release, and dispute resolution
 Simulates x402-style automatic payment settlement
 """
 
+import bisect
 from datetime import datetime
-import uuid
+
+from ids import id_floor, new_contract_id, parse_id
 
 
 class SmartContract:
@@ -17,10 +19,13 @@ class SmartContract:
     - Quality threshold enforcement
     """
     
-    def __init__(self, blockchain):
+    def __init__(self, blockchain, verbose=True):
         self.blockchain = blockchain
+        self.verbose = verbose
         self.active_contracts = {}
         self.contract_history = []
+        self._contract_index = {}  # integer contract ID -> contract (active or finished)
+        self._contract_keys = []  # integer contract IDs in creation order
         self.quality_threshold = 70  # Minimum quality score to release payment
     
     def create_contract(self, buyer_id, seller_id, job_description, amount):
@@ -33,7 +38,7 @@ class SmartContract:
             amount: Payment amount in tokens
         Returns: Contract ID
         """
-        contract_id = str(uuid.uuid4())[:8]
+        contract_id = new_contract_id()
         
         contract = {
             'contract_id': contract_id,
@@ -48,6 +53,12 @@ class SmartContract:
         }
         
         self.active_contracts[contract_id] = contract
+        key = parse_id(contract_id)
+        self._contract_index[key] = contract
+        if not self._contract_keys or key > self._contract_keys[-1]:
+            self._contract_keys.append(key)
+        else:
+            bisect.insort(self._contract_keys, key)
         
         # Record contract creation on blockchain
         self.blockchain.add_block({
@@ -60,11 +71,12 @@ class SmartContract:
             'status': 'escrowed'
         })
         
-        print(f"\n💼 Smart Contract Created: {contract_id}")
-        print(f"   Buyer: {buyer_id}")
-        print(f"   Seller: {seller_id}")
-        print(f"   Amount: {amount} tokens (ESCROWED)")
-        print(f"   Job: {job_description}")
+        if self.verbose:
+            print(f"\n💼 Smart Contract Created: {contract_id}")
+            print(f"   Buyer: {buyer_id}")
+            print(f"   Seller: {seller_id}")
+            print(f"   Amount: {amount} tokens (ESCROWED)")
+            print(f"   Job: {job_description}")
         
         return contract_id
     
@@ -78,7 +90,8 @@ class SmartContract:
         Returns: True if payment released, False otherwise
         """
         if contract_id not in self.active_contracts:
-            print(f"❌ Contract {contract_id} not found")
+            if self.verbose:
+                print(f"❌ Contract {contract_id} not found")
             return False
         
         contract = self.active_contracts[contract_id]
@@ -86,10 +99,11 @@ class SmartContract:
         contract['validator'] = validator_id
         contract['validated_at'] = str(datetime.now())
         
-        print(f"\n🔍 Validation Results for Contract {contract_id}")
-        print(f"   Quality Score: {quality_score}/100")
-        print(f"   Threshold: {self.quality_threshold}/100")
-        print(f"   Validator: {validator_id}")
+        if self.verbose:
+            print(f"\n🔍 Validation Results for Contract {contract_id}")
+            print(f"   Quality Score: {quality_score}/100")
+            print(f"   Threshold: {self.quality_threshold}/100")
+            print(f"   Validator: {validator_id}")
         
         # Auto-release payment if quality meets threshold
         if quality_score >= self.quality_threshold:
@@ -108,8 +122,9 @@ class SmartContract:
                 'status': 'completed'
             })
             
-            print(f"   ✅ PAYMENT RELEASED: {contract['amount']} tokens")
-            print(f"   {contract['seller']} earned {contract['amount']} tokens")
+            if self.verbose:
+                print(f"   ✅ PAYMENT RELEASED: {contract['amount']} tokens")
+                print(f"   {contract['seller']} earned {contract['amount']} tokens")
             
             # Move to history
             self.contract_history.append(contract)
@@ -131,8 +146,9 @@ class SmartContract:
                 'status': 'disputed'
             })
             
-            print(f"   ❌ PAYMENT WITHHELD: Quality below threshold")
-            print(f"   Contract status: DISPUTED")
+            if self.verbose:
+                print(f"   ❌ PAYMENT WITHHELD: Quality below threshold")
+                print(f"   Contract status: DISPUTED")
             
             return False
     
@@ -141,12 +157,31 @@ class SmartContract:
         if contract_id in self.active_contracts:
             return self.active_contracts[contract_id]
         
-        # Search history
-        for contract in self.contract_history:
-            if contract['contract_id'] == contract_id:
-                return contract
-        
-        return None
+        return self._contract_index.get(parse_id(contract_id))
+    
+    def contracts_created_between(self, start, end):
+        """
+        Contracts (active and finished) created in a time window
+        Args:
+            start: Unix timestamp (inclusive)
+            end: Unix timestamp (exclusive)
+        Returns: List of contracts in creation order
+        """
+        low = bisect.bisect_left(self._contract_keys, id_floor(start))
+        high = bisect.bisect_left(self._contract_keys, id_floor(end))
+        return [self._contract_index[key] for key in self._contract_keys[low:high]]
+    
+    def prune_history(self, limit):
+        """
+        Drop all but the most recent finished contracts from memory
+        Args:
+            limit: Number of finished contracts to keep
+        """
+        if len(self.contract_history) > limit:
+            for contract in self.contract_history[:-limit]:
+                self._contract_index.pop(parse_id(contract['contract_id']), None)
+            del self.contract_history[:-limit]
+            self._contract_keys = [key for key in self._contract_keys if key in self._contract_index]
     
     def get_active_contracts(self):
         """Get all active contracts"""
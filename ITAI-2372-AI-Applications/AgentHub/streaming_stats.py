@@ -0,0 +1,277 @@
+"""
+Streaming Statistics for AgentHub
+Constant-memory accumulators for marketplace and validator metrics
+Each update is O(1), so reading stats never rescans job history
+"""
+
+import math
+
+
+class RunningStats:
+    """
+    Running count, total, mean and variance (Welford's algorithm)
+    Features:
+    - O(1) update and read
+    - Numerically stable variance
+    - Mergeable across shards or processes (Chan et al.)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.min = None
+        self.max = None
+        self._m2 = 0.0
+
+    def update(self, value):
+        """
+        Add one observation
+        Args:
+            value: Numeric observation
+        """
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """
+        Fold another accumulator into this one
+        Args:
+            other: RunningStats instance
+        """
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.total, self.mean = other.count, other.total, other.mean
+            self.min, self.max, self._m2 = other.min, other.max, other._m2
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Sample variance (0 with fewer than two observations)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        """Sample standard deviation"""
+        return math.sqrt(self.variance)
+
+    def to_dict(self, ndigits=2):
+        """Summary dict for reports and API responses"""
+        return {
+            'count': self.count,
+            'total': round(self.total, ndigits),
+            'mean': round(self.mean, ndigits),
+            'std': round(self.std, ndigits),
+            'min': self.min,
+            'max': self.max
+        }
+
+
+class P2Quantile:
+    """
+    Streaming estimate of a single quantile (Jain & Chlamtac P-squared)
+    Keeps five markers regardless of how many values have been seen
+    """
+
+    def __init__(self, quantile):
+        """
+        Args:
+            quantile: Target quantile in (0, 1), e.g. 0.95
+        """
+        self.quantile = quantile
+        self.count = 0
+        self._initial = []
+        self._heights = None
+        self._positions = None
+        self._desired = None
+        self._increments = (0.0, quantile / 2, quantile, (1 + quantile) / 2, 1.0)
+
+    def update(self, value):
+        """
+        Add one observation
+        Args:
+            value: Numeric observation
+        """
+        self.count += 1
+        if self._heights is None:
+            self._initial.append(value)
+            if len(self._initial) == 5:
+                q = self.quantile
+                self._heights = sorted(self._initial)
+                self._positions = [1, 2, 3, 4, 5]
+                self._desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+                self._initial = None
+            return
+
+        heights = self._heights
+        positions = self._positions
+
+        # Find the cell the value falls into, stretching the extremes if needed
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Nudge the three middle markers toward their desired positions
+        for i in (1, 2, 3):
+            offset = self._desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1) or
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i, step):
+        """Piecewise-parabolic prediction for marker i moved by step"""
+        h = self._heights
+        n = self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self):
+        """Current quantile estimate, or None before any observation"""
+        if self._heights is not None:
+            return self._heights[2]
+        if not self._initial:
+            return None
+        ordered = sorted(self._initial)
+        return ordered[int(round(self.quantile * (len(ordered) - 1)))]
+
+
+class QuantileSketch:
+    """
+    Several streaming quantile estimates over the same values
+    Features:
+    - One P-squared estimator per quantile
+    - Constant memory and O(1) update per quantile
+    """
+
+    def __init__(self, quantiles=(0.5, 0.95)):
+        """
+        Args:
+            quantiles: Quantiles to track
+        """
+        self.estimators = {q: P2Quantile(q) for q in quantiles}
+
+    def update(self, value):
+        """Add one observation to every estimator"""
+        for estimator in self.estimators.values():
+            estimator.update(value)
+
+    def quantile(self, q):
+        """Current estimate for a tracked quantile"""
+        return self.estimators[q].value()
+
+    def to_dict(self, ndigits=2):
+        """Estimates keyed as p50, p95, ..."""
+        report = {}
+        for q, estimator in self.estimators.items():
+            value = estimator.value()
+            report[f"p{q * 100:g}"] = round(value, ndigits) if value is not None else None
+        return report
+
+
+class Histogram:
+    """
+    Fixed-bin histogram over a known range, for quantiles of bounded values
+    Features:
+    - Constant memory: one counter per bin
+    - Values outside the range are counted in the end bins
+    - Exact quantiles when values fall on bin edges (e.g. integer scores, unit bins)
+    - Mergeable across shards or processes
+    """
+
+    def __init__(self, low=0, high=101, bins=101):
+        """
+        Args:
+            low: Lower edge of the first bin
+            high: Upper edge of the last bin
+            bins: Number of equal-width bins (the default gives one per integer 0-100)
+        """
+        if high <= low or bins < 1:
+            raise ValueError("A histogram needs high > low and at least one bin")
+        self.low = low
+        self.high = high
+        self.bins = bins
+        self.width = (high - low) / bins
+        self.counts = [0] * bins
+        self.count = 0
+
+    def update(self, value):
+        """
+        Add one observation
+        Args:
+            value: Numeric observation
+        """
+        index = int((value - self.low) // self.width)
+        self.counts[min(max(index, 0), self.bins - 1)] += 1
+        self.count += 1
+
+    def merge(self, other):
+        """
+        Fold another histogram with the same bins into this one
+        Args:
+            other: Histogram instance
+        """
+        if (other.low, other.high, other.bins) != (self.low, self.high, self.bins):
+            raise ValueError("Histograms with different bins cannot be merged")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+
+    def quantile(self, q):
+        """
+        Nearest-rank quantile, reported as the lower edge of the bin holding it
+        Args:
+            q: Quantile in [0, 1]
+        Returns: Estimate, or None before any observation
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.low + index * self.width
+        return self.low + (self.bins - 1) * self.width
+
+    def to_dict(self, quantiles=(0.5, 0.9, 0.99), ndigits=2):
+        """Estimates keyed as p50, p90, ..."""
+        report = {}
+        for q in quantiles:
+            value = self.quantile(q)
+            report[f"p{q * 100:g}"] = round(value, ndigits) if value is not None else None
+        return report
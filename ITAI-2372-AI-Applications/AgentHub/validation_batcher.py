@@ -0,0 +1,188 @@
+"""
+Validation Batcher for AgentHub
+Dynamic micro-batching in front of a batch-capable validator
+
+Callers submit one validation at a time and get a Future back. A background
+thread takes the first waiting request, keeps gathering until it has
+max_batch_size requests or the first one has waited max_wait seconds, then
+runs them through the validator's validate_batch() as a single batch and
+resolves every Future. max_wait trades latency for throughput: 0 batches
+only what is already queued, larger values build bigger batches under light
+load. Requests already queued when the wait runs out still join the batch,
+so a backlog never waits on the timer.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from streaming_stats import QuantileSketch, RunningStats
+
+
+_STOP = object()  # Queue sentinel: finish the current batch and exit
+
+
+class ValidationBatcher:
+    """
+    Micro-batching front end for MLValidator (or any validator with validate_batch)
+    Features:
+    - submit() returns a Future; validate_work() blocks on one, as a drop-in validator
+    - Batches close at max_batch_size requests or after max_wait seconds
+    - Optional bounded queue: submit() blocks when it's full (backpressure)
+    - Queue depth, batch size, wait and throughput metrics
+    """
+
+    def __init__(self, validator, max_batch_size=32, max_wait=0.005, max_queue_size=0, verbose=False):
+        """
+        Args:
+            validator: Validator with validate_batch(pairs, batch_size) (e.g. MLValidator)
+            max_batch_size: Most requests run in one batch
+            max_wait: Seconds the oldest request may wait for a batch to fill
+            max_queue_size: Most queued requests before submit() blocks (0 for unbounded)
+            verbose: Whether to print batcher lifecycle messages
+        """
+        self.validator = validator
+        self.validator_id = getattr(validator, 'validator_id', type(validator).__name__)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.verbose = verbose
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.errors = 0
+        self.batches = 0
+        self.peak_queue_depth = 0
+        self.busy_seconds = 0.0  # Time spent inside validate_batch
+        self.batch_sizes = RunningStats()
+        self.wait_ms = RunningStats()  # Submission until the request's batch started
+        self.wait_quantiles = QuantileSketch((0.5, 0.95, 0.99))
+        self._started = time.perf_counter()
+
+        self._thread = threading.Thread(target=self._serve, name='validation-batcher', daemon=True)
+        self._thread.start()
+        if self.verbose:
+            print(f"📦 Validation batcher started (max batch {max_batch_size}, max wait {max_wait * 1000:.1f} ms)")
+
+    def __getattr__(self, name):
+        # Anything else (validation_stats, get_stats, ...) comes from the wrapped validator
+        if name == 'validator':
+            raise AttributeError(name)
+        return getattr(self.validator, name)
+
+    def submit(self, job_description, work_output, job_type=None):
+        """
+        Queue one validation
+        Args:
+            job_description: Original job requirements
+            work_output: Agent's work output
+            job_type: Optional job type for context
+        Returns: Future resolving to the validator's result dict
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Validation batcher is shut down")
+            self.submitted += 1
+        self._queue.put(((job_description, work_output, job_type), future, time.perf_counter()))
+        depth = self._queue.qsize()
+        with self._lock:
+            self.peak_queue_depth = max(self.peak_queue_depth, depth)
+        return future
+
+    def validate_work(self, job_description, work_output, job_type=None):
+        """
+        Validate one output through the batcher, waiting for the result
+        Same signature and result as MLValidator.validate_work
+        """
+        return self.submit(job_description, work_output, job_type).result()
+
+    @property
+    def queue_depth(self):
+        """Requests waiting for a batch"""
+        return self._queue.qsize()
+
+    def _serve(self):
+        """Background loop: gather a batch, run it, repeat until shut down"""
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = first[2] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        """Validate a gathered batch and resolve its futures"""
+        # Requests cancelled while queued are dropped
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            wait = (started - enqueued) * 1000
+            self.wait_ms.update(wait)
+            self.wait_quantiles.update(wait)
+        try:
+            results = self.validator.validate_batch([pair for pair, _, _ in batch], batch_size=len(batch))
+        except Exception as e:
+            self.errors += len(batch)
+            for _, future, _ in batch:
+                future.set_exception(e)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+            self.completed += len(batch)
+        self.busy_seconds += time.perf_counter() - started
+        self.batches += 1
+        self.batch_sizes.update(len(batch))
+
+    def shutdown(self, wait=True):
+        """
+        Stop accepting requests; queued requests are still validated
+        Args:
+            wait: Whether to block until the queue has drained
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        if wait:
+            self._thread.join()
+        if self.verbose:
+            print(f"📦 Validation batcher stopped after {self.batches} batches")
+
+    def get_batching_stats(self):
+        """Queue depth, batch size, wait and throughput metrics"""
+        elapsed = time.perf_counter() - self._started
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': round(self.max_wait * 1000, 3),
+            'queue_depth': self.queue_depth,
+            'peak_queue_depth': self.peak_queue_depth,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'errors': self.errors,
+            'batches': self.batches,
+            'batch_size': self.batch_sizes.to_dict(),
+            'wait_ms': {**self.wait_ms.to_dict(3), **self.wait_quantiles.to_dict(3)},
+            'utilisation': round(self.busy_seconds / elapsed, 3) if elapsed > 0 else 0.0,
+            'items_per_second': round(self.completed / elapsed, 1) if elapsed > 0 else 0.0,
+            'items_per_busy_second': round(self.completed / self.busy_seconds, 1) if self.busy_seconds else 0.0
+        }
@@ -0,0 +1,165 @@
+"""
+Validation Result Cache for AgentHub
+Content-addressed memoisation of validation results
+
+Agents return the same outputs for the same kinds of job over and over, and
+scoring an identical (job_description, work_output, job_type) triple again
+gives the same answer. ValidationCache keys each result by a hash of the
+triple and the validator's model version, keeps recent results in an
+in-memory LRU and, optionally, every result in a SQLite table so they
+survive restarts. A validator whose models, backend or scoring rules change
+reports a new version: its keys no longer match old entries, and rows
+written under other versions are deleted when the table is opened.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ValidationCache:
+    """
+    Two-tier cache of validation results keyed by content hash
+    Features:
+    - Keys: blake2b of model version + job description + output + job type
+    - In-memory LRU (OrderedDict) in front of an optional SQLite table
+    - Results stored as JSON, so every hit returns a fresh copy
+    - Entries from other model versions are purged on open
+    - Thread-safe; hit/miss counters per tier
+    """
+
+    def __init__(self, capacity=10_000, path=None, version=''):
+        """
+        Args:
+            capacity: Most results kept in memory (0 disables the memory tier)
+            path: SQLite database file for the disk tier (None keeps results in memory only)
+            version: Model version of the validator producing the results
+        """
+        self.capacity = capacity
+        self.path = path
+        self.version = version
+        self._entries = OrderedDict()  # key -> JSON result, least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.conn = None
+        if path:
+            self._open()
+
+    @property
+    def enabled(self):
+        """Whether either tier can hold results"""
+        return self.capacity > 0 or self.conn is not None
+
+    def key(self, job_description, work_output, job_type=None):
+        """Content hash of a validation request under this cache's model version"""
+        content = json.dumps([self.version, job_description, work_output, job_type])
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _open(self):
+        """Open the disk tier, dropping results from other model versions"""
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS validation_results "
+            "(key TEXT PRIMARY KEY, version TEXT NOT NULL, result TEXT NOT NULL, created_at REAL)"
+        )
+        with self.conn:
+            self.conn.execute("DELETE FROM validation_results WHERE version != ?", (self.version,))
+
+    def get(self, key):
+        """
+        Cached result for a key, marking it recently used
+        Returns: Result dict (a fresh copy), or None on a miss
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            elif self.conn is not None:
+                row = self.conn.execute("SELECT result FROM validation_results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    payload = row[0]
+                    self._remember(key, payload)
+                    self.hits += 1
+                    self.disk_hits += 1
+            if payload is None:
+                self.misses += 1
+                return None
+        return json.loads(payload)
+
+    def put(self, key, result):
+        """Store one result"""
+        self.put_many([(key, result)])
+
+    def put_many(self, items):
+        """
+        Store results, writing the disk tier in one transaction
+        Args:
+            items: Iterable of (key, result dict)
+        """
+        if not self.enabled:
+            return
+        rows = [(key, json.dumps(result)) for key, result in items]
+        with self._lock:
+            for key, payload in rows:
+                self._remember(key, payload)
+            if self.conn is not None and rows:
+                now = time.time()
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO validation_results (key, version, result, created_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(key, self.version, payload, now) for key, payload in rows]
+                    )
+
+    def _remember(self, key, payload):
+        """Add to the memory tier, evicting the least recently used result when full"""
+        if self.capacity <= 0:
+            return
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached result from both tiers"""
+        with self._lock:
+            self._entries.clear()
+            if self.conn is not None:
+                with self.conn:
+                    self.conn.execute("DELETE FROM validation_results")
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def get_stats(self):
+        """Cache counters for dashboards and benchmarks"""
+        lookups = self.hits + self.misses
+        stored = None
+        if self.conn is not None:
+            with self._lock:
+                stored = self.conn.execute("SELECT COUNT(*) FROM validation_results").fetchone()[0]
+        return {
+            'version': self.version,
+            'cached': len(self._entries),
+            'capacity': self.capacity,
+            'persisted': stored,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
@@ -0,0 +1,490 @@
+"""
+Validation Worker Pool for AgentHub
+Runs MLValidator inference in worker processes instead of request threads
+
+In-process, every validation runs in a Flask request thread: torch's
+intra-op threads compete with the server's threads for cores, and tokenising
+and post-processing are serialised by the GIL. ValidationPool starts N
+worker processes that each load the models once, with torch pinned to
+threads_per_worker threads so the workers together don't oversubscribe the
+CPU. Requests go to one shared queue. An idle worker takes the next request
+and whatever else is already queued, up to max_batch_size, and scores them
+with a single validate_batch call. A collector thread in the parent resolves
+each request's Future as results come back.
+
+The result cache stays in the parent, so a repeated validation is answered
+without crossing a process boundary, and identical requests already in
+flight wait for the first one instead of being scored twice. ValidationPool
+has the validator's interface (validate_work, validate_batch, readiness,
+get_stats, validation_stats) plus ValidationBatcher's submit(), so it can
+replace get_validator() anywhere.
+
+Requests and results travel over multiprocessing queues (pickled over
+pipes) rather than shared-memory ring buffers. Payloads are short texts and
+small result dicts: benchmarks/bench_validation_pool.py measured a queue
+round trip of about 2-7 us per item for 200-2000 character outputs, and
+200-270 us at 100KB. Pickling dominates that cost, and a SharedMemory
+copy of the same batch, without any signalling, costs about as much.
+Inference takes tens of milliseconds per item, so the transport is not
+worth a hand-rolled ring buffer.
+
+Workers are forked where the platform allows it, so create the pool before
+the parent process runs any inference. Where processes are spawned instead,
+the launching script needs an `if __name__ == '__main__':` guard.
+"""
+
+import copy
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, InvalidStateError
+
+from ml_validator import ML_AVAILABLE, MLValidator
+from streaming_stats import RunningStats
+from validation_cache import ValidationCache
+from validation_stats import ValidationStats
+
+
+def _worker_main(worker_id, requests, results, threads, max_batch_size, validator_kwargs, validator_factory):
+    """
+    Worker process: load the models once, then serve batches until told to stop
+    Messages to the parent are (kind, worker_id, payload) tuples
+    """
+    if ML_AVAILABLE:
+        import torch
+        torch.set_num_threads(threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # Already fixed once torch has run parallel work
+    try:
+        if validator_factory is not None:
+            validator = validator_factory()
+        else:
+            # The parent caches results and keeps the stats; workers only run inference
+            validator = MLValidator(verbose=False, lazy=False, cache_size=0, history_size=0, **validator_kwargs)
+            validator.warm_up(background=False)
+    except Exception as e:
+        results.put(('failed', worker_id, f"{type(e).__name__}: {e}"))
+        return
+    readiness = getattr(validator, 'readiness', None)
+    results.put(('ready', worker_id, readiness() if readiness else None))
+
+    stopping = False
+    while not stopping:
+        item = requests.get()
+        if item is None:
+            break
+        batch = [item]
+        while len(batch) < max_batch_size:
+            try:
+                item = requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+        results.put(('taken', worker_id, [request_id for request_id, _, _ in batch]))
+        results.put(('results', worker_id, _serve_batch(validator, batch)))
+
+
+def _serve_batch(validator, batch):
+    """
+    Run one batch of requests in a worker
+    Validations share one validate_batch call; other methods run one by one
+    Returns: List of (request_id, ok, result or error message, cacheable), where
+        cacheable is False for validations scored with a fallback model score
+    """
+    replies = []
+    validations = [(request_id, args) for request_id, method, args in batch if method == 'validate']
+    if validations:
+        try:
+            scored = validator.validate_batch([args for _, args in validations], batch_size=len(validations))
+        except Exception as e:
+            replies.extend((request_id, False, f"{type(e).__name__}: {e}", False) for request_id, _ in validations)
+        else:
+            cacheable = getattr(validator, '_cacheable', lambda: True)()
+            replies.extend((request_id, True, result, cacheable)
+                           for (request_id, _), result in zip(validations, scored))
+    for request_id, method, args in batch:
+        if method == 'validate':
+            continue
+        try:
+            replies.append((request_id, True, getattr(validator, method)(*args), False))
+        except Exception as e:
+            replies.append((request_id, False, f"{type(e).__name__}: {e}", False))
+    return replies
+
+
+class ValidationPool:
+    """
+    Process pool running MLValidator inference outside the web process
+    Features:
+    - N worker processes, each loading the models once
+    - torch intra-op threads pinned per worker (threads_per_worker)
+    - One shared request queue; idle workers take queued requests in batches
+    - Result cache and in-flight de-duplication in the parent
+    - Same interface as MLValidator, plus submit() returning a Future
+    - Requests held by a crashed worker fail instead of hanging
+    """
+
+    def __init__(self, num_workers=2, threads_per_worker=None, max_batch_size=32, use_gpu=False,
+                 backend='torch', job_classifier='prototype', cache_size=10_000, cache_path=None, verbose=True,
+                 validator_factory=None, history_size=100):
+        """
+        Args:
+            num_workers: Worker processes (each holds its own copy of the models)
+            threads_per_worker: torch intra-op threads per worker (defaults to an
+                even share of the CPU cores)
+            max_batch_size: Most queued requests a worker scores in one batch
+            use_gpu: Whether workers run the models on the GPU
+            backend: 'torch', 'onnx' or 'onnx-int8' (see onnx_backend)
+            job_classifier: 'prototype' or 'bart' (see MLValidator)
+            cache_size: Most validation results memoised in the parent (0 disables)
+            cache_path: SQLite file to persist memoised results in
+            verbose: Whether to print pool lifecycle messages
+            validator_factory: Picklable callable building each worker's validator
+                (defaults to MLValidator with the settings above)
+            history_size: Most recent results kept alongside the running stats
+        """
+        if num_workers < 1:
+            raise ValueError("A validation pool needs at least one worker")
+        self.validator_id = 'MLValidatorPool'
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // num_workers)
+        self.max_batch_size = max_batch_size
+        self.backend = backend
+        self.job_classifier = job_classifier
+        self.verbose = verbose
+        self.validation_stats = ValidationStats(recent_size=history_size)
+
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count()
+        self._pending = {}  # request_id -> (Future, cache key or None, job type)
+        self._leaders = {}  # cache key -> request_id of the in-flight validation
+        self._followers = {}  # request_id -> Futures waiting on the same validation
+        self._in_flight = {}  # worker_id -> request_ids taken but not answered
+        self._closed = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.errors = 0
+        self.deduplicated = 0
+        self.batch_sizes = RunningStats()
+        self._served = [0] * num_workers
+        self._worker_status = ['starting'] * num_workers
+        self._worker_readiness = [None] * num_workers
+
+        # Fork where possible: spawned children would re-import the launching script
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        self._requests = context.Queue()
+        self._results = context.Queue()
+        validator_kwargs = {'use_gpu': use_gpu, 'backend': backend, 'job_classifier': job_classifier}
+        self._workers = [
+            context.Process(
+                target=_worker_main,
+                args=(i, self._requests, self._results, self.threads_per_worker, max_batch_size, validator_kwargs,
+                      validator_factory),
+                name=f'validation-worker-{i}',
+                daemon=True
+            )
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+        # Opened after the fork, so no worker inherits the SQLite connection
+        self.cache = ValidationCache(cache_size, cache_path, version=MLValidator.version_for(backend, job_classifier))
+        self._collector = threading.Thread(target=self._collect, name='validation-pool-collector', daemon=True)
+        self._collector.start()
+        if self.verbose:
+            print(f"🏭 Validation pool started: {num_workers} workers x {self.threads_per_worker} threads")
+
+    def submit(self, job_description, work_output, job_type=None):
+        """
+        Queue one validation
+        Args:
+            job_description: Original job requirements
+            work_output: Agent's work output
+            job_type: Optional job type for context
+        Returns: Future resolving to the validator's result dict
+        """
+        pair = (job_description, work_output, job_type)
+        key = self.cache.key(*pair)
+        future = Future()
+        cached = self.cache.get(key)
+        if cached is not None:
+            with self._lock:
+                self.submitted += 1
+                self.completed += 1
+            self.validation_stats.record(cached, job_type)
+            future.set_result(cached)
+            return future
+        return self._dispatch('validate', pair, future, key)
+
+    def validate_work(self, job_description, work_output, job_type=None):
+        """
+        Validate one output in a worker, waiting for the result
+        Same signature and result as MLValidator.validate_work
+        """
+        return self.submit(job_description, work_output, job_type).result()
+
+    def validate_batch(self, pairs, batch_size=32):
+        """
+        Validate many job/output pairs across the workers
+        Args:
+            pairs: List of (job_description, work_output[, job_type]) tuples
+            batch_size: Unused (workers batch whatever is queued, up to max_batch_size);
+                kept for MLValidator compatibility
+        Returns: List of result dicts in input order
+        """
+        futures = [self.submit(pair[0], pair[1], pair[2] if len(pair) > 2 else None) for pair in pairs]
+        return [future.result() for future in futures]
+
+    def match_skills(self, job_requirements, agent_skills):
+        """Skill match scores, computed in a worker (see MLValidator.match_skills)"""
+        return self._dispatch('match_skills', (job_requirements, agent_skills), Future()).result()
+
+    def rerank_outputs(self, job_description, outputs, top_k=None, prefilter=None, batch_size=32):
+        """Outputs ranked by quality, computed in a worker (see MLValidator.rerank_outputs)"""
+        args = (job_description, outputs, top_k, prefilter, batch_size)
+        return self._dispatch('rerank_outputs', args, Future()).result()
+
+    def warm_up(self, background=True):
+        """Workers load and warm up their models as they start; nothing to do here"""
+        return None
+
+    def _dispatch(self, method, args, future, key=None):
+        """
+        Send a request to the workers and register its Future
+        A validation identical to one already in flight waits for that one instead
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Validation pool is shut down")
+            if not self._alive():
+                raise RuntimeError("Every validation worker has exited")
+            leader = self._leaders.get(key) if key is not None else None
+            if leader is not None:
+                self.submitted += 1
+                self.deduplicated += 1
+                self._followers.setdefault(leader, []).append(future)
+                return future
+            request_id = next(self._request_ids)
+            self._pending[request_id] = (future, key, args[2] if method == 'validate' else None)
+            if key is not None:
+                self._leaders[key] = request_id
+            self.submitted += 1
+        self._requests.put((request_id, method, args))
+        return future
+
+    def _alive(self):
+        return any(status in ('starting', 'ready') for status in self._worker_status)
+
+    def _collect(self):
+        """Collector thread: resolve Futures from worker replies, watch for dead workers"""
+        while True:
+            try:
+                message = self._results.get(timeout=0.5)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            if message is None:
+                break
+            kind, worker_id, payload = message
+            if kind == 'ready':
+                self._worker_status[worker_id] = 'ready'
+                self._worker_readiness[worker_id] = payload
+                if self.verbose:
+                    print(f"   ✅ Validation worker {worker_id} ready")
+            elif kind == 'failed':
+                self._worker_status[worker_id] = 'failed'
+                print(f"   ⚠️  Validation worker {worker_id} could not load the models: {payload}")
+                self._fail_if_no_workers()
+            elif kind == 'taken':
+                with self._lock:
+                    self._in_flight[worker_id] = set(payload)
+            elif kind == 'results':
+                with self._lock:
+                    self._in_flight.pop(worker_id, None)
+                    self._served[worker_id] += len(payload)
+                self.batch_sizes.update(len(payload))
+                for request_id, ok, value, cacheable in payload:
+                    self._resolve(request_id, ok, value, cacheable)
+
+    def _resolve(self, request_id, ok, value, cacheable=False):
+        """
+        Complete a request (and any identical requests waiting on it)
+        Args:
+            cacheable: Whether a validation result may be memoised (no fallback scores)
+        """
+        with self._lock:
+            entry = self._pending.pop(request_id, None)
+            if entry is None:
+                return
+            future, key, job_type = entry
+            followers = self._followers.pop(request_id, [])
+            if key is not None and self._leaders.get(key) == request_id:
+                del self._leaders[key]
+            if ok:
+                self.completed += 1 + len(followers)
+            else:
+                self.errors += 1 + len(followers)
+        if not ok:
+            error = RuntimeError(f"Validation worker error: {value}")
+            for waiting in [future, *followers]:
+                self._settle(waiting, exception=error)
+            return
+        if key is not None:
+            if cacheable:
+                self.cache.put(key, value)
+            results = [value] + [copy.deepcopy(value) for _ in followers]
+            self.validation_stats.record_many(results, [job_type] * len(results))
+        else:
+            results = [value]
+        for waiting, result in zip([future, *followers], results):
+            self._settle(waiting, result=result)
+
+    @staticmethod
+    def _settle(future, result=None, exception=None):
+        """Resolve a Future unless its caller already cancelled it"""
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def _check_workers(self):
+        """Fail the requests of any worker that exited unexpectedly"""
+        if self._closed:
+            return
+        for worker_id, worker in enumerate(self._workers):
+            if worker.is_alive() or self._worker_status[worker_id] in ('failed', 'exited'):
+                continue
+            self._worker_status[worker_id] = 'exited'
+            print(f"   ⚠️  Validation worker {worker_id} exited (code {worker.exitcode})")
+            with self._lock:
+                lost = self._in_flight.pop(worker_id, set())
+            for request_id in lost:
+                self._resolve(request_id, False, f"worker {worker_id} exited before answering")
+        self._fail_if_no_workers()
+
+    def _fail_if_no_workers(self):
+        """With no worker left, nothing queued will ever be answered"""
+        with self._lock:
+            if self._alive():
+                return
+            request_ids = list(self._pending)
+        for request_id in request_ids:
+            self._resolve(request_id, False, "no validation worker is running")
+
+    def readiness(self):
+        """
+        Worker loading state for readiness checks
+        Returns: Dict with ready, degraded, mode and per-worker status (same keys as MLValidator.readiness)
+        """
+        statuses = list(self._worker_status)
+        models = next((r['models'] for r in self._worker_readiness if r), {})
+        degraded = any(status != 'ready' for status in statuses if status != 'starting') or any(
+            r['degraded'] for r in self._worker_readiness if r
+        )
+        return {
+            'ready': 'starting' not in statuses and 'ready' in statuses,
+            'degraded': degraded,
+            'mode': 'ml-pool',
+            'backend': self.backend,
+            'job_classifier': self.job_classifier,
+            'workers': {
+                str(i): {'status': status, 'served': self._served[i]}
+                for i, status in enumerate(statuses)
+            },
+            'models': models
+        }
+
+    @property
+    def queue_depth(self):
+        """Requests sent to the workers and not yet answered"""
+        return len(self._pending)
+
+    def get_stats(self):
+        """Validation statistics, in MLValidator.get_stats form, plus pool counters"""
+        stats = MLValidator.stats_report(self.validation_stats, self.cache)
+        stats['pool'] = {
+            'workers': self.num_workers,
+            'threads_per_worker': self.threads_per_worker,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'errors': self.errors,
+            'deduplicated': self.deduplicated,
+            'queue_depth': self.queue_depth,
+            'batch_size': self.batch_sizes.to_dict(),
+            'served': list(self._served)
+        }
+        return stats
+
+    def shutdown(self, wait=True):
+        """
+        Stop the workers once the queued requests are answered
+        Args:
+            wait: Whether to block until the workers have exited
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for _ in self._workers:
+            self._requests.put(None)
+        if not wait:
+            return
+        for worker in self._workers:
+            worker.join()
+        self._results.put(None)
+        self._collector.join()
+        self.cache.close()
+        if self.verbose:
+            print(f"🏭 Validation pool stopped after {self.completed} validations")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+# Singleton pool, the multi-process counterpart of get_validator()
+_pool_instance = None
+
+def get_validation_pool(num_workers=2, threads_per_worker=None, use_gpu=False, backend='torch',
+                        job_classifier='prototype', cache_path=None):
+    """
+    Get or create the singleton validation pool
+    Drop-in replacement for ml_validator.get_validator()
+
+    Args:
+        num_workers: Worker processes
+        threads_per_worker: torch threads per worker (defaults to an even share of the cores)
+        use_gpu: Whether workers run the models on the GPU
+        backend: 'torch', 'onnx' or 'onnx-int8'
+        job_classifier: 'prototype' or 'bart'
+        cache_path: SQLite file to persist memoised validation results in
+
+    Returns:
+        ValidationPool instance
+    """
+    global _pool_instance
+    if _pool_instance is None:
+        _pool_instance = ValidationPool(
+            num_workers=num_workers,
+            threads_per_worker=threads_per_worker,
+            use_gpu=use_gpu,
+            backend=backend,
+            job_classifier=job_classifier,
+            cache_path=cache_path
+        )
+    return _pool_instance
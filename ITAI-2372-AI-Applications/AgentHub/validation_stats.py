@@ -0,0 +1,140 @@
+"""
+Validation Statistics for AgentHub
+Constant-memory aggregates of validation results
+
+Validators used to append every result to a list and rescan it whenever
+stats were read, so a long-running server's memory and /api/stats latency
+both grew with every validation. ValidationStats folds each result into
+running aggregates as it is recorded: per job type and overall, a count, a
+pass count, score and confidence accumulators (streaming_stats.RunningStats)
+and a fixed-bin score histogram for quantiles. Only the most recent results
+are kept, in a bounded ring buffer, for dashboards.
+"""
+
+import threading
+from collections import deque
+
+from streaming_stats import Histogram, RunningStats
+
+
+class _Aggregate:
+    """Count, passes, score/confidence accumulators and score histogram for one group"""
+
+    def __init__(self):
+        self.passed = 0
+        self.scores = RunningStats()
+        self.confidence = RunningStats()
+        self.histogram = Histogram(0, 101, 101)  # One bin per integer score 0-100
+
+    def update(self, result):
+        self.passed += bool(result['passed'])
+        self.scores.update(result['score'])
+        self.histogram.update(result['score'])
+        if result.get('confidence') is not None:
+            self.confidence.update(result['confidence'])
+
+    def to_dict(self):
+        total = self.scores.count
+        return {
+            'total_validations': total,
+            'passed': self.passed,
+            'failed': total - self.passed,
+            'pass_rate': round(self.passed / total * 100, 1) if total else 0,
+            'average_score': round(self.scores.mean, 1),
+            'score_std': round(self.scores.std, 1),
+            'score_quantiles': self.histogram.to_dict(ndigits=1),
+            'average_confidence': round(self.confidence.mean, 3)
+        }
+
+
+class ValidationStats:
+    """
+    Running validation statistics with bounded memory
+    Features:
+    - O(1) record; reads never rescan past results
+    - Overall and per job type: count, pass count, score mean/std, confidence mean
+    - Score quantiles from a 101-bin histogram (exact for integer scores)
+    - Optional ring buffer of recent results (recent_size=0 keeps none)
+    - Job types beyond max_job_types are grouped under 'other'
+    - Thread-safe
+    """
+
+    OTHER = 'other'
+
+    def __init__(self, recent_size=100, max_job_types=50):
+        """
+        Args:
+            recent_size: Most recent results kept for display (0 keeps none)
+            max_job_types: Most job types tracked separately
+        """
+        self.recent_size = recent_size
+        self.max_job_types = max_job_types
+        self._recent = deque(maxlen=recent_size)
+        self._overall = _Aggregate()
+        self._by_type = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._overall.scores.count
+
+    @property
+    def average_score(self):
+        """Mean score over every recorded result (0 before any)"""
+        return self._overall.scores.mean
+
+    def record(self, result, job_type=None):
+        """
+        Fold one validation result into the aggregates
+        Args:
+            result: Result dict with 'score', 'passed' and optionally 'confidence'
+            job_type: Job type to group under (defaults to the result's 'job_type')
+        """
+        job_type = job_type or result.get('job_type') or 'unknown'
+        with self._lock:
+            group = self._by_type.get(job_type)
+            if group is None:
+                if len(self._by_type) >= self.max_job_types:
+                    job_type = self.OTHER
+                group = self._by_type.setdefault(job_type, _Aggregate())
+            group.update(result)
+            self._overall.update(result)
+            if self.recent_size:
+                self._recent.append(result)
+
+    def record_many(self, results, job_types=None):
+        """
+        Fold several results into the aggregates
+        Args:
+            results: Result dicts
+            job_types: Job type per result (None to use each result's own)
+        """
+        for result, job_type in zip(results, job_types or [None] * len(results)):
+            self.record(result, job_type)
+
+    def recent(self, limit=None):
+        """
+        Most recent results, oldest first
+        Args:
+            limit: Most results to return (None for the whole ring buffer)
+        Returns: List of result dicts
+        """
+        with self._lock:
+            results = list(self._recent)
+        return results[-limit:] if limit else results
+
+    def summary(self):
+        """Overall totals, pass rate, score mean/std/quantiles and mean confidence"""
+        with self._lock:
+            return self._overall.to_dict()
+
+    def by_job_type(self):
+        """summary() for each job type"""
+        with self._lock:
+            return {job_type: group.to_dict() for job_type, group in self._by_type.items()}
+
+    def clear(self):
+        """Forget every recorded result"""
+        with self._lock:
+            self._recent.clear()
+            self._overall = _Aggregate()
+            self._by_type = {}
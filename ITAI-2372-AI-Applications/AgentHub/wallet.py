@@ -0,0 +1,332 @@
+"""
+Wallet Engine for AgentHub
+Double-entry accounts with optimistic concurrency and batched ledger commits
+
+Every balance change is a transaction whose postings sum to zero, so tokens
+are only ever moved between accounts (initial balances come from the mint).
+Committed transactions are journaled in commit order and written to the
+blockchain before the commit returns, so a balance never changes without a
+matching chain entry. Commits that land while another thread is writing are
+grouped into that thread's next block (group commit), so concurrent
+transfers still share blocks. reconcile() replays the chain to prove
+balances have not drifted from it.
+
+Buyer payments are escrowed per job: hold() moves the payment into escrow
+under a hold ID (the job ID) and release() pays out exactly that hold, so
+one job's escrow can never fund another's release.
+"""
+
+import itertools
+import threading
+import time
+import zlib
+from collections import deque
+
+
+MINT_ACCOUNT = 'mint'  # Source of initial balances, may go negative
+ESCROW_ACCOUNT = 'escrow'  # Holds buyer payments until work is validated
+
+# Escrow is striped over sub-accounts so concurrent payments don't all queue
+# on one lock; each stripe holds exactly the open holds hashed to it
+ESCROW_STRIPES = 16
+
+# Postings must balance to within this tolerance (token amounts are floats)
+BALANCE_TOLERANCE = 1e-9
+
+
+class Account:
+    """Single wallet account: balance, version and its own lock"""
+
+    __slots__ = ('account_id', 'balance', 'version', 'allow_negative', 'lock')
+
+    def __init__(self, account_id, allow_negative=False):
+        self.account_id = account_id
+        self.balance = 0
+        self.version = 0
+        self.allow_negative = allow_negative
+        self.lock = threading.Lock()
+
+
+class WalletEngine:
+    """
+    Double-entry wallet with optimistic concurrency
+    Features:
+    - Balanced postings (debits equal credits) for every transaction
+    - Version numbers per account; commits fail on a stale read and retry
+    - Per-account locks taken in a fixed order, never a global lock
+    - Multi-transaction commits applied all-or-nothing
+    - Escrow held and released per job (hold ID), never pooled across jobs
+    - Journal group-committed to the blockchain before each commit returns,
+      plus chain reconciliation
+    - Thread-safe commit and conflict counters
+    """
+
+    def __init__(self, blockchain=None, batch_size=64, flush_interval=0.0, max_retries=16):
+        """
+        Args:
+            blockchain: Ledger that receives journal batches (None keeps them in memory)
+            batch_size: Most journal entries per ledger block
+            flush_interval: 0 (the default) writes every commit to the chain before it
+                returns. A positive value defers writes until batch_size entries or
+                this many seconds have built up, for bulk loads that call flush()
+                before anything reads the chain or balances
+            max_retries: Optimistic retries before a transfer gives up
+        """
+        self.blockchain = blockchain
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+
+        self.accounts = {}
+        self.journal = deque()  # (sequence, memo, postings) awaiting flush
+        self.commits = 0
+        self.conflicts = 0
+        self.blocks_written = 0
+        self.holds = {}  # hold ID -> (payer, amount) in escrow; None while the hold is being taken
+
+        self._sequence = itertools.count(1)
+        self._accounts_lock = threading.Lock()  # Only guards opening accounts
+        self._flush_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._holds_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+        self.open_account(MINT_ACCOUNT, allow_negative=True)
+        for stripe in range(ESCROW_STRIPES):
+            self.open_account(f"{ESCROW_ACCOUNT}:{stripe}")
+
+    def open_account(self, account_id, initial_balance=0, allow_negative=False):
+        """
+        Create an account, funding it from the mint
+        Args:
+            account_id: Account identifier (agent ID for agent wallets)
+            initial_balance: Tokens issued to the account
+            allow_negative: Whether the balance may go below zero
+        Returns: Account instance
+        """
+        with self._accounts_lock:
+            if account_id in self.accounts:
+                raise ValueError(f"Account {account_id} already exists")
+            account = self.accounts[account_id] = Account(account_id, allow_negative)
+
+        if initial_balance:
+            self.transfer(MINT_ACCOUNT, account_id, initial_balance, memo='issue')
+        return account
+
+    def balance(self, account_id):
+        """Current balance of an account"""
+        return self.accounts[account_id].balance
+
+    def escrow_account(self, hold_id):
+        """Escrow stripe that holds a job's payment"""
+        return f"{ESCROW_ACCOUNT}:{zlib.crc32(str(hold_id).encode()) % ESCROW_STRIPES}"
+
+    def hold(self, payer, hold_id, amount):
+        """
+        Escrow a payment for one job
+        Args:
+            payer: Account paying into escrow
+            hold_id: Identifier of the hold, e.g. the job ID (one hold per ID)
+            amount: Tokens to escrow
+        Returns: True if escrowed, False on insufficient funds or repeated conflicts
+        """
+        if hold_id is None:
+            raise ValueError("Escrow needs a hold ID (e.g. the job ID)")
+        with self._holds_lock:
+            if hold_id in self.holds:
+                raise ValueError(f"Escrow hold {hold_id} already exists")
+            self.holds[hold_id] = None  # Reserve the ID; not releasable until funded
+        if not self.transfer(payer, self.escrow_account(hold_id), amount, memo=f"escrow {hold_id} from {payer}"):
+            with self._holds_lock:
+                del self.holds[hold_id]
+            return False
+        with self._holds_lock:
+            self.holds[hold_id] = (payer, amount)
+        return True
+
+    def release(self, hold_id, payee, amount=None):
+        """
+        Pay one job's escrowed payment out, all of it
+        Args:
+            hold_id: Hold taken by hold()
+            payee: Account receiving the payment
+            amount: Expected amount (the release fails if the hold differs)
+        Returns: True if paid out; False if there is no such funded hold, the
+            amount differs or the transfer failed (the hold is then kept)
+        """
+        with self._holds_lock:
+            held = self.holds.get(hold_id)
+            if held is None:
+                return False
+            payer, held_amount = held
+            if amount is not None and abs(amount - held_amount) > BALANCE_TOLERANCE * max(1, abs(held_amount)):
+                return False
+            del self.holds[hold_id]
+        if not self.transfer(self.escrow_account(hold_id), payee, held_amount, memo=f"release {hold_id} to {payee}"):
+            with self._holds_lock:
+                self.holds[hold_id] = held
+            return False
+        return True
+
+    def escrowed(self):
+        """Total tokens held in escrow across all stripes"""
+        return sum(self.accounts[f"{ESCROW_ACCOUNT}:{stripe}"].balance for stripe in range(ESCROW_STRIPES))
+
+    def total_supply(self):
+        """Tokens issued by the mint (sum of all other balances)"""
+        return -self.accounts[MINT_ACCOUNT].balance
+
+    def transfer(self, debit_account, credit_account, amount, memo=''):
+        """
+        Move tokens between two accounts, retrying on version conflicts
+        Args:
+            debit_account: Account paying
+            credit_account: Account receiving
+            amount: Tokens to move (positive)
+            memo: Description stored in the journal
+        Returns: True if committed, False on insufficient funds or repeated conflicts
+        """
+        if amount <= 0:
+            raise ValueError("Transfer amount must be positive")
+
+        postings = [(debit_account, -amount), (credit_account, amount)]
+        source = self.accounts[debit_account]
+        target = self.accounts[credit_account]
+
+        for _ in range(self.max_retries):
+            # Optimistic read: no locks, just remember what we saw
+            versions = {debit_account: source.version, credit_account: target.version}
+            if not source.allow_negative and source.balance < amount:
+                return False
+            if self.commit(postings, memo, versions):
+                return True
+        return False
+
+    def commit(self, postings, memo='', expected_versions=None):
+        """
+        Apply one balanced transaction atomically
+        Args:
+            postings: List of (account_id, amount) pairs summing to zero
+            memo: Description stored in the journal
+            expected_versions: Optional dict of account_id -> version read by the caller
+        Returns: True if applied, False on a version conflict or overdraft
+        """
+        return self.commit_many([(postings, memo)], expected_versions)
+
+    def commit_many(self, transactions, expected_versions=None):
+        """
+        Apply several balanced transactions all-or-nothing under one lock set
+        Args:
+            transactions: List of (postings, memo) tuples
+            expected_versions: Optional dict of account_id -> version read by the caller
+        Returns: True if all were applied, False if none were
+        """
+        deltas = {}
+        for postings, _ in transactions:
+            if abs(sum(amount for _, amount in postings)) > BALANCE_TOLERANCE:
+                raise ValueError(f"Unbalanced postings: {postings}")
+            for account_id, amount in postings:
+                deltas[account_id] = deltas.get(account_id, 0) + amount
+
+        # Sorted lock order rules out deadlocks between concurrent commits
+        accounts = [self.accounts[account_id] for account_id in sorted(deltas)]
+        for account in accounts:
+            account.lock.acquire()
+        try:
+            if expected_versions:
+                for account_id, version in expected_versions.items():
+                    if self.accounts[account_id].version != version:
+                        with self._stats_lock:
+                            self.conflicts += 1
+                        return False
+
+            for account in accounts:
+                if not account.allow_negative and account.balance + deltas[account.account_id] < -BALANCE_TOLERANCE:
+                    return False
+
+            for postings, memo in transactions:
+                for account_id, amount in postings:
+                    self.accounts[account_id].balance += amount
+                # Journal while the account locks are held, so entries touching
+                # the same account are sequenced in commit order
+                self.journal.append((next(self._sequence), memo, postings))
+            for account in accounts:
+                account.version += 1
+            with self._stats_lock:
+                self.commits += len(transactions)
+        finally:
+            for account in accounts:
+                account.lock.release()
+
+        if (not self.flush_interval or len(self.journal) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+        return True
+
+    def flush(self):
+        """
+        Write journaled transactions to the blockchain in batched blocks
+        Returns: Number of entries written
+        """
+        with self._flush_lock:
+            entries = []
+            while self.journal:
+                entries.append(self.journal.popleft())
+            self._last_flush = time.monotonic()
+            if not entries or self.blockchain is None:
+                return len(entries)
+
+            entries.sort(key=lambda entry: entry[0])
+            blocks = []
+            for start in range(0, len(entries), self.batch_size):
+                batch = entries[start:start + self.batch_size]
+                blocks.append({
+                    'type': 'wallet_postings',
+                    'first_sequence': batch[0][0],
+                    'last_sequence': batch[-1][0],
+                    'entries': [
+                        {'sequence': sequence, 'memo': memo, 'postings': [list(p) for p in postings]}
+                        for sequence, memo, postings in batch
+                    ]
+                })
+            self.blockchain.add_blocks(blocks)
+            self.blocks_written += len(blocks)
+            return len(entries)
+
+    def reconcile(self):
+        """
+        Replay wallet blocks on the chain and compare with live balances
+        Returns: Dict of account_id -> (chain balance, wallet balance) for mismatches
+            (empty when the wallet has no blockchain to check against)
+        """
+        if self.blockchain is None:
+            return {}
+        self.flush()
+        replayed = {}
+        for block in self.blockchain.chain:
+            data = block['data']
+            if data.get('type') != 'wallet_postings':
+                continue
+            for entry in data['entries']:
+                for account_id, amount in entry['postings']:
+                    replayed[account_id] = replayed.get(account_id, 0) + amount
+
+        mismatches = {}
+        for account_id, account in self.accounts.items():
+            expected = replayed.get(account_id, 0)
+            if abs(expected - account.balance) > BALANCE_TOLERANCE * max(1, abs(expected)):
+                mismatches[account_id] = (expected, account.balance)
+        return mismatches
+
+    def get_stats(self):
+        """Wallet counters for dashboards"""
+        return {
+            'accounts': len(self.accounts),
+            'total_supply': round(self.total_supply(), 2),
+            'escrowed': round(self.escrowed(), 2),
+            'open_holds': len(self.holds),
+            'commits': self.commits,
+            'conflicts': self.conflicts,
+            'pending_journal': len(self.journal),
+            'blocks_written': self.blocks_written
+        }
@@ -12,6 +12,12 @@ from agent import Agent
 from ai_validator import AIValidator  # Legacy validator
 from ml_validator import get_validator  # New ML-powered validator
 from ai_assistant import get_assistant  # AI chat assistant
+from wallet import WalletEngine
+from validation_batcher import ValidationBatcher
+from validation_pool import get_validation_pool
+from cascade_validator import CascadeValidator
+from embeddings import get_embedding_service
+import os
 import threading
 import time
 from datetime import datetime
@@ -22,36 +28,89 @@ CORS(app)
 # Initialize core systems
 blockchain = Blockchain()
 smart_contract_system = SmartContract(blockchain)
+wallet = WalletEngine(blockchain, batch_size=16)
+
+# Inference backend for the validator's cross-encoder and the shared sentence encoder:
+# 'torch' (default), 'onnx' or 'onnx-int8' (needs: pip install optimum[onnxruntime])
+VALIDATOR_BACKEND = os.environ.get('AGENTHUB_VALIDATOR_BACKEND', 'torch')
+# Job type classifier: 'prototype' (MiniLM label prototypes, default) or 'bart' (zero-shot, slower)
+JOB_CLASSIFIER = os.environ.get('AGENTHUB_JOB_CLASSIFIER', 'prototype')
+# Validation worker processes (0 runs inference in this process, behind the batcher)
+VALIDATOR_WORKERS = int(os.environ.get('AGENTHUB_VALIDATOR_WORKERS', '0'))
+# Rule-based pre-screen: clear passes and failures skip the models ('1' to enable)
+VALIDATOR_CASCADE = os.environ.get('AGENTHUB_VALIDATOR_CASCADE', '0') == '1'
+
+# Embeddings shared by the validator and assistant, cached on disk across restarts
+embedding_service = get_embedding_service(
+    device='cpu',
+    cache_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), '.embedding_cache'),
+    backend=VALIDATOR_BACKEND
+)
 
 # Try to use ML validator, fallback to legacy if models not installed
+# Models load on first use; warm_up() loads them in the background and /api/ready reports progress
+# Results are memoised on disk, keyed by content and model version, so repeats skip inference
+VALIDATION_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.validation_cache.sqlite3')
 try:
-    validator = get_validator(use_gpu=False)
-    print("✅ Using ML-powered validator with transformer models")
+    if VALIDATOR_WORKERS > 0:
+        # Inference in worker processes, off the request threads and out of this process's GIL
+        validator = get_validation_pool(
+            num_workers=VALIDATOR_WORKERS,
+            backend=VALIDATOR_BACKEND,
+            job_classifier=JOB_CLASSIFIER,
+            cache_path=VALIDATION_CACHE_PATH
+        )
+        print(f"✅ Using ML-powered validator in {VALIDATOR_WORKERS} worker processes")
+    else:
+        validator = get_validator(
+            use_gpu=False,
+            backend=VALIDATOR_BACKEND,
+            job_classifier=JOB_CLASSIFIER,
+            cache_path=VALIDATION_CACHE_PATH
+        )
+        validator.warm_up()
+        print("✅ Using ML-powered validator with transformer models")
 except Exception as e:
     print(f"⚠️  ML validator failed, using legacy validator: {e}")
     validator = AIValidator()
 
-# Initialize AI assistant with RAG
-try:
-    ai_assistant = get_assistant(use_gpu=False)
-    print("✅ AI Assistant initialized with RAG-enhanced documentation search")
-except Exception as e:
-    print(f"⚠️  AI Assistant initialization warning: {e}")
-    ai_assistant = None
+# Validations from concurrent requests share model batches (the worker pool batches its own queue)
+if hasattr(validator, 'validate_batch') and not hasattr(validator, 'submit'):
+    validator = ValidationBatcher(validator, max_batch_size=32, max_wait=0.005)
+
+if VALIDATOR_CASCADE and hasattr(validator, 'validate_batch'):
+    validator = CascadeValidator(validator)
+
+# Initialize AI assistant with RAG in the background (chat uses the fallback reply until it's ready)
+ai_assistant = None
+assistant_status = 'loading'
+
+def load_assistant():
+    global ai_assistant, assistant_status
+    try:
+        ai_assistant = get_assistant(use_gpu=False, embedding_backend=VALIDATOR_BACKEND)
+        assistant_status = 'ready'
+        print("✅ AI Assistant initialized with RAG-enhanced documentation search")
+    except Exception as e:
+        assistant_status = 'failed'
+        print(f"⚠️  AI Assistant initialization warning: {e}")
+
+threading.Thread(target=load_assistant, name='assistant-loader', daemon=True).start()
 
 marketplace = Marketplace(blockchain, smart_contract_system, validator)
 
 # Initialize demo agents
 agents = {
-    'ResearchBot': Agent('ResearchBot', agent_type='buyer', skills=[], initial_balance=200),
+    'ResearchBot': Agent('ResearchBot', agent_type='buyer', skills=[], initial_balance=250),
     'DataAnalystAgent': Agent('DataAnalystAgent', agent_type='seller', skills=['data_analysis', 'validation'], initial_balance=50),
     'ImageGenAgent': Agent('ImageGenAgent', agent_type='seller', skills=['image_generation', 'validation'], initial_balance=50),
     'CodeReviewBot': Agent('CodeReviewBot', agent_type='seller', skills=['code_review', 'testing'], initial_balance=75),
     'ContentWriterAI': Agent('ContentWriterAI', agent_type='seller', skills=['content_writing', 'seo'], initial_balance=60),
 }
 
-# Register agents
+# Register agents; balances live in double-entry wallet accounts
 for agent in agents.values():
+    agent.attach_wallet(wallet)
     marketplace.register_agent(agent)
 
 
@@ -112,10 +171,11 @@ def populate_demo_data():
             poster = marketplace.agents[job['poster']]
             winner = marketplace.agents[job['winner']]
             
-            # Deduct budget from poster
-            poster.balance -= job['budget']
-            poster.total_spent += job['budget']
-            poster.jobs_requested += 1
+            # Escrow budget from poster, held under the demo job's ID
+            demo_id = f"demo_{len(marketplace.completed_jobs)}"
+            if not poster.make_payment(job['budget'], hold=demo_id):
+                print(f"   ⚠️  {job['poster']} can't cover {job['budget']} tokens, skipping demo job")
+                continue
             
             # Create smart contract
             contract_id = smart_contract_system.create_contract(
@@ -138,14 +198,14 @@ def populate_demo_data():
                 }
             }
             
-            # Add to validator history
-            validator.validation_history.append(validation_result)
+            # Add to validator stats
+            validator.validation_stats.record(validation_result, job['type'])
             
             # Release payment if quality met
             if validation_result['passed']:
-                winner.balance += job['budget']
-                winner.total_earned += job['budget']
-                winner.jobs_completed += 1
+                if not winner.receive_payment(job['budget'], hold=demo_id):
+                    print(f"   ⚠️  Escrow release for {demo_id} failed, skipping demo job")
+                    continue
                 winner.update_reputation(job['quality'] / 20)  # Convert to 0-5 scale
                 
                 # Validate and release through smart contract
@@ -156,8 +216,8 @@ def populate_demo_data():
                 )
                 
                 # Add to completed jobs
-                marketplace.completed_jobs.append({
-                    'job_id': f"demo_{len(marketplace.completed_jobs)}",
+                completed_job = {
+                    'job_id': demo_id,
                     'poster': job['poster'],
                     'winner': job['winner'],
                     'description': job['description'],
@@ -166,12 +226,15 @@ def populate_demo_data():
                     'final_price': job['budget'],
                     'quality_score': job['quality'],
                     'status': 'completed'
-                })
+                }
+                marketplace.completed_jobs.append(completed_job)
+                marketplace.record_job_outcome(completed_job)
         
         except Exception as e:
             print(f"   ⚠️  Error populating demo job: {e}")
             continue
     
+    wallet.flush()
     print(f"✅ Demo data populated: {len(demo_jobs)} completed transactions")
     print(f"   💰 Total transaction volume: {sum(j['budget'] for j in demo_jobs)} tokens")
     print(f"   ⭐ Average quality score: {sum(j['quality'] for j in demo_jobs) / len(demo_jobs):.1f}/100")
@@ -199,53 +262,87 @@ def how_it_works():
 def get_stats():
     """Get marketplace statistics"""
     total_transactions = len(blockchain.chain) - 1  # Exclude genesis block
-    total_value = sum(
-        block['data'].get('amount', 0) 
-        for block in blockchain.chain 
-        if block['data'].get('type') == 'payment_released'
-    )
-    
-    completed_jobs = marketplace.completed_jobs
-    active_jobs = marketplace.active_jobs
     
-    avg_quality = 0
-    if validator.validation_history:
-        avg_quality = sum(v['score'] for v in validator.validation_history) / len(validator.validation_history)
+    # Running totals kept by the marketplace, no history scan
+    market_stats = marketplace.get_market_stats()
     
     return jsonify({
-        'total_agents': len(marketplace.agents),
+        'total_agents': market_stats['total_agents'],
         'total_transactions': total_transactions,
-        'total_value': round(total_value, 2),
-        'completed_jobs': len(completed_jobs),
-        'active_jobs': len(active_jobs),
-        'avg_quality_score': round(avg_quality, 1),
+        'total_value': market_stats['total_value'],
+        'completed_jobs': market_stats['completed_jobs'],
+        'active_jobs': market_stats['active_jobs'],
+        'avg_quality_score': round(validator.validation_stats.average_score, 1),
+        'avg_job_value': market_stats['avg_value'],
+        'job_value_quantiles': market_stats['value_quantiles'],
+        'quality_quantiles': market_stats['quality_quantiles'],
         'blockchain_valid': blockchain.is_valid(),
         'total_blocks': len(blockchain.chain)
     })
 
+@app.route('/api/wallet')
+def get_wallet():
+    """Get wallet engine statistics"""
+    wallet.flush()  # No-op unless the wallet defers ledger writes
+    return jsonify(wallet.get_stats())
+
+def agent_summary(agent):
+    """Agent stats as returned by the agent list and search endpoints"""
+    return {
+        'id': agent.agent_id,
+        'type': agent.agent_type,
+        'balance': agent.balance,
+        'reputation': round(agent.reputation_score, 2),
+        'jobs_completed': agent.jobs_completed,
+        'jobs_requested': agent.jobs_requested,
+        'total_earned': agent.total_earned,
+        'total_spent': agent.total_spent,
+        'skills': agent.skills,
+        'pricing': agent.pricing if hasattr(agent, 'pricing') else {},
+        'completion_rate': (agent.jobs_completed / max(agent.jobs_requested, 1)) * 100 if agent.agent_type == 'buyer' else 100.0,
+        'available': agent.agent_type == 'seller' and agent.has_capacity(),
+        'queue_depth': len(agent.active_jobs),
+        'max_concurrent_jobs': agent.max_concurrent_jobs
+    }
+
 @app.route('/api/agents')
 def get_agents():
     """Get all agents with their stats"""
-    agent_list = []
-    for agent_id, agent in marketplace.agents.items():
-        agent_data = {
-            'id': agent_id,
-            'type': agent.agent_type,
-            'balance': agent.balance,
-            'reputation': round(agent.reputation_score, 2),
-            'jobs_completed': agent.jobs_completed,
-            'jobs_requested': agent.jobs_requested,
-            'total_earned': agent.total_earned,
-            'total_spent': agent.total_spent,
-            'skills': agent.skills,
-            'pricing': agent.pricing if hasattr(agent, 'pricing') else {},
-            'completion_rate': (agent.jobs_completed / max(agent.jobs_requested, 1)) * 100 if agent.agent_type == 'buyer' else 100.0,
-            'available': agent.agent_type == 'seller'
-        }
-        agent_list.append(agent_data)
+    agent_list = [agent_summary(agent) for agent in marketplace.agents.values()]
     
     return jsonify({'agents': agent_list})
 
+@app.route('/api/agents/search')
+def search_agents():
+    """
+    Search agents server-side, highest reputation first
+    Query params: skill, min_reputation, min_price, max_price, available (true/false),
+    type, limit (max 100), cursor (next_cursor from the previous page)
+    """
+    args = request.args
+    try:
+        available = args.get('available')
+        if available is not None:
+            available = available.lower() in ('1', 'true', 'yes')
+        result = marketplace.search_agents(
+            skill=args.get('skill') or None,
+            min_reputation=args.get('min_reputation', type=float),
+            min_price=args.get('min_price', type=float),
+            max_price=args.get('max_price', type=float),
+            available=available,
+            agent_type=args.get('type') or None,
+            limit=min(max(args.get('limit', 20, type=int), 1), 100),
+            cursor=args.get('cursor') or None
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'agents': [agent_summary(agent) for agent in result['agents']],
+        'count': len(result['agents']),
+        'next_cursor': result['next_cursor']
+    })
+
 @app.route('/api/agents/<agent_id>')
 def get_agent(agent_id):
     """Get detailed agent information"""
@@ -285,6 +382,7 @@ def get_agent(agent_id):
 @app.route('/api/blockchain')
 def get_blockchain():
     """Get blockchain data"""
+    wallet.flush()  # No-op unless the wallet defers ledger writes
     return jsonify({
         'chain': blockchain.chain,
         'length': len(blockchain.chain),
@@ -294,6 +392,7 @@ def get_blockchain():
 @app.route('/api/blockchain/stats')
 def get_blockchain_stats():
     """Get blockchain statistics by agent"""
+    wallet.flush()  # No-op unless the wallet defers ledger writes
     stats = blockchain.get_agent_stats()
     return jsonify({'stats': stats})
 
@@ -372,20 +471,37 @@ def get_contracts():
     
     return jsonify({'contracts': contracts})
 
+@app.route('/api/ready')
+def get_readiness():
+    """Readiness check: 200 once every model has loaded, 503 while any is still loading"""
+    readiness = getattr(validator, 'readiness', None)
+    validator_state = readiness() if readiness else {'ready': True, 'degraded': False, 'mode': 'rule-based', 'models': {}}
+    ready = validator_state['ready'] and assistant_status != 'loading'
+    return jsonify({
+        'ready': ready,
+        'validator': validator_state,
+        'assistant': assistant_status
+    }), 200 if ready else 503
+
 @app.route('/api/validator/stats')
 def get_validator_stats():
     """Get AI validator statistics"""
-    total = len(validator.validation_history)
-    passed = sum(1 for v in validator.validation_history if v['passed'])
-    avg_score = sum(v['score'] for v in validator.validation_history) / total if total > 0 else 0
+    # Running totals, no history scan
+    summary = validator.validation_stats.summary()
     
     return jsonify({
-        'total_validations': total,
-        'passed': passed,
-        'failed': total - passed,
-        'pass_rate': (passed / total * 100) if total > 0 else 0,
-        'average_score': round(avg_score, 1),
-        'recent_validations': validator.validation_history[-10:]  # Last 10
+        'total_validations': summary['total_validations'],
+        'passed': summary['passed'],
+        'failed': summary['failed'],
+        'pass_rate': summary['pass_rate'],
+        'average_score': summary['average_score'],
+        'score_quantiles': summary['score_quantiles'],
+        'by_job_type': validator.validation_stats.by_job_type(),
+        'recent_validations': validator.validation_stats.recent(10),  # Last 10
+        'batching': validator.get_batching_stats() if hasattr(validator, 'get_batching_stats') else None,
+        'result_cache': validator.cache.get_stats(),
+        'cascade': validator.get_cascade_stats() if hasattr(validator, 'get_cascade_stats') else None,
+        'embeddings': embedding_service.get_stats()
     })
 
 